@@ -0,0 +1,255 @@
+from manim import *
+import numpy as np
+from numpy import pi
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import Mlib.Pneumatics.DirectionalValves as vls
+import Mlib.Pneumatics.FunctionalValves as f_vls
+import Mlib.Pneumatics.PneumaticCylinders as cyl
+import Mlib.Pneumatics.ValveActuators as vact
+import Mlib.Mechanics.Spring as spr
+import Mlib.Mechanics.ConveyorBelt as cnv
+import Mlib.Mechanics.GeneralConnections as conn
+import Mlib.Instruments.MeasuringInstruments as m_ins
+import Mlib.Electronics.Displays as dsp
+import Mlib.Electronics.Buttons as btn
+from Mlib.Graphics.Labels import label_cache
+from Mlib.Tools.Cache import Disk_cache
+from Mlib.Graphics.Styles import set_theme, get_theme
+
+
+"""
+Author: Ivan Archetti   
+Creation date: 18/10/2026
+
+
+Headless benchmark of the construction of every component
+
+Run it with:
+python -m Mlib.Benchmarks.ConstructionBenchmark --repeat 5 --output construction.json
+
+For every build it reports wall time (cold: empty caches, warm: median of the following builds,
+disk: median load from the disk cache), peak memory, number of mobjects and total number of points, in JSON format
+and if the keys of the disk cache change with the colors (style and theme)
+"""
+
+
+# ======================================================================================================================
+# components: (name, constructor, parameters grid, attribute with the main mobject)
+# ======================================================================================================================
+
+ACTUATORS = ["Coil", "Manual lever", "Push button", "Simple lever", "Roller lever", "Compression spring", "Pneumatic signal"]
+
+CASES = [("Pneumatic_valve_5_2", vls.Pneumatic_valve_5_2, 
+          {"height": [1, 2], "left_actuator_choice": ACTUATORS, "visible_connections": [False, True]}, "valve"),
+         ("Pneumatic_valve_5_3", vls.Pneumatic_valve_5_3, 
+          {"height": [1, 2], "center_selection": [0, 1, 2], "visible_connections": [False, True]}, "valve"),
+         ("Pneumatic_valve_3_2", vls.Pneumatic_valve_3_2, 
+          {"height": [1, 2], "right_actuator_choice": ["Compression spring", "Roller lever"]}, "valve"),
+         ("OneWay_flow_control_valve", f_vls.OneWay_flow_control_valve, 
+          {"height": [1.5], "angle": [0, pi/2], "flip": [-1, 1], "visible_connections": [False, True]}, "valve"),
+         ("Piloted_check_valve", f_vls.Piloted_check_valve, 
+          {"height": [1.5], "angle": [0, pi/2], "flip": [-1, 1], "visible_connections": [False, True]}, "valve"),
+         ("AND_valve", f_vls.AND_valve, {"height": [1, 2], "visible_connections": [False, True]}, "valve"),
+         ("OR_valve", f_vls.OR_valve, {"height": [1, 2], "visible_connections": [False, True]}, "valve"),
+         ("Pneumatic_cylinder_double_acting", cyl.Pneumatic_cylinder_double_acting, 
+          {"height": [1, 2], "width": [3, 4.5], "angle": [0, pi/2]}, "cylinder"),
+         ("Compression_Spring", spr.Compression_Spring, {"height": [1, 3], "n_coils": [5, 10, 40]}, "spring"),
+         ("Converyor_belt", cnv.Converyor_belt, {"height": [1], "length": [4, 8]}, "conveyor_belt"),
+         ("Pipe_connection", conn.Pipe_connection, 
+          {"l_len": [[1], [1, 2, 1], [1, 2, 1, 2, 1, 2], [1]*300], "directions": [None], "single_path": [False, True]}, 
+          "pipe_connection"),
+         ("Gauge", m_ins.Gauge, {"radius": [0.5, 1], "um": ["", "bar"]}, "gauge"),
+         ("FlowSensor", m_ins.FlowSensor, {"height": [1, 2], "um": ["Flow"]}, "flowsensor"),
+         ("Display_7_segments", dsp.Display_7_segments, {"height": [0.1, 1]}, "display"),
+         ("Button_ON_OFF", btn.Button_ON_OFF, {"radius": [0.5, 1], "active": [0, 1], "tag": ["", "ON"]}, "button"),
+         ("Button_start", btn.Button_start, {"radius": [0.5, 1]}, "button"),
+         ("Button_stop", btn.Button_stop, {"radius": [0.5, 1]}, "button"),
+         ("electric_actuator", vact.electric_actuator, {"height": [1, 2], "position_side": [LEFT, RIGHT]}, "actuator"),
+         ("manual_actuator", vact.manual_actuator, 
+          {"height": [1, 2], "position_side": [LEFT, RIGHT], "actuator_type": [0, 1]}, "actuator"),
+         ("mechanic_actuator", vact.mechanic_actuator, 
+          {"height": [1, 2], "position_side": [LEFT, RIGHT], "actuator_type": [0, 1, 2]}, "actuator"),
+         ("pneumatic_actuator", vact.pneumatic_actuator, {"height": [1, 2], "position_side": [LEFT, RIGHT]}, "actuator")]
+
+
+# ======================================================================================================================
+
+def clear_caches():
+    """
+    Empty all the caches of the library (cold build)
+    """
+
+    vls.chamber_cache.clear()
+    vls.actuator_cache.clear()
+    label_cache.clear()
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def expand_grid(grid):
+    """
+    All the combinations of the parameters grid
+    """
+
+    names = list(grid.keys())
+    for values in itertools.product(*grid.values()):
+        params = dict(zip(names, values))
+        # pipes: alternate directions with the same number of lengths
+        if "directions" in params and params["directions"] is None:
+            params["directions"] = [[RIGHT, DOWN][i%2] for i in range(len(params["l_len"]))]
+        yield params
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def describe(value):
+    """
+    JSON friendly description of a parameter
+    """
+
+    if isinstance(value, np.ndarray):
+        return [float(v) for v in value]
+    if isinstance(value, (list, tuple)):
+        return [describe(v) for v in value]
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    
+    return str(value)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def measure_mobject(mobject):
+    """
+    Number of mobjects (family) and total number of points
+    """
+
+    family = mobject.get_family()
+    n_points = sum(len(m.points) for m in family)
+
+    return len(family), n_points
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def check_color_keys(cache, constructor, params):
+    """
+    True if two builds that differ only in a color have different keys of the disk cache (style and theme)
+    """
+
+    colors = [key for key in getattr(constructor, "arguments", {}) if key.endswith("_color")]
+    if not colors:
+        return None
+
+    keys = [cache.get_key(constructor, {**params, "style": {colors[0]: color}}) for color in (RED, BLUE)]
+    distinct = keys[0] != keys[1]
+
+    if colors[0] in get_theme():
+        keys = []
+        try:
+            for color in (RED, BLUE):
+                set_theme({colors[0]: color})
+                keys.append(cache.get_key(constructor, params))
+        finally:
+            set_theme()
+        distinct = distinct and keys[0] != keys[1]
+
+    return distinct
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def benchmark_case(name, constructor, params, attribute, repeat=5):
+    """
+    Build a component several times and collect the measures
+    """
+
+    # cold build (empty caches)
+    clear_caches()
+    start = time.perf_counter()
+    component = constructor(**params)
+    cold_time = time.perf_counter() - start
+
+    # warm builds (caches already filled)
+    warm_times = []
+    for _ in range(max(repeat - 1, 1)):
+        start = time.perf_counter()
+        constructor(**params)
+        warm_times.append(time.perf_counter() - start)
+
+    # peak memory of a cold build (tracemalloc is not active during the timing)
+    clear_caches()
+    tracemalloc.start()
+    constructor(**params)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # loads from the disk cache (the first request stores the component)
+    with tempfile.TemporaryDirectory() as path:
+        cache = Disk_cache(path=path)
+        cache.build(constructor, **params)
+        disk_times = []
+        for _ in range(max(repeat - 1, 1)):
+            cache.entries.clear()
+            start = time.perf_counter()
+            cache.build(constructor, **params)
+            disk_times.append(time.perf_counter() - start)
+        disk_stats = cache.get_stats()
+        distinct_keys = check_color_keys(cache, constructor, params)
+
+    n_mobjects, n_points = measure_mobject(getattr(component, attribute))
+
+    result = {"component": name,
+              "params": {key: describe(value) for key, value in params.items()},
+              "cold_time_s": cold_time,
+              "warm_time_s": statistics.median(warm_times),
+              "disk_time_s": statistics.median(disk_times) if disk_stats["failures"] == 0 else None,
+              "distinct_color_keys": distinct_keys,
+              "peak_memory_bytes": peak_memory,
+              "mobjects": n_mobjects,
+              "points": n_points}
+    
+    return result
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def run(repeat=5, selection=None):
+    """
+    Run the benchmark on all the components (or only the ones in selection)
+    """
+
+    results = []
+    for name, constructor, grid, attribute in CASES:
+        if selection and name not in selection:
+            continue
+        for params in expand_grid(grid):
+            results.append(benchmark_case(name, constructor, params, attribute, repeat=repeat))
+
+    report = {"benchmark": "construction",
+              "python": platform.python_version(),
+              "manim": getattr(sys.modules.get("manim"), "__version__", "unknown"),
+              "platform": platform.platform(),
+              "results": results}
+    
+    return report
+
+# ======================================================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construction benchmark of the Mlib components")
+    parser.add_argument("--repeat", type=int, default=5, help="builds for each parameters combination")
+    parser.add_argument("--only", nargs="*", default=None, help="names of the components to benchmark")
+    parser.add_argument("--output", default=None, help="JSON file of the results (default stdout)")
+    args = parser.parse_args()
+
+    report = run(repeat=args.repeat, selection=args.only)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
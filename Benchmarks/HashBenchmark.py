@@ -0,0 +1,141 @@
+from manim import *
+import numpy as np
+from numpy import pi
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+from manim.utils import hashing
+
+import Mlib.Pneumatics.DirectionalValves as vls
+import Mlib.Pneumatics.PneumaticCylinders as cyl
+import Mlib.Mechanics.Spring as spr
+import Mlib.Mechanics.ConveyorBelt as cnv
+import Mlib.Mechanics.GeneralConnections as conn
+import Mlib.Instruments.MeasuringInstruments as m_ins
+from Mlib.Tools.Hashing import enable_fast_hashing, disable_fast_hashing, get_digest
+
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Headless benchmark of the hashing of the components for the partial movie cache of manim
+
+Run it with:
+python -m Mlib.Benchmarks.HashBenchmark --repeat 5 --output hashing.json
+
+For every component it reports the time to serialize its mobject with the hashing of manim and with the digests
+of Mlib.Tools.Hashing, and if two builds with the same parameters have the same hash (cache hit on re-render)
+"""
+
+
+# ======================================================================================================================
+# components: (name, constructor, parameters, attribute with the main mobject)
+# ======================================================================================================================
+
+CASES = [("Pneumatic_valve_5_3", vls.Pneumatic_valve_5_3, {"height": 2, "visible_connections": True}, "valve"),
+         ("Pneumatic_cylinder_double_acting", cyl.Pneumatic_cylinder_double_acting, {"height": 1, "width": 4.5},
+          "cylinder"),
+         ("Compression_Spring", spr.Compression_Spring, {"height": 3, "n_coils": 40}, "spring"),
+         ("Converyor_belt", cnv.Converyor_belt, {"height": 1, "length": 8}, "conveyor_belt"),
+         ("Pipe_connection", conn.Pipe_connection, {"l_len": [1, 2]*150, "directions": [RIGHT, DOWN]*150},
+          "pipe_connection"),
+         ("Gauge", m_ins.Gauge, {"radius": 1, "um": "bar"}, "gauge"),
+         ("FlowSensor", m_ins.FlowSensor, {"height": 2, "um": "Flow"}, "flowsensor")]
+
+
+# ======================================================================================================================
+
+def hash_mobject(mobject):
+    """
+    Hash of a mobject as computed by manim for the current mobjects of a play call
+    """
+
+    reset = getattr(getattr(hashing, "_Memoizer", None), "reset_already_processed", None)
+    if reset is not None:
+        reset()
+
+    return hashing.get_json(mobject)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def hash_time(mobject, repeat=5):
+    """
+    Median time to hash a mobject
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hash_mobject(mobject)
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def benchmark_case(name, constructor, params, attribute, repeat=5):
+    """
+    Hash a component with the hashing of manim and with the digests
+    (the components hashed with the digests are built after enable_fast_hashing, which registers them)
+    """
+
+    disable_fast_hashing()
+    manim_time = hash_time(getattr(constructor(**params), attribute), repeat=repeat)
+
+    enable_fast_hashing()
+    mobject = getattr(constructor(**params), attribute)
+    fast_time = hash_time(mobject, repeat=repeat)
+    stable = get_digest(mobject) == get_digest(getattr(constructor(**params), attribute))
+    disable_fast_hashing()
+
+    result = {"component": name,
+              "manim_hash_s": manim_time,
+              "fast_hash_s": fast_time,
+              "speedup": manim_time/fast_time if fast_time > 0 else None,
+              "stable": stable}
+
+    return result
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def run(repeat=5, selection=None):
+    """
+    Run the benchmark on all the components (or only the ones in selection)
+    """
+
+    results = []
+    for name, constructor, params, attribute in CASES:
+        if selection and name not in selection:
+            continue
+        results.append(benchmark_case(name, constructor, params, attribute, repeat=repeat))
+
+    report = {"benchmark": "hashing",
+              "python": platform.python_version(),
+              "manim": getattr(sys.modules.get("manim"), "__version__", "unknown"),
+              "platform": platform.platform(),
+              "results": results}
+
+    return report
+
+# ======================================================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hashing benchmark of the Mlib components")
+    parser.add_argument("--repeat", type=int, default=5, help="hashes for each component")
+    parser.add_argument("--only", nargs="*", default=None, help="names of the components to benchmark")
+    parser.add_argument("--output", default=None, help="JSON file of the results (default stdout)")
+    args = parser.parse_args()
+
+    report = run(repeat=args.repeat, selection=args.only)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
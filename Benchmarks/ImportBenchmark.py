@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Import time benchmark of the Mlib package
+
+Run it with:
+python -m Mlib.Benchmarks.ImportBenchmark --repeat 5 --output imports.json
+
+Every measure runs in a fresh interpreter: manim is imported first (every scene pays it anyway),
+then the time to import Mlib and access the component is measured.
+The exit code is 1 if any median import time exceeds the target (default TARGET_MS, the eager imports
+of the example are only the reference and are not checked)
+"""
+
+
+# ======================================================================================================================
+
+# package root and the folder that has to be on the path to import it as Mlib
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_PARENT = os.path.dirname(PACKAGE_ROOT)
+
+# maximum median import time of the package and of each component (ms)
+TARGET_MS = 50
+
+# cases measured only as reference (not checked against the target)
+REFERENCES = ("example (eager imports)",)
+
+# statements timed in the child interpreter (after "import manim")
+CASES = {"package": "import Mlib",
+         "example (eager imports)": "import Mlib.Pneumatics.PneumaticCylinders, Mlib.Pneumatics.DirectionalValves, "
+                                    "Mlib.Mechanics.GeneralConnections, Mlib.Pneumatics.FunctionalValves, "
+                                    "Mlib.Instruments.MeasuringInstruments, Mlib.Graphics.Colors"}
+
+CHILD = """
+import time
+import manim
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+# ======================================================================================================================
+
+def component_cases():
+    """
+    One case for each component of the package namespace (import Mlib; Mlib.component)
+    """
+
+    sys.path.insert(0, PACKAGE_PARENT)
+    import Mlib
+
+    return {name: f"import Mlib; Mlib.{name}" for name in Mlib.COMPONENTS}
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def measure(statement):
+    """
+    Time a statement in a fresh interpreter, return the time in ms
+
+    statement: python code to time
+    """
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_PARENT, env.get("PYTHONPATH")]))
+    output = subprocess.run([sys.executable, "-c", CHILD.format(statement=statement)],
+                            env=env, capture_output=True, text=True, check=True)
+
+    return float(output.stdout.strip().splitlines()[-1])*1000
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def run(repeat=5, target_ms=TARGET_MS, selection=None):
+    """
+    Run the benchmark on all the cases (or only the ones in selection)
+    target_ms: maximum median import time (None: no check)
+    """
+
+    cases = {**CASES, **component_cases()}
+
+    results = []
+    for name, statement in cases.items():
+        if selection and name not in selection:
+            continue
+        times = [measure(statement) for _ in range(repeat)]
+        median = statistics.median(times)
+        results.append({"name": name,
+                        "statement": statement,
+                        "median_ms": median,
+                        "min_ms": min(times),
+                        "max_ms": max(times),
+                        "passed": target_ms is None or name in REFERENCES or median <= target_ms})
+
+    report = {"benchmark": "import",
+              "python": platform.python_version(),
+              "platform": platform.platform(),
+              "target_ms": target_ms,
+              "results": results}
+
+    return report
+
+# ======================================================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import time benchmark of the Mlib package")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters for each case")
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS, help=f"maximum median import time (ms, default {TARGET_MS})")
+    parser.add_argument("--only", nargs="*", default=None, help="names of the cases to benchmark")
+    parser.add_argument("--output", default=None, help="JSON file of the results (default stdout)")
+    args = parser.parse_args()
+
+    report = run(repeat=args.repeat, target_ms=args.target_ms, selection=args.only)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if not all(result["passed"] for result in report["results"]):
+        sys.exit(1)
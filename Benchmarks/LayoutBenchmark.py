@@ -0,0 +1,185 @@
+from manim import *
+import numpy as np
+from numpy import pi
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+import Mlib.Pneumatics.DirectionalValves as vls
+import Mlib.Pneumatics.FunctionalValves as f_vls
+import Mlib.Pneumatics.PneumaticCylinders as cyl
+import Mlib.Mechanics.ConveyorBelt as cnv
+import Mlib.Mechanics.GeneralConnections as conn
+import Mlib.Mechanics.Spring as spr
+import Mlib.Instruments.MeasuringInstruments as m_ins
+import Mlib.Electronics.Buttons as btn
+import Mlib.Electronics.Displays as dsp
+from Mlib.Tools.Layout import get_footprint
+from Mlib.Benchmarks.ConstructionBenchmark import expand_grid, describe
+
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Consistency check of the footprints (see Mlib.Tools.Layout) with the components
+
+The footprints are computed by the classmethods get_footprint of the components with the same formulas of the
+constructors, without mobjects: every case builds the component and compares its ports and bounding box with
+the footprint, so a part of a component drawn outside its formulas (e.g. an actuator) is found here
+
+Run it with:
+python -m Mlib.Benchmarks.LayoutBenchmark --tolerance 0.01 --output layout.json
+
+For every build it reports the largest distance of the bounding box and of each port from the footprint, the time
+of the footprint and of the construction, in JSON format (exit status 1 if a distance is over the tolerance)
+"""
+
+
+# ======================================================================================================================
+# components: (name, constructor, parameters grid, attribute (or function) with the main mobject, ports of the component)
+# ======================================================================================================================
+
+ACTUATORS = ["Coil", "Manual lever", "Push button", "Simple lever", "Roller lever", "Compression spring", "Pneumatic signal"]
+
+# ports of the directional valves: connections of every chamber (get_input_1, get_output_2, get_input_3, etc etc...)
+VALVE_GETTERS = {1: "get_input_1", 2: "get_output_2", 3: "get_input_3", 4: "get_output_4", 5: "get_input_5"}
+
+def valve_ports(sides, connections):
+    """
+    Ports "side.i" of the chambers of a directional valve
+    """
+
+    return {f"{side}.{i}": (lambda i, side: lambda c: getattr(c, VALVE_GETTERS[i])(chamber=getattr(c, f"{side}_chamber")))(i, side)
+            for side in sides for i in connections}
+
+VALVE_PORTS_5 = valve_ports(("left", "right"), (1, 2, 3, 4, 5))
+VALVE_PORTS_5_3 = valve_ports(("left", "central", "right"), (1, 2, 3, 4, 5))
+VALVE_PORTS_3 = valve_ports(("left", "right"), (1, 2, 3))
+
+# ports of the logic valves: ends of the connections (lines of the body after the symbol)
+LOGIC_PORTS = lambda first: {f"{i + 1}": (lambda i: lambda c: c.body[first + i].get_end())(i) for i in range(3)}
+
+# ports of the buttons: center of the external frame
+BUTTON_PORTS = {"center": lambda c: c.frame_button[0].get_center()}
+
+CASES = [("Pneumatic_valve_5_2", vls.Pneumatic_valve_5_2,
+          {"height": [1, 2], "left_actuator_choice": ACTUATORS, "right_actuator_choice": ACTUATORS}, "valve", VALVE_PORTS_5),
+         ("Pneumatic_valve_5_3", vls.Pneumatic_valve_5_3,
+          {"height": [1, 2], "center_selection": [0, 1, 2]}, "valve", VALVE_PORTS_5_3),
+         ("Pneumatic_valve_3_2", vls.Pneumatic_valve_3_2,
+          {"height": [1, 2], "right_actuator_choice": ["Compression spring", "Roller lever"]}, "valve", VALVE_PORTS_3),
+         ("OneWay_flow_control_valve", f_vls.OneWay_flow_control_valve,
+          {"height": [1.5], "angle": [0, pi/2], "flip": [-1, 1]}, "valve",
+          {"1": lambda c: c.get_input_1(), "2": lambda c: c.get_output_2()}),
+         ("Piloted_check_valve", f_vls.Piloted_check_valve,
+          {"height": [1.5], "angle": [0, pi/2], "flip": [-1, 1]}, "valve",
+          {"1": lambda c: c.get_input_1(), "3": lambda c: c.get_input_3()}),
+         ("AND_valve", f_vls.AND_valve, {"height": [1, 2]}, "valve", LOGIC_PORTS(8)),
+         ("OR_valve", f_vls.OR_valve, {"height": [1, 2]}, "valve", LOGIC_PORTS(12)),
+         ("Pneumatic_cylinder_double_acting", cyl.Pneumatic_cylinder_double_acting,
+          {"height": [1, 2], "width": [4], "angle": [0, pi/2]}, "cylinder",
+          {"fitting_1": lambda c: c.fittings[0].get_right(), "fitting_2": lambda c: c.fittings[1].get_right()}),
+         ("Pneumatic_cylinder_single_acting", cyl.Pneumatic_cylinder_single_acting, {"height": [2]}, "cylinder", {}),
+         ("Gauge", m_ins.Gauge, {"radius": [0.5, 1]}, "gauge", {"center": lambda c: c.body[0].get_center()}),
+         ("FlowSensor", m_ins.FlowSensor, {"height": [1, 2]}, "flowsensor",
+          {"fitting_TOP": lambda c: c.get_fitting_TOP(), "fitting_BOTTOM": lambda c: c.get_fitting_BOTTOM()}),
+         ("Pipe_connection", conn.Pipe_connection, {"l_len": [[1]], "directions": [[RIGHT], [UP]]}, "pipe_connection",
+          {"end": lambda c: c.get_end()}),
+         ("Pipe_connection", conn.Pipe_connection, {"l_len": [[1, 2, 1]], "directions": [[RIGHT, UP, LEFT]]}, 
+          "pipe_connection", {"end": lambda c: c.get_end()}),
+         ("Converyor_belt", cnv.Converyor_belt, {"height": [1], "length": [4, 6]}, "conveyor_belt",
+          {"left_pulley": lambda c: c.left_pulley.get_center(), "right_pulley": lambda c: c.right_pulley.get_center()}),
+         ("Compression_Spring", spr.Compression_Spring, {"d_ext": [1], "height": [2, 3], "angle": [0, pi/2]}, "spring", {}),
+         ("Button_ON_OFF", btn.Button_ON_OFF, {"radius": [0.5, 1]}, lambda c: c.frame_button[0], BUTTON_PORTS),
+         ("Button_start", btn.Button_start, {"radius": [1]}, lambda c: c.frame_button[0], BUTTON_PORTS),
+         ("Button_stop", btn.Button_stop, {"radius": [1]}, lambda c: c.frame_button[0], BUTTON_PORTS),
+         ("Display_7_segments", dsp.Display_7_segments, {"height": [1, 2]}, "display", {})]
+
+# ======================================================================================================================
+
+def check_case(name, constructor, params, attribute, ports, repeat=5):
+    """
+    Build a component and compare its ports and bounding box with the footprint
+    """
+
+    # footprint (median time of several computations)
+    footprint_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        footprint = get_footprint(name, **params)
+        footprint_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    component = constructor(**params)
+    construction_time = time.perf_counter() - start
+
+    # bounding box of the main mobject (corners DL and UR, like Footprint.box), the empty ones have an empty box
+    mobject = attribute(component) if callable(attribute) else getattr(component, attribute)
+    if len(mobject.get_family()) > 1 or mobject.has_points():
+        box = np.array([mobject.get_corner(DL), mobject.get_corner(UR)])
+    else:
+        box = np.zeros((2, 3))
+    box_error = float(np.max(np.abs(box[:, :2] - footprint.box[:, :2])))
+
+    port_errors = {port: float(np.linalg.norm((np.asarray(get_point(component)) - footprint.get_port(port))[:2]))
+                   for port, get_point in ports.items()}
+
+    result = {"component": name,
+              "params": {key: describe(value) for key, value in params.items()},
+              "box_error": box_error,
+              "port_errors": port_errors,
+              "footprint_time_s": statistics.median(footprint_times),
+              "construction_time_s": construction_time}
+
+    return result
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def run(repeat=5, tolerance=0.01, selection=None):
+    """
+    Check the footprints of all the components (or only the ones in selection)
+    """
+
+    results = []
+    for name, constructor, grid, attribute, ports in CASES:
+        if selection and name not in selection:
+            continue
+        for params in expand_grid(grid):
+            result = check_case(name, constructor, params, attribute, ports, repeat=repeat)
+            result["passed"] = max([result["box_error"], *result["port_errors"].values()]) <= tolerance
+            results.append(result)
+
+    report = {"benchmark": "layout",
+              "python": platform.python_version(),
+              "manim": getattr(sys.modules.get("manim"), "__version__", "unknown"),
+              "platform": platform.platform(),
+              "tolerance": tolerance,
+              "passed": all(result["passed"] for result in results),
+              "results": results}
+
+    return report
+
+# ======================================================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consistency check of the footprints of the Mlib components")
+    parser.add_argument("--repeat", type=int, default=5, help="computations of each footprint")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="largest distance from the component")
+    parser.add_argument("--only", nargs="*", default=None, help="names of the components to check")
+    parser.add_argument("--output", default=None, help="JSON file of the results (default stdout)")
+    args = parser.parse_args()
+
+    report = run(repeat=args.repeat, tolerance=args.tolerance, selection=args.only)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    sys.exit(0 if report["passed"] else 1)
@@ -0,0 +1,140 @@
+from manim import *
+import numpy as np
+from numpy import pi
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+import Mlib.Pneumatics.DirectionalValves as vls
+import Mlib.Mechanics.ConveyorBelt as cnv
+import Mlib.Instruments.MeasuringInstruments as m_ins
+from Mlib.Graphics.Raster import raster_cache
+
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Headless benchmark of the frame render time (Cairo camera) of the components, with vector parts
+and with the static parts frozen into raster layers (see Mlib.Graphics.Raster)
+
+Run it with:
+python -m Mlib.Benchmarks.RenderBenchmark --frames 30 --output render.json
+
+In every frame a small part of the component moves (like in a scene where something is animated) and the updaters
+run before the capture, as in Scene.update_mobjects: the refresh of the raster layers is part of the frame time.
+In the rotating cases the frozen parts themselves are rotated, so every frame rasterizes them again.
+The report has the median time per frame before and after freeze(), in JSON format
+"""
+
+
+# ======================================================================================================================
+# components: (name, constructor, parameters, attribute with the main mobject, function that moves a part)
+# ======================================================================================================================
+
+CASES = [("Pneumatic_valve_5_2", vls.Pneumatic_valve_5_2, {"height": 2, "visible_connections": True}, "valve",
+          lambda component: component.left_actuator.actuator.shift(0.001*RIGHT)),
+         ("Pneumatic_valve_5_3", vls.Pneumatic_valve_5_3, {"height": 2, "visible_connections": True}, "valve",
+          lambda component: component.left_actuator.actuator.shift(0.001*RIGHT)),
+         ("Gauge", m_ins.Gauge, {"radius": 1.5, "um": "bar"}, "gauge",
+          lambda component: component.arrow.rotate(0.01, about_point=component.body[0].get_center())),
+         ("FlowSensor", m_ins.FlowSensor, {"height": 2, "um": "Flow"}, "flowsensor",
+          lambda component: component.screen.shift(0.001*UP)),
+         ("Converyor_belt", cnv.Converyor_belt, {"height": 1, "length": 6}, "conveyor_belt",
+          lambda component: component.left_pulley.rotate(0.01)),
+         ("Gauge_rotating", m_ins.Gauge, {"radius": 1.5, "um": "bar"}, "gauge",
+          lambda component: component.gauge.rotate(0.01)),
+         ("Pneumatic_valve_5_2_rotating", vls.Pneumatic_valve_5_2, {"height": 2}, "valve",
+          lambda component: component.valve.rotate(0.01))]
+
+
+# ======================================================================================================================
+
+def frame_time(camera, mobject, move, frames=30):
+    """
+    Median time to update and render a frame of the mobject (a part is moved before every frame)
+    """
+
+    times = []
+    for _ in range(frames):
+        move()
+        start = time.perf_counter()
+        mobject.update(1/config.frame_rate)
+        camera.reset()
+        camera.capture_mobject(mobject)
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def benchmark_case(name, constructor, params, attribute, move, frames=30):
+    """
+    Render a component with vector parts and with frozen parts
+    """
+
+    camera = Camera()
+    component = constructor(**params)
+    mobject = getattr(component, attribute)
+
+    vector_time = frame_time(camera, mobject, lambda: move(component), frames=frames)
+
+    raster_cache.clear()
+    start = time.perf_counter()
+    frozen = component.freeze()
+    freeze_time = time.perf_counter() - start
+
+    raster_time = frame_time(camera, frozen, lambda: move(component), frames=frames)
+    component.thaw()
+
+    result = {"component": name,
+              "params": params,
+              "vector_frame_s": vector_time,
+              "raster_frame_s": raster_time,
+              "speedup": vector_time/raster_time if raster_time > 0 else None,
+              "freeze_s": freeze_time}
+
+    return result
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def run(frames=30, selection=None):
+    """
+    Run the benchmark on all the components (or only the ones in selection)
+    """
+
+    results = []
+    for name, constructor, params, attribute, move in CASES:
+        if selection and name not in selection:
+            continue
+        results.append(benchmark_case(name, constructor, params, attribute, move, frames=frames))
+
+    report = {"benchmark": "render",
+              "python": platform.python_version(),
+              "manim": getattr(sys.modules.get("manim"), "__version__", "unknown"),
+              "platform": platform.platform(),
+              "resolution": [config.pixel_width, config.pixel_height],
+              "results": results}
+
+    return report
+
+# ======================================================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Frame render benchmark of the Mlib components (vector/raster)")
+    parser.add_argument("--frames", type=int, default=30, help="rendered frames for each case")
+    parser.add_argument("--only", nargs="*", default=None, help="names of the components to benchmark")
+    parser.add_argument("--output", default=None, help="JSON file of the results (default stdout)")
+    args = parser.parse_args()
+
+    report = run(frames=args.frames, selection=args.only)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
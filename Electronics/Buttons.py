@@ -2,6 +2,10 @@ from manim import *
 import numpy as np
 from numpy import pi
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Labels import cached_text
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Instrumentation import instrumented
+from Mlib.Tools.Layout import Footprint
 
 """
 Author: Ivan Archetti   
@@ -19,16 +23,23 @@ class Button_ON_OFF():
     Button with two state On and OFF
     """
 
-    arguments = {"frame_color": GREY_B,
-                 "ON_color": PURE_RED,
-                 "OFF_color": RED_E,}
+    arguments = Style({"frame_color": GREY_B,
+                       "ON_color": PURE_RED,
+                       "OFF_color": RED_E,})
 
-    def __init__(self, radius=1, active=0, tag="", **kwargs):
+    # outer radius of the frame (ratio of the radius of the button)
+    frame_ratio = 1.2
+
+    def __init__(self, radius=1, active=0, tag="", style=None, **kwargs):
         """
         active: is the state of activation of the button (0 not activate, 1 activate)
         tag: description under the button
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
         """
 
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization
         self.frame_color = self.arguments["frame_color"]
         self.ON_color = self.arguments["ON_color"]
@@ -53,7 +64,7 @@ class Button_ON_OFF():
         
         # initialization
         r_in = self.r
-        r_out = 1.2*self.r
+        r_out = self.frame_ratio*self.r
         active = self.active
         
         frame_color = self.frame_color
@@ -75,12 +86,26 @@ class Button_ON_OFF():
         button.add(Circle(radius=r_in, color=color, fill_color=color, fill_opacity=0.9))
 
         #2 add decription tag
-        button.add(Text(tag, color=GREY_D).scale(r_in).next_to(button[0], direction=DOWN, buff=r_in/3))
+        button.add(cached_text(tag, color=GREY_D).scale(r_in).next_to(button[0], direction=DOWN, buff=r_in/3))
         
         return button
 
     # ----------------------------------------------------------------------------------------------------------------------
 
+    @classmethod
+    def get_footprint(cls, radius=1, **kwargs):
+        """
+        Footprint of the button (see Mlib.Tools.Layout): port "center" and box of the external frame 
+        (the tag is not included)
+        """
+
+        r_out = cls.frame_ratio*radius
+
+        return Footprint(ports={"center": ORIGIN}, box=np.array([[-r_out, -r_out, 0], [r_out, r_out, 0]]))
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
     def activation(self, active=0):
         """
         Set the button's status
@@ -105,13 +130,12 @@ class Button_start(Button_ON_OFF):
     Start button with two state On and OFF
     """
 
-    def __init__(self, radius=1, active=0, **kwargs):
-        tag="start"
+    arguments = Button_ON_OFF.arguments.replace(ON_color=GREEN_AUT, OFF_color=GREEN_E)
 
-        self.arguments["ON_color"] = GREEN_AUT
-        self.arguments["OFF_color"] = GREEN_E
+    def __init__(self, radius=1, active=0, style=None, **kwargs):
+        tag="start"
 
-        super().__init__(radius=radius, active=active, tag=tag)
+        super().__init__(radius=radius, active=active, tag=tag, style=style)
 
 # ======================================================================================================================
 
@@ -120,12 +144,11 @@ class Button_stop(Button_ON_OFF):
     Start button with two state On and OFF
     """
 
-    def __init__(self, radius=1, active=0, **kwargs):
-        tag="stop"
+    arguments = Button_ON_OFF.arguments.replace(ON_color=PURE_RED, OFF_color=RED_E)
 
-        self.arguments["ON_color"] = PURE_RED
-        self.arguments["OFF_color"] = RED_E
+    def __init__(self, radius=1, active=0, style=None, **kwargs):
+        tag="stop"
 
-        super().__init__(radius=radius, active=active, tag=tag)
+        super().__init__(radius=radius, active=active, tag=tag, style=style)
 
 # ======================================================================================================================
\ No newline at end of file
@@ -2,6 +2,11 @@ from manim import *
 import numpy as np
 from numpy import pi
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Primitives import polygon_points
+from Mlib.Graphics.Animations import fused_transform
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Instrumentation import instrumented
+from Mlib.Tools.Layout import Footprint, get_box
 
 """
 Author: Ivan Archetti   
@@ -19,14 +24,17 @@ class Display_7_segments():
     Seven segments display
     """
 
-    arguments = {"display_stroke_color": GREY_E,
-                 "display_stroke_width": 1,
-                 "display_fill_color": GREY_A,
-                 "display_on": RED_C,
-                 "brightness_ON": 1,
-                 "brightness_OFF": 0.1}
+    arguments = Style({"display_stroke_color": GREY_E,
+                       "display_stroke_width": 1,
+                       "display_fill_color": GREY_A,
+                       "display_on": RED_C,
+                       "brightness_ON": 1,
+                       "brightness_OFF": 0.1})
 
-    def __init__(self, height=1, **kwargs):
+    def __init__(self, height=1, style=None, **kwargs):
+
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
 
         # initialization
         self.display_stroke_color = self.arguments["display_stroke_color"]
@@ -40,6 +48,8 @@ class Display_7_segments():
         self.w = height
 
         self.segment_matrix = self.set_segments_matrix()
+        # current state of the segments (True ON, False OFF)
+        self.segment_state = np.zeros(7, dtype=bool)
 
         self.display = VGroup()
 
@@ -52,61 +62,103 @@ class Display_7_segments():
     def set_seven_segments(self):
         """
         Set the seven segments in order to create a singol display
+        (the points of all the segments are generated together)
         """
         
         # initialization
-        w = self.w
-        a = w/5
+        display_fill_color = self.display_fill_color
+        brightness = self.brightness_OFF
+
+        vertices = self.get_segments_vertices(self.w)
+        points = polygon_points(vertices).reshape(len(vertices), -1, 3)
 
         seven_segments = VGroup()
-        
-        central_segment = self.set_central_segment()
-        vertical_segment_UR = self.set_vertical_segment()
-        vertical_segment_DR = self.set_vertical_segment()
-        vertical_segment_UL = self.set_vertical_segment()
-        vertical_segment_DL = self.set_vertical_segment()
-        horizontal_segment_UP = self.set_horizontal_segment()
-        horizontal_segment_DOWN = self.set_horizontal_segment()
 
-        # add central segment
-        seven_segments.add(central_segment)
+        # filling the segments
+        for segment_points in points:
+            seven_segments.add(VMobject(color=display_fill_color, fill_opacity=brightness, stroke_width=0).set_points(segment_points))
+
+        return seven_segments
+    
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def get_segments_vertices(cls, width=1):
+        """
+        Vertices (7, n, 3) of the seven segments (see set_segments_matrix for the order)
+        """
 
-        # add vertical right segments   
-        seven_segments.add(vertical_segment_UR.rotate(pi/2).shift((w/2)*RIGHT + w/2*UP))
-        seven_segments.add(vertical_segment_DR.rotate(-pi/2).shift((w/2)*RIGHT + w/2*DOWN).flip())
+        # initialization
+        w = width
+        a = w/5
 
-        # add vertical right segments   
-        seven_segments.add(vertical_segment_UL.rotate(pi/2).shift((w/2)*LEFT + w/2*UP).flip())
-        seven_segments.add(vertical_segment_DL.rotate(-pi/2).shift((w/2)*LEFT + w/2*DOWN))
+        central_segment = cls.set_central_segment(w)
+        vertical_segment = cls.set_vertical_segment(w)
+        horizontal_segment = cls.set_horizontal_segment(w)
 
-        # add horizontal upper
-        seven_segments.add(horizontal_segment_UP.shift((w-a*3**(1/2)/4)*UP)) 
+        vertices = [central_segment, # central segment
+                    cls.__transform_segment(vertical_segment, angle=pi/2, shift=(w/2)*RIGHT + w/2*UP), # vertical right segments
+                    cls.__transform_segment(vertical_segment, angle=-pi/2, shift=(w/2)*RIGHT + w/2*DOWN, flip_axis=UP),
+                    cls.__transform_segment(vertical_segment, angle=pi/2, shift=(w/2)*LEFT + w/2*UP, flip_axis=UP), # vertical left segments
+                    cls.__transform_segment(vertical_segment, angle=-pi/2, shift=(w/2)*LEFT + w/2*DOWN),
+                    cls.__transform_segment(horizontal_segment, shift=(w-a*3**(1/2)/4)*UP), # horizontal upper
+                    cls.__transform_segment(horizontal_segment, shift=(w-a*3**(1/2)/4)*DOWN, flip_axis=RIGHT)] # horizontal lower
 
-        # add horizontal lower
-        seven_segments.add(horizontal_segment_DOWN.shift((w-a*3**(1/2)/4)*DOWN).flip(axis=RIGHT))
+        # same number of vertices for each segment (the last vertex is repeated)
+        n_vertices = max(len(v) for v in vertices)
 
-        return seven_segments
+        return np.stack([np.concatenate([v, np.repeat(v[-1:], n_vertices - len(v), axis=0)]) for v in vertices])
 
     # ----------------------------------------------------------------------------------------------------------------------
 
-    def set_central_segment(self):
+    @classmethod
+    def get_footprint(cls, height=1, **kwargs):
         """
-        Definition of the central segment of the display
+        Footprint of the display (see Mlib.Tools.Layout): box of the segments, no ports
         """
 
-        # initialization
-        display_fill_color = self.display_fill_color
-        brightness = self.brightness_OFF
+        return Footprint(ports={}, box=get_box(cls.get_segments_vertices(height)))
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def __transform_segment(cls, vertices, angle=0, shift=ORIGIN, flip_axis=None):
+        """
+        Rotate (respect to the center), shift and flip (respect to the center) the vertices of a segment
+        vertices: array (n, 3) of the vertices
+        flip_axis: UP flips horizontally, RIGHT flips vertically
+        """
 
-        w = self.w
+        # rotation respect to the center of the segment
+        center = (vertices.min(axis=0) + vertices.max(axis=0))/2
+        vertices = center + (vertices - center) @ rotation_matrix(angle, OUT).T
+        vertices = vertices + shift
+
+        # flip respect to the center of the segment
+        if flip_axis is not None:
+            center = (vertices.min(axis=0) + vertices.max(axis=0))/2
+            mirror = np.where(np.abs(flip_axis) > 0, 1, -1)
+            mirror[2] = -1
+            vertices = center + (vertices - center)*mirror
+
+        return vertices
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def set_central_segment(cls, width=1):
+        """
+        Definition of the vertices of the central segment of the display
+        """
+
+        # initialization
+        w = width
         a = w/5
         alpha = pi/6
         tan = np.tan(alpha)
         s = w/2 - a*(3**(1/2) - 1.2)
         l = a/(2*tan)
 
-        central_segment = VGroup()
-
         # points of the segment 
         A = s*RIGHT + a/2*DOWN
         B = (l+s)*RIGHT 
@@ -115,32 +167,25 @@ class Display_7_segments():
         E = (l+s)*LEFT
         F = s*LEFT + a/2*DOWN
 
-        points = [F, A, B, C, D, E, F] # loop of the segment
-        
-        # filling the segment
-        central_segment.add(Polygon(*points, color=display_fill_color, fill_opacity=brightness, stroke_width=0))
+        central_segment = np.array([F, A, B, C, D, E]) # loop of the segment
 
         return central_segment
 
     # ----------------------------------------------------------------------------------------------------------------------
 
-    def set_vertical_segment(self):
+    @classmethod
+    def set_vertical_segment(cls, width=1):
         """
-        Definition of the central segment of the display
+        Definition of the vertices of the vertical segment of the display
         """
 
         # initialization
-        display_fill_color = self.display_fill_color
-        brightness = self.brightness_OFF
-
-        w = self.w
+        w = width
         a = w/5
         alpha = pi/3
         tan = np.tan(alpha)
         s = a*3**(1/2)/2
 
-        v_segment = VGroup()
-
         # points of the segment 
         A = (w/2-(s-a/2)*tan)*RIGHT
         B = w/2*RIGHT + (s-a/2)*UP 
@@ -148,40 +193,30 @@ class Display_7_segments():
         D = (w/2-a/2)*LEFT + s*UP
         E = w/2*LEFT
 
-        points = [E, A, B, C, D, E] # loop of the segment
-
-        # filling the segment
-        v_segment.add(Polygon(*points, color=display_fill_color, fill_opacity=brightness, stroke_width=0)).shift(3**(1/2)/4*a*DOWN)
+        v_segment = np.array([E, A, B, C, D]) + 3**(1/2)/4*a*DOWN # loop of the segment
 
         return v_segment
     
     # ----------------------------------------------------------------------------------------------------------------------
 
-    def set_horizontal_segment(self):
+    @classmethod
+    def set_horizontal_segment(cls, width=1):
         """
-        Definition of the central segment of the display
+        Definition of the vertices of the horizontal segment of the display
         """
 
         # initialization
-        display_fill_color = self.display_fill_color
-        brightness = self.brightness_OFF
-
-        w = self.w
+        w = width
         a = w/5
         s =  a*3**(1/2)/2
 
-        h_segment = VGroup()
-
         # points of the segment 
         A = (w/2 - a/2)*RIGHT 
         B = (w/2)*RIGHT + s*UP
         C = (w/2)*LEFT + s*UP
         D = (w/2 - a/2)*LEFT
 
-        points = [D, A, B, C, D] # loop of the segment
-
-        # filling the segment
-        h_segment.add(Polygon(*points, color=display_fill_color, fill_opacity=brightness, stroke_width=0)).shift(3**(1/2)/4*a*DOWN)
+        h_segment = np.array([D, A, B, C]) + 3**(1/2)/4*a*DOWN # loop of the segment
 
         return h_segment
     
@@ -221,31 +256,63 @@ class Display_7_segments():
     
     # ----------------------------------------------------------------------------------------------------------------------
 
+    @instrumented
     def select_segments(self, number=0):
         """
         Activate the number indicate in number
+        Only the segments that change state are animated, all together in a single animation
         """
-        
+
+        return self.switch_segments(self.get_changed_segments(number=number))
+    
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_changed_segments(self, number=0):
+        """
+        Compare the segments required by number with the current state and update the state
+        return: list of (segment, state) of the segments that change state
+        """
+
+        sequences = np.array(self.segment_matrix[number], dtype=bool)
+        changed = np.flatnonzero(sequences != self.segment_state)
+
+        # the state is updated when the animation is created
+        self.segment_state = sequences
+
+        return [(self.seven_segments[i], sequences[i]) for i in changed]
+    
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def switch_segments(self, changes):
+        """
+        Single animation that switches on/off the segments
+        changes: list of (segment, state), also from different displays (see get_changed_segments)
+        """
+
         # initialization
         brightness_ON = self.brightness_ON
         brightness_OFF = self.brightness_OFF
 
-        functions = []
-        sequences = self.segment_matrix[number]
-
-        for i, segment in enumerate(sequences):
-            if segment == 0:
-                segment_color = self.display_fill_color
-                brightness = brightness_OFF
-            elif segment == 1:
-                segment_color = self.display_on
-                brightness = brightness_ON 
-            functions.append(self.seven_segments[i].animate().set_color(segment_color).set_fill(opacity=brightness))
+        # nothing changes
+        if len(changes) == 0:
+            return Wait()
+
+        def edit(target):
+            for segment, (_, state) in zip(target, changes):
+                if state:
+                    segment_color = self.display_on
+                    brightness = brightness_ON 
+                else:
+                    segment_color = self.display_fill_color
+                    brightness = brightness_OFF
+                segment.set_color(segment_color).set_fill(opacity=brightness)
         
-        return functions
+        return fused_transform([segment for segment, _ in changes], edit)
     
     # ----------------------------------------------------------------------------------------------------------------------
 
+    @instrumented
     def reset_display(self):
         """
         Reset all the segments
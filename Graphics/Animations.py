@@ -0,0 +1,96 @@
+from manim import *
+import numpy as np
+from numpy import pi
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Animation helpers shared by the components
+"""
+
+
+# ======================================================================================================================
+
+class Fused_transform(Animation):
+    """
+    Transform of many parts (of one or more components) to their targets in a single pass: the parts are 
+    interpolated where they are, no group is added to the scene and the drawing order is kept
+    """
+
+    def __init__(self, mobjects, targets, **kwargs):
+        """
+        mobjects: list of the moving parts (without duplicates)
+        targets: edited copies of the parts (same order of mobjects)
+        kwargs: arguments of the animation (run_time, rate_func, etc etc...)
+        """
+
+        # initialization
+        self.parts = list(mobjects)
+        self.targets = list(targets)
+        self.starts = []
+
+        super().__init__(self.parts[0], suspend_mobject_updating=False, **kwargs)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def _setup_scene(self, scene):
+        super()._setup_scene(scene)
+
+        # animated mobject: the first part in the drawing order (the scene redraws the mobjects after it at each frame)
+        order = {id(mobject): i for i, mobject in enumerate(scene.get_mobject_family_members())}
+        drawn = [part for part in self.parts if id(part) in order]
+        if drawn:
+            self.mobject = min(drawn, key=lambda part: order[id(part)])
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def begin(self):
+        for part, target in zip(self.parts, self.targets):
+            part.suspend_updating()
+            part.align_data(target)
+        self.starts = [part.copy() for part in self.parts]
+        self.interpolate(0)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def finish(self):
+        self.interpolate(1)
+        for part in self.parts:
+            part.resume_updating()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        for part, start, target in zip(self.parts, self.starts, self.targets):
+            for mobject, mobject_start, mobject_target in zip(part.get_family(), start.get_family(), target.get_family()):
+                mobject.interpolate(mobject_start, mobject_target, alpha)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_all_mobjects(self):
+        return self.parts
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def fused_transform(mobjects, edit, **kwargs):
+    """
+    Single animation for many parts of a component: the parts are copied once, edited together
+    and interpolated in a single pass (instead of one .animate builder for each part)
+
+    mobjects: list of the moving parts (without duplicates)
+    edit: function that receives the group of the copies (same order of mobjects) and edits it
+    kwargs: arguments of the animation (run_time, rate_func, etc etc...)
+    """
+
+    # initialization
+    targets = [mobject.copy() for mobject in mobjects]
+
+    # the group of the copies is only a view for the edit, it is not animated
+    edit(VGroup(*targets))
+
+    return Fused_transform(mobjects, targets, **kwargs)
+
+# ======================================================================================================================
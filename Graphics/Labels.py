@@ -0,0 +1,32 @@
+from manim import *
+from Mlib.Tools.Cache import Prototype_cache
+
+"""
+Author: Ivan Archetti   
+Creation date: 18/10/2026
+
+
+Process-wide cache of the text labels used by the components
+"""
+
+
+# ======================================================================================================================
+
+# pre-parsed labels shared by all the components (hits and misses are in get_stats())
+label_cache = Prototype_cache(name="labels")
+
+# ======================================================================================================================
+
+def cached_text(text, color=BLACK, font="", font_size=DEFAULT_FONT_SIZE, **kwargs):
+    """
+    Return a copy of a Text already parsed, the Text is created only the first time 
+    that the same string, font, color and size are required
+    text: string of the label
+    kwargs: other parameters of Text (they are part of the key too)
+    """
+
+    key = (text, font, str(color), font_size, tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+
+    return label_cache.get(key, lambda: Text(text, color=color, font=font, font_size=font_size, **kwargs))
+
+# ======================================================================================================================
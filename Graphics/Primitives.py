@@ -0,0 +1,135 @@
+from manim import *
+import numpy as np
+from numpy import pi
+
+"""
+Author: Ivan Archetti   
+Creation date: 18/10/2026
+
+
+Batched builders of primitives: many lines, circles or polygons in a single VMobject
+(every primitive is a subpath, the points are generated with NumPy without python loops)
+"""
+
+
+# ======================================================================================================================
+
+def as_points(points):
+    """
+    Convert a sequence of 2D/3D points into an array of 3D points (n, 3)
+    """
+
+    points = np.asarray(points, dtype=float)
+    if points.shape[-1] == 2:
+        points = np.concatenate([points, np.zeros((*points.shape[:-1], 1))], axis=-1)
+
+    return points
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def line_points(starts, ends):
+    """
+    Cubic bezier points of n straight lines
+    starts, ends: arrays (n, 3) of the extremities of the lines
+    return: array (n*4, 3), one bezier curve for each line
+    """
+
+    starts = as_points(starts)
+    ends = as_points(ends)
+
+    # anchors and handles at 1/3 and 2/3 of each line
+    k = np.array([0, 1/3, 2/3, 1])[None, :, None]
+    points = starts[:, None, :] + k*(ends - starts)[:, None, :]
+
+    return points.reshape(-1, 3)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def circle_points(centers, radii, n_components=8):
+    """
+    Cubic bezier points of n circles
+    centers: array (n, 3) of the centers
+    radii: scalar or array (n,) of the radii
+    n_components: number of arcs that approximate each circle
+    return: array (n*n_components*4, 3)
+    """
+
+    centers = as_points(centers)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (len(centers),))
+
+    # angles of the anchors and length of the handles of each arc
+    d_theta = 2*pi/n_components
+    theta = np.arange(n_components)*d_theta
+    k = 4/3*np.tan(d_theta/4)
+
+    u_start = np.stack([np.cos(theta), np.sin(theta), np.zeros(n_components)], axis=-1)
+    u_end = np.roll(u_start, -1, axis=0)
+    t_start = np.stack([-u_start[:, 1], u_start[:, 0], np.zeros(n_components)], axis=-1)
+    t_end = np.stack([-u_end[:, 1], u_end[:, 0], np.zeros(n_components)], axis=-1)
+
+    # unit circle (n_components, 4, 3) scaled and translated for every circle
+    unit = np.stack([u_start, u_start + k*t_start, u_end - k*t_end, u_end], axis=1)
+    points = centers[:, None, None, :] + radii[:, None, None, None]*unit[None]
+
+    return points.reshape(-1, 3)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def polygon_points(vertices):
+    """
+    Cubic bezier points of n closed polygons with the same number of vertices
+    (repeat the last vertex for polygons with less vertices)
+    vertices: array (n, m, 3) of the vertices
+    return: array (n*m*4, 3)
+    """
+
+    vertices = as_points(vertices)
+    starts = vertices.reshape(-1, 3)
+    ends = np.roll(vertices, -1, axis=1).reshape(-1, 3)
+
+    return line_points(starts, ends)
+
+# ======================================================================================================================
+
+def batched_lines(starts, ends, **kwargs):
+    """
+    Create a single VMobject with a subpath for each line
+    starts, ends: arrays (n, 3) of the extremities of the lines
+    kwargs: style of the VMobject (color, stroke_width, etc etc...)
+    """
+
+    lines = VMobject(**kwargs)
+    lines.set_points(line_points(starts, ends))
+
+    return lines
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def batched_circles(centers, radii, n_components=8, **kwargs):
+    """
+    Create a single VMobject with a subpath for each circle
+    centers: array (n, 3) of the centers
+    radii: scalar or array (n,) of the radii
+    kwargs: style of the VMobject (color, stroke_width, etc etc...)
+    """
+
+    circles = VMobject(**kwargs)
+    circles.set_points(circle_points(centers, radii, n_components=n_components))
+
+    return circles
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def batched_polygons(vertices, **kwargs):
+    """
+    Create a single VMobject with a closed subpath for each polygon
+    vertices: array (n, m, 3) of the vertices
+    kwargs: style of the VMobject (color, stroke_width, etc etc...)
+    """
+
+    polygons = VMobject(**kwargs)
+    polygons.set_points(polygon_points(vertices))
+
+    return polygons
+
+# ======================================================================================================================
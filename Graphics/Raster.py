@@ -0,0 +1,236 @@
+from manim import *
+import numpy as np
+from numpy import pi
+import hashlib
+from Mlib.Tools.Cache import Prototype_cache
+from Mlib.Tools.Instrumentation import track_updater, instrumented
+from Mlib.Graphics.Styles import Style
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Raster layers of the static parts of the components: the part is rasterized once (at the resolution of the scene)
+and drawn as a single image, cairo does not paint its vector paths at every frame
+
+Example:
+    self.add(gauge.freeze())        # body and gage become an image (the arrow stays vector)
+    self.play(gauge.set_gage_value(50))
+    gauge.thaw()                    # vector parts again
+"""
+
+# images of the parts shared by all the layers with the same geometry and style (hits and misses are in get_stats())
+raster_cache = Prototype_cache(name="raster layers")
+
+# ======================================================================================================================
+
+class Raster_layer():
+    """
+    Static part of a component drawn as a cached image
+
+    The part keeps its points and its style (positions, bounding boxes, set_color, Transform and become work on the
+    vector paths as usual): only the alpha of its colors is zero while the layer is frozen. The image is in the group
+    of the layer, next to the group of the component (see the freeze of the components), and an updater of the group
+    follows the part: translations move the image, other changes of the points or of the colors rasterize it again
+    """
+
+    arguments = Style({"padding": 2,      # pixels around the part (antialiasing)
+                       "decimals": 4})    # rounding of the points in the key of the cache
+
+    # colors of the paths hidden by the layer
+    COLOR_ARRAYS = ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+
+    def __init__(self, part, pixel_density=None, **kwargs):
+        """
+        part: VMobject or VGroup to freeze
+        pixel_density: pixels per unit (default resolution of the scene)
+        """
+
+        # initialization
+        self.part = part
+        self.pixel_density = pixel_density
+        self.group = Group()        # image of the part (empty when the layer is thawed)
+        self.image = None
+        self.alphas = []            # (path, {color array: alpha column}) of the hidden paths
+        self.center = None          # center of the image at the rasterization
+        self.reference = None       # points and colors of the part at the rasterization
+        self.updater = track_updater(lambda group: self.refresh(), name="Raster_layer.refresh")
+
+        self.freeze()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def freeze(self):
+        """
+        Rasterize the part and hide its vector paths
+        """
+
+        if self.image is not None:
+            return
+
+        self.__rasterize()
+        if self.image is None:
+            return
+
+        self.__hide()
+        self.group.add_updater(self.updater)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def thaw(self):
+        """
+        Show the vector paths of the part and remove the image
+        """
+
+        self.group.remove_updater(self.updater)
+        if self.image is not None:
+            self.__show()
+            self.group.remove(self.image)
+            self.image = None
+            self.reference = None
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def refresh(self):
+        """
+        Follow the part: a translation moves the image, other changes of points or colors rasterize the part again
+        """
+
+        if self.image is None:
+            return
+
+        points, colors = self.get_state()
+        reference_points, reference_colors = self.reference
+        if points.shape == reference_points.shape and np.array_equal(colors, reference_colors):
+            offset = points - reference_points
+            if np.allclose(offset, offset[0], atol=1e-6):
+                self.image.move_to(self.center + offset[0])
+                return
+
+        self.__show()
+        self.__rasterize()
+        self.__hide()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_state(self):
+        """
+        Points and colors of the paths of the part (alpha excluded, it is zero while the paths are hidden)
+        """
+
+        mobjects = self.part.family_members_with_points()
+        points = np.concatenate([mob.points for mob in mobjects])
+        colors = np.concatenate([np.concatenate([np.asarray(mob.get_fill_rgbas(), dtype=float)[:, :3].ravel(),
+                                                 np.asarray(mob.get_stroke_rgbas(), dtype=float)[:, :3].ravel(),
+                                                 [mob.get_stroke_width()]]) for mob in mobjects])
+
+        return points, colors
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_key(self, mobjects, corner):
+        """
+        Key of the cache: geometry (relative to the corner of the part) and style of the paths
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+        for mob in mobjects:
+            digest.update(np.round(mob.points - corner, self.arguments["decimals"]).tobytes())
+            digest.update(np.asarray(mob.get_fill_rgbas(), dtype=float).tobytes())
+            digest.update(np.asarray(mob.get_stroke_rgbas(), dtype=float).tobytes())
+            digest.update(np.asarray([mob.get_stroke_width(), mob.z_index], dtype=float).tobytes())
+
+        return digest.hexdigest()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __render(self, mobject, center, pixel_width, pixel_height, density):
+        """
+        Draw the mobject with a camera centered on it
+        return: RGBA pixel array (straight alpha)
+        """
+
+        camera = Camera(frame_center=center, pixel_width=pixel_width, pixel_height=pixel_height,
+                        frame_width=pixel_width/density, frame_height=pixel_height/density,
+                        background_color=BLACK, background_opacity=0)
+        camera.capture_mobject(mobject)
+        pixels = camera.pixel_array.astype(float)
+
+        # cairo colors are premultiplied by alpha
+        alpha = pixels[..., 3:]
+        pixels[..., :3] = np.divide(pixels[..., :3]*255, alpha, out=np.zeros_like(pixels[..., :3]), where=alpha > 0)
+
+        return np.clip(np.round(pixels), 0, 255).astype(np.uint8)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __rasterize(self):
+        """
+        Create the image of the (visible) part and put it in the group of the layer
+        """
+
+        # initialization
+        part = self.part
+        density = self.pixel_density or config.pixel_width/config.frame_width
+        mobjects = part.family_members_with_points()
+        if len(mobjects) == 0:
+            return
+
+        # frame of the camera: bounding box, half stroke and antialiasing
+        stroke = max(mob.get_stroke_width() for mob in mobjects)*0.01
+        padding = stroke/2 + self.arguments["padding"]/density
+        corner_dl = part.get_corner(DL) - padding*(RIGHT + UP)
+        corner_ur = part.get_corner(UR) + padding*(RIGHT + UP)
+        pixel_width, pixel_height = (int(n) for n in np.ceil((corner_ur - corner_dl)[:2]*density))
+        center = corner_dl + np.array([pixel_width, pixel_height, 0])/(2*density)
+
+        key = (self.get_key(mobjects, corner_dl), pixel_width, pixel_height)
+        pixels = raster_cache.get(key, lambda: self.__render(part, center, pixel_width, pixel_height, density))
+
+        image = ImageMobject(pixels)
+        image.stretch_to_fit_width(pixel_width/density)
+        image.stretch_to_fit_height(pixel_height/density)
+        image.move_to(center)
+        image.z_index = part.z_index
+        image.key = key
+
+        if self.image is not None:
+            self.group.remove(self.image)
+        self.group.add(image)
+        self.image = image
+        self.center = center
+        self.reference = self.get_state()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __hide(self):
+        """
+        Set to zero the alpha of the colors of the paths (cairo does not paint them), the old values are kept
+        """
+
+        self.alphas = []
+        for mob in self.part.family_members_with_points():
+            arrays = {name: getattr(mob, name) for name in self.COLOR_ARRAYS if getattr(mob, name, None) is not None}
+            self.alphas.append((mob, {name: array[:, 3].copy() for name, array in arrays.items()}))
+            for array in arrays.values():
+                array[:, 3] = 0
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __show(self):
+        """
+        Restore the alpha of the colors of the paths (also if the color arrays have been replaced meanwhile)
+        """
+
+        for mob, alphas in self.alphas:
+            for name, alpha in alphas.items():
+                array = getattr(mob, name, None)
+                if array is None:
+                    continue
+                array[:, 3] = alpha if len(alpha) == len(array) else np.max(alpha)
+        self.alphas = []
+
+# ======================================================================================================================
@@ -0,0 +1,140 @@
+from manim import *
+import numpy as np
+from collections.abc import Mapping
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Immutable styles of the components: the defaults of a class (arguments), the theme of the library
+and the style of an instance are frozen mappings, hashable and safe to share between components,
+threads and processes (they can be keys of the prototype and disk caches)
+
+Example:
+    from Mlib.Graphics.Styles import set_theme
+
+    set_theme(valve_fill_color=GREY_B)                                  # every valve created later
+    valve = Pneumatic_valve_5_2(height=1, style={"valve_stroke_color": BLACK})  # only this valve
+    valve.arguments["valve_fill_color"]                                 # GREY_B
+"""
+
+
+# ======================================================================================================================
+
+def freeze_value(value):
+    """
+    Hashable version of a value of a style (lists and arrays become tuples)
+    """
+
+    if isinstance(value, np.ndarray):
+        return tuple(value.ravel().tolist())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+
+    return value
+
+# ======================================================================================================================
+
+class Style(Mapping):
+    """
+    Frozen dictionary of style parameters: it is read like a dictionary (style["valve_fill_color"]),
+    it is changed only with replace (a new style is returned)
+    """
+
+    __slots__ = ("_items", "_hash")
+
+    def __init__(self, *args, **kwargs):
+        object.__setattr__(self, "_items", dict(*args, **kwargs))
+        object.__setattr__(self, "_hash", None)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Style is immutable, use replace()")
+
+    def __hash__(self):
+        if self._hash is None:
+            items = tuple(sorted((key, freeze_value(value)) for key, value in self._items.items()))
+            object.__setattr__(self, "_hash", hash(items))
+        return self._hash
+
+    def __reduce__(self):
+        return (Style, (self._items,))
+
+    def __repr__(self):
+        return f"Style({self._items})"
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def replace(self, *args, **kwargs):
+        """
+        Return a new style with some parameters changed (dictionary or keywords)
+        """
+
+        return Style({**self._items, **dict(*args, **kwargs)})
+
+# ======================================================================================================================
+
+# library-wide defaults shared by the components (a component uses only the parameters it has)
+DEFAULT_THEME = Style(valve_stroke_color=GREY_E,
+                      valve_fill_color=GREY_A,
+                      actuator_stroke_color=GREY_E)
+
+theme = DEFAULT_THEME
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def set_theme(*args, **kwargs):
+    """
+    Change the theme of the library for the components created later (dictionary or keywords),
+    set_theme() restores the default theme
+    """
+
+    global theme
+
+    theme = DEFAULT_THEME.replace(*args, **kwargs)
+
+    return theme
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_theme():
+    """
+    Return the current theme of the library
+    """
+
+    return theme
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_style(defaults, style=None):
+    """
+    Style of an instance: defaults of the class, parameters of the theme that the class has,
+    style of the instance (dictionary or Style)
+    KeyError if the style has parameters that the class does not have
+    """
+
+    unknown = [key for key in (style or {}) if key not in defaults]
+    if unknown:
+        raise KeyError(f"style parameters {', '.join(map(repr, unknown))} not used, parameters: {', '.join(defaults)}")
+
+    overrides = {key: value for key, value in theme.items() if key in defaults}
+    overrides.update(style or {})
+
+    return Style(defaults).replace(overrides)
+
+# ======================================================================================================================
@@ -1,8 +1,13 @@
 from manim import *
 import numpy as np
 from numpy import pi
-from Mlib.Electronics.Displays import Display_7_segments as dsp7
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Labels import cached_text
+from Mlib.Graphics.Primitives import batched_lines
+from Mlib.Graphics.Raster import Raster_layer
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Instrumentation import instrumented
+from Mlib.Tools.Layout import Footprint
 
 
 """
@@ -15,21 +20,77 @@ Collection of python classes about instruments for measuring
 
 # ======================================================================================================================
 
+def decimate_series(t, values, tolerance):
+    """
+    Fewest keyframes of a time series that keep the linear interpolation within the tolerance
+    (shortest path over the segments between samples that are within the tolerance)
+    return: indices of the keyframes (first and last point always included)
+
+    t: strictly increasing times (n,)
+    values: values at the times (n,)
+    tolerance: maximum difference between the values and the interpolation of the keyframes
+    """
+
+    # initialization
+    t = np.asarray(t, dtype=float).reshape(-1)
+    values = np.asarray(values, dtype=float).reshape(-1)
+    n = len(t)
+    if n <= 2:
+        return np.arange(n)
+
+    keyframes = np.full(n, n + 1)   # fewest keyframes from the first point to every point
+    previous = np.zeros(n, dtype=int)
+    keyframes[0] = 1
+
+    for i in range(n - 1):
+        # slopes from the point i to the next points and bounds of the slopes that keep every point within tolerance
+        dt = t[i + 1:] - t[i]
+        slopes = (values[i + 1:] - values[i])/dt
+        low = np.maximum.accumulate(slopes - tolerance/dt)
+        high = np.minimum.accumulate(slopes + tolerance/dt)
+
+        # segment i-j within tolerance: its slope is inside the bounds of the points between i and j
+        valid = np.ones(n - i - 1, dtype=bool)
+        valid[1:] = (slopes[1:] >= low[:-1]) & (slopes[1:] <= high[:-1])
+
+        # shorter paths through the point i
+        j = i + 1 + np.nonzero(valid & (keyframes[i] + 1 < keyframes[i + 1:]))[0]
+        keyframes[j] = keyframes[i] + 1
+        previous[j] = i
+
+    # keyframes from the last point back to the first one
+    keys = [n - 1]
+    while keys[-1] != 0:
+        keys.append(previous[keys[-1]])
+
+    return np.array(keys[::-1])
+
+# ======================================================================================================================
+
 class Gauge():  
     """
     Pressure gauge
     """
 
-    arguments = {"notches": 40}
+    arguments = Style({"notches": 40,
+                       "series_tolerance": 0.5*DEGREES})  # angular tolerance of the keyframes of a series
+
+    # fitting: half angle of the arc and length of the lines (ratio of the radius)
+    fitting_angle = pi/12
+    fitting_length = 1/3
 
-    def __init__(self, radius=1, um='', **kwargs):
+    def __init__(self, radius=1, um='', style=None, **kwargs):
         
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization
         self.radius = radius
         self.start_notch_angle = 7/6*pi
         self.notch_angle = -4/3*pi
         self.notches = self.arguments["notches"] # number of notches
         self.um = um # unit of measurement (e.g. bar, Pa, atm, etc etc...)
+        self.gage_angle = 0 # current rotation of the arrow respect to the first notch
 
         self.gauge = VGroup()
 
@@ -40,6 +101,9 @@ class Gauge():
         self.arrow = self.set_arrow()
         
         self.gauge.add(self.body, self.gage, self.arrow)
+
+        # raster layers of the static parts (see freeze)
+        self.layers = []
         
     # ----------------------------------------------------------------------------------------------------------------------        
 
@@ -50,7 +114,7 @@ class Gauge():
 
         # initiialization
         r = self.radius
-        angle = pi/12 # angle that determinate fitting width
+        angle = self.fitting_angle # angle that determinate fitting width
         u1 = [np.cos(3/2*pi-angle), np.sin(3/2*pi-angle)]
         u2 = [np.cos(3/2*pi+angle), np.sin(3/2*pi+angle)]
 
@@ -60,9 +124,9 @@ class Gauge():
         
         # fitting
         body.add(Arc(radius=r, start_angle=3/2*pi-angle, angle=2*angle, stroke_width=2, color=BLACK))
-        body.add(Line(start=ORIGIN, end=r/3*DOWN, stroke_width=2, color=BLACK).shift(r*(u1[0]*RIGHT + u1[1]*UP)))
+        body.add(Line(start=ORIGIN, end=self.fitting_length*r*DOWN, stroke_width=2, color=BLACK).shift(r*(u1[0]*RIGHT + u1[1]*UP)))
         body.add(Line(start=r*u1[0]*RIGHT, end=r*u2[0]*RIGHT, stroke_width=2, color=BLACK).shift(body[-1].get_bottom()[1]*UP))
-        body.add(Line(start=ORIGIN, end=r/3*DOWN, stroke_width=2, color=BLACK).shift(r*(u2[0]*RIGHT + u2[1]*UP)))
+        body.add(Line(start=ORIGIN, end=self.fitting_length*r*DOWN, stroke_width=2, color=BLACK).shift(r*(u2[0]*RIGHT + u2[1]*UP)))
         
         element_A = body[1].get_points() # arc points
         element_B = body[3].get_points()[::-1] # horizontal line points
@@ -70,6 +134,21 @@ class Gauge():
         body.add(Polygon(*points, color=GREY_C, fill_opacity=0.5, stroke_width=0))
         
         return body
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_footprint(cls, radius=1, **kwargs):
+        """
+        Footprint of the gauge (see Mlib.Tools.Layout): ports "fitting" (bottom of the fitting) and "center",
+        box of body and fitting
+        """
+
+        # the lines of the fitting start from the arc (see set_body)
+        bottom = -(np.cos(cls.fitting_angle) + cls.fitting_length)*radius
+
+        return Footprint(ports={"fitting": bottom*UP, "center": ORIGIN},
+                         box=np.array([[-radius, bottom, 0], [radius, radius, 0]]))
     
     # ----------------------------------------------------------------------------------------------------------------------        
     
@@ -83,29 +162,27 @@ class Gauge():
         r = self.radius
         um = self.um
         
-        start = self.radius*0.9
-        end = self.radius*0.7
         number_pos = self.radius*0.6
         
         gage = VGroup()
+
+        # notches vectors
+        i = np.arange(self.notches+1)
+        notch_angles = self.start_notch_angle + i*d_angle
+        u = np.stack([np.cos(notch_angles), np.sin(notch_angles), np.zeros(len(i))], axis=1)
         
-        for i in range(self.notches+1):
-            # notches vector
-            u = [np.cos(self.start_notch_angle + i*d_angle)*RIGHT, np.sin(self.start_notch_angle + i*d_angle)*UP]
-            
-            # define notches length
-            if i%5 == 0:
-                start = self.radius*0.9
-                # add numbers
-                gage.add(Text(f"{int(i/5)}", color=BLACK).scale(0.3*r).shift(number_pos*(u[0] + u[1])))
-            else:
-                start = r*0.8
-            end = r*0.7
+        # define notches length (long notches every 5)
+        start = np.where(i%5 == 0, r*0.9, r*0.8)[:, None]*u
+        end = r*0.7*u
+
+        # add numbers
+        for j in i[i%5 == 0]:
+            gage.add(cached_text(f"{int(j/5)}", color=BLACK).scale(0.3*r).shift(number_pos*u[j]))
             
-            # add notch
-            gage.add(Line(start=start*(u[0] + u[1]), end=end*(u[0] + u[1]), color=BLUE_AUT, stroke_width=2))
+        # add notches (all the notches are a single path)
+        gage.add(batched_lines(start, end, color=BLUE_AUT, stroke_width=2))
         # add unit of measurement
-        gage.add(Text(um, color=BLUE_AUT).scale(0.25*self.radius).shift(self.body[0].get_center() + 0.6*r*DOWN))
+        gage.add(cached_text(um, color=BLUE_AUT).scale(0.25*self.radius).shift(self.body[0].get_center() + 0.6*r*DOWN))
 
         return gage
     
@@ -150,7 +227,111 @@ class Gauge():
         
         gage_perc = np.clip(gage_perc, -100, 100)
         angle = self.notch_angle*gage_perc/100
+        self.gage_angle += angle
         return Rotating(self.arrow, radians=angle, about_point=self.body[0].get_center())
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def get_gage_keyframes(self, t, values, tolerance=None, value_range=(0, 100)):
+        """
+        Reduce a time series to the keyframes of the arrow angle
+        return: times and absolute angles (respect to the first notch) of the keyframes
+
+        t: times of the samples (increasing)
+        values: values of the samples, value_range is the full scale of the gage (e.g. (0, 100) percentage)
+        tolerance: maximum angular error of the arrow (default arguments["series_tolerance"])
+        """
+
+        # initialization
+        tolerance = self.arguments["series_tolerance"] if tolerance is None else tolerance
+        t = np.asarray(t, dtype=float).reshape(-1)
+        low, high = value_range
+
+        if len(t) != np.size(values) or len(t) == 0:
+            print("\n Quantity of times and values mismatched!  \n")
+            return np.zeros(0), np.zeros(0)
+
+        # absolute angles of the arrow (values out of the scale stop at the ends)
+        angles = self.notch_angle*np.clip((np.asarray(values, dtype=float).reshape(-1) - low)/(high - low), 0, 1)
+        keys = decimate_series(t, angles, tolerance)
+
+        return t[keys], angles[keys]
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def set_gage_series(self, t, values, tolerance=None, value_range=(0, 100), run_time=None, **kwargs):
+        """
+        Move the arrow along a time series (e.g. a recorded pressure) in a single animation:
+        the series is reduced to its keyframes and the angle of every frame is interpolated
+        (the angle is absolute, so there is no drift between the frames); the arrow starts from its
+        current angle and reaches the series at the end of the first segment
+
+        t: times of the samples (increasing)
+        values: values of the samples, value_range is the full scale of the gage (e.g. (0, 100) percentage)
+        tolerance: maximum angular error of the arrow (default arguments["series_tolerance"])
+        run_time: duration of the animation (default duration of the series)
+        kwargs: other arguments of the animation
+        """
+
+        # initialization
+        key_t, key_angles = self.get_gage_keyframes(t, values, tolerance=tolerance, value_range=value_range)
+        if len(key_t) == 0:
+            return Wait(run_time or 1)
+
+        center = self.body[0].get_center()
+        start_angle = self.gage_angle
+        run_time = run_time or max(key_t[-1] - key_t[0], 1/config.frame_rate)
+
+        # the first keyframe is the current angle (a single keyframe is reached along the whole animation)
+        if len(key_t) == 1:
+            key_t = np.append(key_t, key_t[0] + run_time)
+            key_angles = np.append(key_angles, key_angles[0])
+        key_angles = key_angles.copy()
+        key_angles[0] = start_angle
+
+        mobjects = []
+        points = []
+
+        def update(arrow, alpha):
+            # the arrow points are rotated from their positions at the start of the animation
+            if not mobjects:
+                mobjects.extend(arrow.family_members_with_points())
+                points.extend(mob.points.copy() for mob in mobjects)
+            angle = np.interp(key_t[0] + alpha*(key_t[-1] - key_t[0]), key_t, key_angles) - start_angle
+            matrix = rotation_matrix(angle, OUT)
+            for mob, start_points in zip(mobjects, points):
+                mob.points = center + (start_points - center) @ matrix.T
+
+        # state of the arrow at the end of the animation
+        self.gage_angle = key_angles[-1]
+
+        return UpdateFromAlphaFunc(self.arrow, update, run_time=run_time, rate_func=linear, **kwargs)
+    
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @instrumented
+    def freeze(self):
+        """
+        Draw the body and the gage as cached images (the arrow stays vector), see Raster_layer
+        return: group of the images and of the gauge, to add to the scene in place of the gauge
+        """
+
+        if not self.layers:
+            self.layers = [Raster_layer(self.body), Raster_layer(self.gage)]
+
+        return Group(*[layer.group for layer in self.layers], self.gauge)
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @instrumented
+    def thaw(self):
+        """
+        Restore the vector body and gage
+        """
+
+        for layer in self.layers:
+            layer.thaw()
+        self.layers = []
     
 
 # ======================================================================================================================
@@ -160,10 +341,18 @@ class FlowSensor():
     Flow sensor
     """
 
-    arguments = {"body_color": GREY_D,
-                 "indication_color": WHITE}
+    arguments = Style({"body_color": GREY_D,
+                       "indication_color": WHITE})
+
+    # width of the body, heights of the fitting and of its end (ratios of the height)
+    width_ratio = 2/3
+    fitting_height = 1/5
+    fitting_end_height = 1/25
 
-    def __init__(self, height=1, um='', **kwargs):
+    def __init__(self, height=1, um='', style=None, **kwargs):
+
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
 
         # initialization
         self.body_color = self.arguments["body_color"]
@@ -171,7 +360,7 @@ class FlowSensor():
         self.um = um
 
         self.h = height
-        self.w = 2/3*height
+        self.w = self.width_ratio*height
 
         self.flowsensor = VGroup()
 
@@ -181,6 +370,9 @@ class FlowSensor():
 
         self.flowsensor.add(self.body, self.screen)
 
+        # raster layers of the static parts (see freeze)
+        self.layers = []
+
     # ----------------------------------------------------------------------------------------------------------------------        
 
     def set_body(self):
@@ -190,7 +382,7 @@ class FlowSensor():
 
         # initiialization
         h_body = self.h
-        w_body = 2/3*h_body
+        w_body = self.w
         h_botton = h_body/10
         um = self.um
 
@@ -206,32 +398,51 @@ class FlowSensor():
         body.add(Rectangle(height=h_body, width=w_body, color=body_color, fill_color=body_color, fill_opacity=1))
 
         #1 um indication
-        body.add(Text(um, color=indication_color).scale(1/(6*h_body)).shift(h_botton/3*UP))
+        body.add(cached_text(um, color=indication_color).scale(1/(6*h_body)).shift(h_botton/3*UP))
 
         #2 fittings
-        body.add(Rectangle(height=h_body/5, width=w_body/3, color=BLACK, fill_color=BLACK, stroke_width=0, fill_opacity=0.8).next_to(body[0], direction=UP, buff=0))
-        body.add(Rectangle(height=h_body/25, width=w_body/3.5, color=BLUE_AUT, fill_color=BLUE_AUT, stroke_width=0, fill_opacity=0.8).next_to(body[-1], direction=UP, buff=0))
+        body.add(Rectangle(height=self.fitting_height*h_body, width=w_body/3, color=BLACK, fill_color=BLACK, stroke_width=0, fill_opacity=0.8).next_to(body[0], direction=UP, buff=0))
+        body.add(Rectangle(height=self.fitting_end_height*h_body, width=w_body/3.5, color=BLUE_AUT, fill_color=BLUE_AUT, stroke_width=0, fill_opacity=0.8).next_to(body[-1], direction=UP, buff=0))
 
-        body.add(Rectangle(height=h_body/5, width=w_body/3, color=BLACK, fill_color=BLACK, stroke_width=0, fill_opacity=0.8).next_to(body[0], direction=DOWN, buff=0))
-        body.add(Rectangle(height=h_body/25, width=w_body/3.5, color=BLUE_AUT, fill_color=BLUE_AUT, stroke_width=0, fill_opacity=0.8).next_to(body[-1], direction=DOWN, buff=0))
+        body.add(Rectangle(height=self.fitting_height*h_body, width=w_body/3, color=BLACK, fill_color=BLACK, stroke_width=0, fill_opacity=0.8).next_to(body[0], direction=DOWN, buff=0))
+        body.add(Rectangle(height=self.fitting_end_height*h_body, width=w_body/3.5, color=BLUE_AUT, fill_color=BLUE_AUT, stroke_width=0, fill_opacity=0.8).next_to(body[-1], direction=DOWN, buff=0))
 
         #6 buttons
         body.add(RoundedRectangle(corner_radius=r, height=h_botton, width=w_botton, color=BLUE_AUT, fill_color=BLUE_AUT, fill_opacity=1).shift(w_body/4*LEFT + h_body/6*DOWN))
         body.add(Arrow(start=h_botton/2*DOWN, end=h_botton/2*UP, max_tip_length_to_length_ratio=0.4, color=GRAY_B, buff=0.1).shift(body[-1].get_center()))
-        body.add(Text("A", color=indication_color).scale(h_body/8).next_to(body[-2], direction=DOWN, buff=h_body/20))
+        body.add(cached_text("A", color=indication_color).scale(h_body/8).next_to(body[-2], direction=DOWN, buff=h_body/20))
         body.add(RoundedRectangle(corner_radius=r, height=h_botton, width=w_botton, color=BLUE_AUT, fill_color=BLUE_AUT, fill_opacity=1).shift(w_body/4*RIGHT + h_body/6*DOWN))
         body.add(Arrow(start=h_botton/2*UP, end=h_botton/2*DOWN, max_tip_length_to_length_ratio=0.4, color=GRAY_B, buff=0.1).shift(body[-1].get_center()))
-        body.add(Text("B", color=indication_color).scale(h_body/8).next_to(body[-2], direction=DOWN, buff=h_body/20))
+        body.add(cached_text("B", color=indication_color).scale(h_body/8).next_to(body[-2], direction=DOWN, buff=h_body/20))
 
         return body
 
     # ----------------------------------------------------------------------------------------------------------------------        
 
+    @classmethod
+    def get_footprint(cls, height=1, **kwargs):
+        """
+        Footprint of the sensor (see Mlib.Tools.Layout): ports "fitting_TOP" and "fitting_BOTTOM" 
+        (get_fitting_TOP, get_fitting_BOTTOM) and box of body and fittings
+        """
+
+        # fittings above and below the body
+        fitting = (1/2 + cls.fitting_height + cls.fitting_end_height)*height
+        w = cls.width_ratio*height
+
+        return Footprint(ports={"fitting_TOP": fitting*UP, "fitting_BOTTOM": fitting*DOWN},
+                         box=np.array([[-w/2, -fitting, 0], [w/2, fitting, 0]]))
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
     def set_screen(self):
         """
         Create the display of the sensor
         """
 
+        # displays are imported only when a sensor needs them
+        from Mlib.Electronics.Displays import Display_7_segments as dsp7
+
         # initiialization
         h = self.body[0].height
         w = self.body[0].width
@@ -259,34 +470,60 @@ class FlowSensor():
     
     # ----------------------------------------------------------------------------------------------------------------------      
 
+    @instrumented
     def update_screen(self, number=0):
         """
         Print the number on the screen
+        Only the segments that change are animated (a single animation for all the digits)
         """
 
         # initialization
-        functions = []
+        changes = []
 
         str_number = str(number)
 
         # filter the number of the digits from the screen
-        start_digit = 0
-        free_digits = len(str_number) - len(self.digits)
+        start_digit = max(len(str_number) - len(self.digits), 0)
         
-        if free_digits>0:
-            start_digit = free_digits
-        elif free_digits<0: # reset the digits where there is no numbers
-            for j in range(1-free_digits):
-                functions.append(self.digits[-j].select_segments(number="R"))
+        # reset the digits where there is no numbers
+        for digit in self.digits[len(str_number):]:
+            changes.extend(digit.get_changed_segments(number="R"))
         
         # read only 4 digits and set the single display with the correct digit
         for i, digit in enumerate(reversed(str_number[start_digit:])):
-            functions.append(self.digits[i].select_segments(number=int(digit)))
+            changes.extend(self.digits[i].get_changed_segments(number=int(digit)))
 
-        return functions
+        return [self.digits[0].switch_segments(changes)]
     
+    # ----------------------------------------------------------------------------------------------------------------------      
+
+    @instrumented
+    def freeze(self):
+        """
+        Draw the body of the sensor as a cached image (the screen stays vector), see Raster_layer
+        return: group of the image and of the sensor, to add to the scene in place of the sensor
+        """
+
+        if not self.layers:
+            self.layers = [Raster_layer(self.body)]
+
+        return Group(*[layer.group for layer in self.layers], self.flowsensor)
+
+    # ----------------------------------------------------------------------------------------------------------------------      
+
+    @instrumented
+    def thaw(self):
+        """
+        Restore the vector body
+        """
+
+        for layer in self.layers:
+            layer.thaw()
+        self.layers = []
+
     # ----------------------------------------------------------------------------------------------------------------------
 
+    @instrumented
     def reset_screen(self):
         """
         Reset all the digits of the screen (empty screen)
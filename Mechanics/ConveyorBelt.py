@@ -2,6 +2,11 @@ from manim import *
 import numpy as np
 from numpy import pi
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Primitives import batched_circles, batched_lines, line_points
+from Mlib.Graphics.Raster import Raster_layer
+from Mlib.Tools.Instrumentation import track_updater, instrumented
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Layout import Footprint
 
 """
 Author: Ivan Archetti   
@@ -15,13 +20,19 @@ Collection of python classes of conveyor_belts
 # ======================================================================================================================
 
 class Converyor_belt():
-    arguments = {}
+    arguments = Style({"teeth_spacing": 1/4,  # distance between the teeth (ratio of the height)
+                       "teeth_length": 1/12,  # length of the teeth (ratio of the height)
+                       "speed": 1})           # default speed of the belt in continuous motion (units per second)
 
-    def __init__(self, height=1, length=4, belt_color=BLUE_AUT, rotation=-1, **kwargs):
+    def __init__(self, height=1, length=4, belt_color=BLUE_AUT, rotation=-1, style=None, **kwargs):
         """
         rotation: direction of rotation -1 counterclockwise, clockwise = 1 
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
         """
         
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization
         self.height = height
         self.length = length
@@ -30,18 +41,42 @@ class Converyor_belt():
 
         self.belt_color = belt_color
 
+        # arc length of the belt path and phase (arc length travelled by the belt, counterclockwise positive)
+        self.path_breaks = self.set_path_table()
+        self.phase = 0
+
         self.conveyor_belt = VGroup()
 
         self.belt = self.set_belt()
+
+        left_center, right_center = self.get_pulley_centers(self.length)
         
-        self.left_pulley = self.set_pulley(center=self.belt[0].get_start()[0]*LEFT)
+        self.left_pulley = self.set_pulley(center=left_center)
         
-        self.right_pulley = self.set_pulley(center=self.belt[0].get_end()[0]*RIGHT)
+        self.right_pulley = self.set_pulley(center=right_center)
+
+        # points of the pulley at phase 0 (the pulleys are drawn at the angle of the phase)
+        self.pulley_template = self.get_pulley_template(self.left_pulley, self.get_frame())
 
         self.frame = self.set_frame()
 
+        # items that ride on the belt (arc length, distance from the belt and visibility of each item)
+        self.items = VGroup()
+        self.items_s = np.zeros(0)
+        self.items_offset = np.zeros(0)
+        self.items_active = np.zeros(0, dtype=bool)
+        self.pool = None
+
+        # continuous motion (speed, target speed and acceleration of the ramp)
+        self.speed = 0
+        self.target_speed = 0
+        self.acceleration = np.inf
+        self.motion_updater = None
 
-        self.conveyor_belt.add(self.left_pulley, self.belt, self.right_pulley, self.frame)
+        # raster layers of the static parts (see freeze)
+        self.layers = []
+
+        self.conveyor_belt.add(self.left_pulley, self.belt, self.right_pulley, self.frame, self.items)
 
 
 # ----------------------------------------------------------------------------------------------------------------------      
@@ -128,9 +163,11 @@ class Converyor_belt():
         # center the belt to the screen
         belt.shift(l/2*RIGHT)
 
-        # insert the teeth on the belt
-        self.teeth = VGroup()
-    
+        # insert the teeth on the belt (a single path for all the teeth)
+        self.teeth_spacing = self.arguments["teeth_spacing"]*h
+        self.n_teeth = int(self.path_breaks[-1]/self.teeth_spacing)
+        self.teeth_spacing = self.path_breaks[-1]/max(self.n_teeth, 1)
+        self.teeth = batched_lines(*self.get_teeth_points(frame=(ORIGIN, RIGHT, UP)), color=belt_color, stroke_width=stroke_width/2)
 
         belt.add(self.teeth)
 
@@ -163,9 +200,10 @@ class Converyor_belt():
         angle = 2*pi/n_circle
         stroke_width = np.clip(h, 1, 2)
 
-        for i in range(n_circle):
-            u = [np.cos(i*angle)*RIGHT, np.sin(i*angle)*UP]
-            pulley.add(Circle(radius=r_circle, color=GREY_A, stroke_width=stroke_width).shift(r_med*(u[0]+u[1])))
+        # all the internal circles are a single path
+        angles = np.arange(n_circle)*angle
+        centers = r_med*np.stack([np.cos(angles), np.sin(angles), np.zeros(n_circle)], axis=1)
+        pulley.add(batched_circles(centers, r_circle, color=GREY_A, stroke_width=stroke_width))
 
         pulley.shift(center)
 
@@ -173,6 +211,292 @@ class Converyor_belt():
     
     # ----------------------------------------------------------------------------------------------------------------------
 
+    @classmethod
+    def get_pulley_centers(cls, length=4):
+        """
+        Centers of the left and right pulleys (ends of the straight sides of the belt)
+        """
+
+        return length/2*LEFT, length/2*RIGHT
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def get_footprint(cls, height=1, length=4, style=None, **kwargs):
+        """
+        Footprint of the conveyor belt (see Mlib.Tools.Layout): ports "left_pulley" and "right_pulley" (centers of 
+        the pulleys) and box of belt and teeth
+        """
+
+        # teeth of the instance (defaults of the class, theme of the library and style) outside the belt
+        r = height/2 + get_style(cls.arguments, style)["teeth_length"]*height
+        left_center, right_center = cls.get_pulley_centers(length)
+
+        return Footprint(ports={"left_pulley": left_center, "right_pulley": right_center},
+                         box=np.array([left_center + r*DL, right_center + r*UR]))
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def set_path_table(self):
+        """
+        Create the arc length table of the belt path (counterclockwise from the bottom of the right pulley):
+        right arc, upper line, left arc, lower line
+        """
+
+        # initialization
+        r = self.r
+        l = self.length
+
+        return np.cumsum([0, pi*r, l, pi*r, l])
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_path_points(self, s):
+        """
+        Return points and normals (outside the belt) of the belt path at the arc lengths s,
+        in the frame of the conveyor (belt centered in the origin)
+        s: array of arc lengths (any value, the path is closed)
+        """
+
+        # initialization
+        r = self.r
+        l = self.length
+        breaks = self.path_breaks
+
+        # segment of each arc length and distance from the beginning of the segment
+        s = np.mod(np.asarray(s, dtype=float), breaks[-1])
+        segment = np.clip(np.searchsorted(breaks, s, side="right") - 1, 0, 3)
+        d = s - breaks[segment]
+
+        # arcs (segments 0 and 2)
+        theta = np.where(segment == 0, -pi/2, pi/2) + d/r
+        arc_normals = np.stack([np.cos(theta), np.sin(theta), np.zeros_like(theta)], axis=-1)
+        arc_points = arc_normals*r + np.where(segment == 0, l/2, -l/2)[:, None]*RIGHT
+
+        # lines (segment 1 upper line to the left, segment 3 lower line to the right)
+        upper = (segment == 1)[:, None]
+        line_normals = np.where(upper, UP, DOWN)
+        straight_points = np.where(upper, (l/2 - d)[:, None]*RIGHT, (d - l/2)[:, None]*RIGHT) + r*line_normals
+
+        arc = (segment%2 == 0)[:, None]
+        points = np.where(arc, arc_points, straight_points)
+        normals = np.where(arc, arc_normals, line_normals)
+
+        return points, normals
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_frame(self):
+        """
+        Return center and axes of the conveyor in the scene (from the centers of the pulleys)
+        """
+
+        left = self.left_pulley[1].get_center()
+        right = self.right_pulley[1].get_center()
+
+        # the axes are scaled with the conveyor
+        u = (right - left)/self.length
+        v = np.array([-u[1], u[0], 0])
+
+        return (left + right)/2, u, v
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_pulley_template(self, pulley, frame):
+        """
+        Return the points of the parts of a pulley in the frame of the conveyor, relative to the center of the pulley
+        """
+
+        # initialization
+        _, u, v = frame
+        center = pulley[1].get_center()
+
+        template = []
+        for part in pulley.family_members_with_points():
+            points = part.points - center
+            template.append(np.stack([points @ u/np.dot(u, u), points @ v/np.dot(v, v), np.zeros(len(points))], axis=1))
+
+        return template
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def to_scene(self, points, frame=None):
+        """
+        Convert points from the frame of the conveyor to the scene
+        """
+
+        if frame is None:
+            frame = self.get_frame()
+        center, u, v = frame
+
+        return center + points[:, 0:1]*u + points[:, 1:2]*v
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_teeth_points(self, frame=None):
+        """
+        Return start and end points of the teeth in the scene (teeth follow the phase of the belt)
+        """
+
+        # initialization
+        teeth_length = self.arguments["teeth_length"]*self.height
+
+        points, normals = self.get_path_points(self.phase + np.arange(self.n_teeth)*self.teeth_spacing)
+
+        return self.to_scene(points, frame), self.to_scene(points + teeth_length*normals, frame)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_items(self, *items, s=None):
+        """
+        Put items on the belt, they ride on the belt when it moves
+        items: mobjects
+        s: arc lengths of the items along the belt path (default: equally spaced on the upper side)
+        """
+
+        # initialization
+        r = self.r
+        l = self.length
+        n = len(items)
+        _, u, _ = self.get_frame()
+        scale = np.linalg.norm(u)
+
+        if s is None:
+            s = pi*r + (np.arange(n) + 0.5)*l/n
+
+        # items lay on the belt (half thickness of the belt and half height of the item)
+        thickness = self.belt[0].get_stroke_width()/100
+        offsets = [(thickness/2 + item.height/2)/scale for item in items]
+
+        self.items.add(*items)
+        self.items_s = np.concatenate([self.items_s, np.broadcast_to(np.asarray(s, dtype=float), (n,))])
+        self.items_offset = np.concatenate([self.items_offset, offsets])
+        self.items_active = np.concatenate([self.items_active, np.ones(n, dtype=bool)])
+
+        self.__set_items()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def set_item_pool(self, item, n_items=10, spacing=None, spawn_rate=None):
+        """
+        Recycle a fixed number of copies of an item: the parts enter the upper side of the belt at one pulley
+        and leave it at the other, then they are hidden and used again
+        item: template of the parts (mobject)
+        n_items: number of parts of the pool
+        spacing: minimum distance between two parts along the belt (default length/n_items)
+        spawn_rate: maximum number of parts per second (None no limit)
+        """
+
+        # initialization
+        first = len(self.items)
+        parts = [item.copy() for _ in range(n_items)]
+
+        self.add_items(*parts, s=pi*self.r)
+
+        # parts are hidden until they enter the belt
+        for part in parts:
+            part.set_opacity(0)
+        self.items_active[first:] = False
+
+        self.pool = {"template": item,
+                     "indices": np.arange(first, first + n_items),
+                     "spacing": self.length/n_items if spacing is None else spacing,
+                     "period": 0 if spawn_rate is None else 1/spawn_rate,
+                     "distance": np.inf,  # distance travelled since the last part entered
+                     "time": np.inf}      # time since the last part entered
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __update_pool(self, ds, dt=0):
+        """
+        Hide the parts that left the belt and let new parts enter (spacing and spawn rate)
+        ds: arc length travelled by the belt
+        dt: time elapsed
+        """
+
+        # initialization
+        pool = self.pool
+        if pool is None or ds == 0:
+            return
+
+        direction = np.sign(ds)
+        start = pi*self.r
+        end = start + self.length
+        entry, exit = (start, end) if direction > 0 else (end, start)
+        indices = pool["indices"]
+
+        # parts beyond the exit pulley leave the belt
+        leaving = indices[self.items_active[indices] & ((self.items_s[indices] - exit)*direction >= 0)]
+        for i in leaving:
+            self.items[i].set_opacity(0)
+        self.items_active[leaving] = False
+
+        # new parts enter at the entry pulley: the part travelled only the distance since it was free to enter
+        # in this step (spacing reached, spawn period elapsed, start of the step if it waited for a free part)
+        pool["distance"] += np.abs(ds)
+        pool["time"] += dt
+        speed = np.abs(ds)/dt if dt > 0 else None
+        free = list(indices[~self.items_active[indices]])
+        while free and pool["distance"] >= pool["spacing"] and pool["time"] >= pool["period"]:
+            i = free.pop(0)
+            overshoot = min(pool["distance"] - pool["spacing"], np.abs(ds))
+            if speed is not None:
+                overshoot = min(overshoot, speed*(pool["time"] - pool["period"]))
+            self.items_s[i] = entry + direction*overshoot
+            self.items[i].match_style(pool["template"])
+            self.items_active[i] = True
+            pool["distance"] = overshoot
+            pool["time"] = overshoot/speed if speed else 0
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __set_items(self, frame=None):
+        """
+        Move all the items to their positions on the belt (positions computed in a single step)
+        """
+
+        # only the visible items are moved
+        active = np.flatnonzero(self.items_active)
+        if len(active) == 0:
+            return
+
+        points, normals = self.get_path_points(self.items_s[active])
+        positions = self.to_scene(points + self.items_offset[active, None]*normals, frame)
+
+        for i, position in zip(active, positions):
+            self.items[i].move_to(position)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __advance(self, ds, dt=0):
+        """
+        Move the belt of an arc length ds (counterclockwise positive): teeth, items and pulleys
+        follow the phase of the belt
+        dt: time elapsed (spawn rate of the parts)
+        """
+
+        # initialization
+        frame = self.get_frame()
+        self.phase += ds
+
+        # teeth and items
+        self.teeth.set_points(line_points(*self.get_teeth_points(frame)))
+        self.items_s = self.items_s + ds
+        self.__update_pool(ds, dt)
+        self.__set_items(frame)
+
+        # the pulleys rotate with the belt: absolute angle from the phase (no rounding error accumulated step by step)
+        _, u, v = frame
+        angle = self.phase/self.r
+        rotation = np.array([[np.cos(angle), np.sin(angle), 0], [-np.sin(angle), np.cos(angle), 0], [0, 0, 1]])
+        for pulley in (self.left_pulley, self.right_pulley):
+            pulley_frame = (pulley[1].get_center(), u, v)
+            for part, points in zip(pulley.family_members_with_points(), self.pulley_template):
+                part.set_points(self.to_scene(points @ rotation, pulley_frame))
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
     def move_belt(self, n_turn=0.5, run_time=3):
         """
         Simulate the motion of the belt
@@ -182,15 +506,110 @@ class Converyor_belt():
         
         # initialization
         rotation = self.rotation
+        ds = rotation*n_turn*2*pi*self.r
+        travelled = [0]
 
         functions = []
+
+        def update(conveyor_belt, alpha):
+            self.__advance(alpha*ds - travelled[0], dt=(alpha*ds - travelled[0])/ds*run_time if ds else 0)
+            travelled[0] = alpha*ds
         
-        # rotate the pulleys
-        functions.append(Rotate(self.left_pulley, angle=rotation*n_turn*2*pi, run_time=run_time))
-        functions.append(Rotate(self.right_pulley, angle=rotation*n_turn*2*pi, run_time=run_time))
+        # move belt, teeth, items and pulleys with the phase of the belt
+        functions.append(UpdateFromAlphaFunc(self.conveyor_belt, update, run_time=run_time))
         # activate the direction arrows
         functions.append(Indicate(self.frame[5], scale_factor=1.05, color=RED_AUT, run_time=run_time))
         functions.append(Indicate(self.frame[6], scale_factor=1.05, color=RED_AUT, run_time=run_time))
 
         return functions
 
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def freeze(self):
+        """
+        Draw the internal area of the frame as a cached image, see Raster_layer
+        (the direction arrows stay vector for move_belt)
+        return: group of the image and of the conveyor belt, to add to the scene in place of the conveyor belt
+        """
+
+        if not self.layers:
+            self.layers = [Raster_layer(self.frame[4])]
+
+        return Group(*[layer.group for layer in self.layers], self.conveyor_belt)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def thaw(self):
+        """
+        Restore the vector frame
+        """
+
+        for layer in self.layers:
+            layer.thaw()
+        self.layers = []
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def start_belt(self, speed=None, ramp_time=0):
+        """
+        Start the continuous motion of the belt: a time updater moves belt, teeth, items and pulleys
+        in every frame (self.play/self.wait), no animation is created
+        speed: speed of the belt (default arguments["speed"])
+        ramp_time: time to reach the speed
+        """
+
+        speed = self.arguments["speed"] if speed is None else speed
+        self.ramp_belt(speed=speed, ramp_time=ramp_time)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def stop_belt(self, ramp_time=0):
+        """
+        Stop the continuous motion of the belt
+        ramp_time: time to stop the belt
+        """
+
+        self.ramp_belt(speed=0, ramp_time=ramp_time)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def ramp_belt(self, speed=1, ramp_time=1):
+        """
+        Change the speed of the belt with a linear ramp
+        speed: final speed of the belt
+        ramp_time: duration of the ramp
+        """
+
+        self.target_speed = speed
+        self.acceleration = np.abs(speed - self.speed)/ramp_time if ramp_time > 0 else np.inf
+
+        # the updater is created once and stays on the conveyor belt 
+        # (a function: copies of the mobject do not copy the conveyor)
+        if self.motion_updater is None:
+            self.motion_updater = track_updater(lambda conveyor_belt, dt: self.__move_continuously(conveyor_belt, dt),
+                                                name="Converyor_belt.motion")
+            self.conveyor_belt.add_updater(self.motion_updater)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __move_continuously(self, conveyor_belt, dt):
+        """
+        Time updater of the continuous motion: the speed follows the ramp and the belt travels
+        with the mean speed of the frame
+        """
+
+        # initialization
+        speed = self.speed
+        if speed == 0 and self.target_speed == 0:
+            return
+
+        # speed at the end of the frame
+        step = self.acceleration*dt
+        self.speed = np.clip(self.target_speed, speed - step, speed + step)
+
+        self.__advance(self.rotation*(speed + self.speed)/2*dt, dt=dt)
@@ -2,6 +2,9 @@ from manim import *
 import numpy as np
 from numpy import pi
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Primitives import line_points
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Layout import Footprint, get_box
 
 
 """
@@ -19,17 +22,24 @@ class Pipe_connection():
     Connection between pneumatic elements (pipe/hose)
     """
 
-    arguments = {"pipe_color": BLACK,
-                 "radius": 0.1,
-                 "stroke": 4}
+    arguments = Style({"pipe_color": BLACK,
+                       "radius": 0.1,
+                       "stroke": 4,
+                       "single_path": False})
 
-    def __init__(self, pos=ORIGIN, l_len=[1], directions=[RIGHT], color=BLACK, **kwargs):
+    def __init__(self, pos=ORIGIN, l_len=[1], directions=[RIGHT], color=BLACK, single_path=None, style=None, **kwargs):
         """
-        l_len: is the sequence of the lenghts of each pipe part
+        l_len: is the sequence of the lenghts of each pipe part (list or NumPy array)
         directions: has the same number of elements of L_len and define the direction of each 
-                    element
+                    element (list or NumPy array (n, 3))
+        single_path: if True the whole pipe is a single VMobject computed with NumPy
+                     (default arguments["single_path"])
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
         """
        
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization of the pipe line
         self.pipe_color = color
         self.stroke = self.arguments["stroke"]
@@ -37,8 +47,12 @@ class Pipe_connection():
         self.pos = pos
         self.l_len = l_len
         self.dir = directions
+        self.single_path = self.arguments["single_path"] if single_path is None else single_path
               
-        self.pipe_connection = self.set_pipe_connection()
+        if self.single_path:
+            self.pipe_connection = self.set_pipe_path()
+        else:
+            self.pipe_connection = self.set_pipe_connection()
 
     # ----------------------------------------------------------------------------------------------------------------------        
 
@@ -80,4 +94,96 @@ class Pipe_connection():
         else:
             print("\n Quantity of lengths and direction mismatched!  \n")        
     
-        return pipe_connection
\ No newline at end of file
+        return pipe_connection
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def set_pipe_path(self):
+        """
+        Procedure the creates the connection/pipe as a single path (same geometry of set_pipe_connection):
+        straight parts and curves are computed in one NumPy pass
+        """
+
+        # initialization
+        l_len = np.asarray(self.l_len, dtype=float).reshape(-1)
+        dir = np.asarray(self.dir, dtype=float).reshape(-1, 3)
+        r = self.r
+        pipe_connection = VMobject(color=self.pipe_color, stroke_width=self.stroke)
+
+        # check if the lengths and direction quantity are the same
+        if len(l_len) != len(dir):
+            print("\n Quantity of lengths and direction mismatched!  \n")
+            return pipe_connection
+        # check if the adjacent pipes are perpendicular
+        if np.any(np.abs(np.sum(dir[:-1]*dir[1:], axis=1)) > 1e-6):
+            print("\n Two adjacent straight lines with same direction! \n")
+            return pipe_connection
+
+        # start and end of each straight part
+        starts, ends = self.get_segments(self.pos, l_len, dir, r)
+
+        # quarter of circle between two straight parts (cubic bezier)
+        k = 4/3*np.tan(pi/8)
+        arc_start = ends[:-1]
+        arc_end = starts[1:]
+        arcs = np.stack([arc_start, arc_start + k*r*dir[:-1], arc_end - k*r*dir[1:], arc_end], axis=1)
+
+        # alternate straight parts and curves in a single path
+        lines = line_points(starts, ends).reshape(-1, 4, 3)
+        points = np.empty((2*len(lines) - 1, 4, 3))
+        points[0::2] = lines
+        points[1::2] = arcs
+        pipe_connection.set_points(points.reshape(-1, 3))
+
+        return pipe_connection
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_segments(cls, pos, l_len, directions, radius):
+        """
+        Start and end (n, 3) of each straight part of the pipe (see set_pipe_path)
+        """
+
+        # initialization
+        l_len = np.asarray(l_len, dtype=float).reshape(-1)
+        dir = np.asarray(directions, dtype=float).reshape(-1, 3)
+
+        # every curve moves the next part of r*(d_i + d_i+1)
+        steps = l_len[:, None]*dir
+        steps[1:] += radius*(dir[:-1] + dir[1:])
+        ends = np.asarray(pos, dtype=float) + np.cumsum(steps, axis=0)
+        starts = ends - l_len[:, None]*dir
+
+        return starts, ends
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_footprint(cls, pos=ORIGIN, l_len=[1], directions=[RIGHT], style=None, **kwargs):
+        """
+        Footprint of the pipe (see Mlib.Tools.Layout): ports "start" and "end" (get_end) and box of the straight parts
+        """
+
+        # radius of the curves of the instance (defaults of the class, theme of the library and style)
+        radius = get_style(cls.arguments, style)["radius"]
+
+        if len(l_len) != len(directions):
+            print("\n Quantity of lengths and direction mismatched!  \n")
+            return Footprint(ports={"start": pos, "end": pos})
+
+        starts, ends = cls.get_segments(pos, l_len, directions, radius)
+
+        return Footprint(ports={"start": starts[0], "end": ends[-1]}, box=get_box(np.concatenate([starts, ends])))
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def get_end(self):
+        """
+        Return the end point of the pipe (both for single path and piecewise pipes)
+        """
+
+        if self.single_path:
+            return self.pipe_connection.get_end()
+        
+        return self.pipe_connection[-1].get_end()
@@ -0,0 +1,307 @@
+from manim import *
+import numpy as np
+from numpy import pi
+import heapq
+import itertools
+from Mlib.Mechanics.GeneralConnections import Pipe_connection
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Instrumentation import instrumented
+
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Automatic orthogonal routing of pipes between the ports of the components
+
+Example:
+    router = Pipe_router(obstacles=[valve.valve, cylinder.cylinder, sensor.flowsensor])
+    pipe = router.route(valve.get_input_1(0), cylinder.fittings[0].get_right(), end_direction=LEFT, color=BLUE_E)
+    self.play(Write(pipe.pipe_connection))
+"""
+
+# ======================================================================================================================
+
+class Pipe_router():
+    """
+    Minimum bend orthogonal router (grid A*) between two ports, the obstacles are the bounding boxes
+    of the components
+    """
+
+    arguments = Style({"grid_step": 0.2,         # side of the cells (at least twice the pipe radius)
+                       "margin": 0.1,            # clearance around the obstacles
+                       "border": 1,              # free space around the obstacles and the frame
+                       "bend_penalty": 10,       # cost of a bend (in cells)
+                       "obstacle_penalty": 100,  # cost of crossing an obstacle cell (in cells)
+                       "pipe_penalty": 5,        # cost of crossing an already routed pipe (in cells)
+                       "search_border": 10})     # cells added around the ports to limit the search
+
+    # directions of the moves on the grid (index of the direction: RIGHT, UP, LEFT, DOWN)
+    moves = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+    def __init__(self, obstacles=[], bounds=None, grid_step=None, style=None, **kwargs):
+        """
+        obstacles: list of mobjects or of corners pairs (bottom left, top right)
+        bounds: corners pairs (bottom left, top right) of the routing area (default: frame and obstacles)
+        grid_step: side of the cells (default arguments["grid_step"])
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
+        """
+
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
+        # initialization
+        self.step = self.arguments["grid_step"] if grid_step is None else grid_step
+        self.margin = self.arguments["margin"]
+        self.bend_penalty = self.arguments["bend_penalty"]
+        self.obstacle_penalty = self.arguments["obstacle_penalty"]
+        self.pipe_penalty = self.arguments["pipe_penalty"]
+        self.search_border = self.arguments["search_border"]
+        self.boxes = np.array([self.get_box(obstacle) for obstacle in obstacles]).reshape(-1, 2, 2)
+
+        self.set_grid(bounds)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_box(self, obstacle):
+        """
+        Return the 2D bounding box (bottom left, top right) of an obstacle
+
+        obstacle: mobject or corners pairs
+        """
+
+        if isinstance(obstacle, Mobject):
+            return np.array([obstacle.get_corner(DL)[:2], obstacle.get_corner(UR)[:2]])
+
+        return np.asarray(obstacle, dtype=float)[:, :2]
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def set_grid(self, bounds=None):
+        """
+        Create the cost grid (spatial index of the obstacles): every cell stores the extra cost to cross it
+
+        bounds: corners pairs (bottom left, top right) of the routing area
+        """
+
+        # routing area
+        if bounds is None:
+            frame = np.array([[-config.frame_width/2, -config.frame_height/2],
+                              [config.frame_width/2, config.frame_height/2]])
+            boxes = np.concatenate([self.boxes, frame[None]])
+            bounds = np.array([boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)])
+        bounds = np.asarray(bounds, dtype=float)[:, :2]
+        self.origin = bounds[0] - self.arguments["border"]
+        self.shape = tuple(np.ceil((bounds[1] - self.origin + self.arguments["border"])/self.step).astype(int) + 1)
+
+        # cells covered by the obstacles (with clearance)
+        self.cost = np.zeros(self.shape, dtype=float)
+        for box in self.boxes:
+            self.mark_box(box, self.obstacle_penalty)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_obstacle(self, obstacle):
+        """
+        Add an obstacle to the grid
+
+        obstacle: mobject or corners pairs
+        """
+
+        box = self.get_box(obstacle)
+        self.boxes = np.concatenate([self.boxes, box[None]])
+        self.mark_box(box, self.obstacle_penalty)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def mark_box(self, box, penalty):
+        """
+        Add a penalty to the cells covered by a box (with clearance)
+        """
+
+        start = np.clip(np.floor((box[0] - self.margin - self.origin)/self.step).astype(int), 0, self.shape)
+        end = np.clip(np.ceil((box[1] + self.margin - self.origin)/self.step).astype(int) + 1, 0, self.shape)
+        self.cost[start[0]:end[0], start[1]:end[1]] += penalty
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def to_cell(self, point):
+        """
+        Return the cell of a point
+        """
+
+        cell = np.round((np.asarray(point, dtype=float)[:2] - self.origin)/self.step).astype(int)
+
+        return tuple(int(c) for c in np.clip(cell, 0, np.array(self.shape) - 1))
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_direction_index(self, direction):
+        """
+        Return the index of the move of a direction (None if the direction is free)
+        """
+
+        if direction is None:
+            return None
+
+        return int(np.argmax([np.dot(direction[:2], move) for move in self.moves]))
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def search(self, start, end, start_dir, end_dir, window):
+        """
+        A* on the states (cell, direction), the cost is the length plus the penalties of bends and crossed cells
+        return: list of the directions indices of the path moves (None if no path exists in the window)
+
+        start, end: cells of the ports
+        start_dir, end_dir: indices of the first and last moves (None if free)
+        window: (min cell, max cell) where the search is limited
+        """
+
+        # initialization
+        (x_min, y_min), (x_max, y_max) = window
+        cost = self.cost.tolist()    # python lists are faster to index one cell at time
+        bend = self.bend_penalty
+        ex, ey = end
+
+        def heuristic(x, y):
+            dx, dy = abs(ex - x), abs(ey - y)
+            return dx + dy + (bend if dx and dy else 0)
+
+        # the counter breaks the ties of the queue
+        counter = itertools.count()
+        first = range(4) if start_dir is None else [start_dir]
+        queue = [(heuristic(*start), 0, next(counter), start[0], start[1], d, None) for d in first]
+        heapq.heapify(queue)
+        parents = {}
+
+        while queue:
+            _, g, _, x, y, d, parent = heapq.heappop(queue)
+            if (x, y, d) in parents:
+                continue
+            parents[(x, y, d)] = parent
+
+            if (x, y) == end and (end_dir is None or d == end_dir):
+                # directions from the end to the start
+                path = []
+                state = (x, y, d)
+                while state is not None:
+                    path.append(state[2])
+                    state = parents[state]
+                # the start state has no move
+                return path[-2::-1]
+
+            for d_next, (mx, my) in enumerate(self.moves):
+                # the first move follows the start direction, no U turns
+                if (parent is None and d_next != d) or (d_next + 2)%4 == d:
+                    continue
+                nx, ny = x + mx, y + my
+                if nx < x_min or nx > x_max or ny < y_min or ny > y_max or (nx, ny, d_next) in parents:
+                    continue
+                g_next = g + 1 + cost[nx][ny] + (bend if d_next != d else 0)
+                heapq.heappush(queue, (g_next + heuristic(nx, ny), g_next, next(counter), nx, ny, d_next, (x, y, d)))
+
+        return None
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def route_directions(self, start, end, start_direction=None, end_direction=None):
+        """
+        Return the sequence of the moves (directions indices) from the start to the end port
+
+        start, end: ports (points)
+        start_direction: direction of the pipe leaving the start port (None if free)
+        end_direction: direction of the pipe entering the end port (None if free)
+        """
+
+        # initialization
+        start_cell = self.to_cell(start)
+        end_cell = self.to_cell(end)
+        start_dir = self.get_direction_index(start_direction)
+        end_dir = self.get_direction_index(end_direction)
+        if start_cell == end_cell:
+            return []
+
+        # search in the window around the ports, then in the whole grid
+        border = self.search_border
+        last = (self.shape[0] - 1, self.shape[1] - 1)
+        window = ((max(min(start_cell[0], end_cell[0]) - border, 0), max(min(start_cell[1], end_cell[1]) - border, 0)),
+                  (min(max(start_cell[0], end_cell[0]) + border, last[0]), min(max(start_cell[1], end_cell[1]) + border, last[1])))
+        moves = self.search(start_cell, end_cell, start_dir, end_dir, window)
+        if moves is None:
+            moves = self.search(start_cell, end_cell, start_dir, end_dir, ((0, 0), last))
+
+        return moves
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def route(self, start, end, start_direction=None, end_direction=None, color=BLACK, single_path=None,
+              add_to_grid=True):
+        """
+        Compute the route between two ports and return the pipe
+
+        start, end: ports (points or mobjects, the mobjects use their center)
+        start_direction: direction of the pipe leaving the start port (None if free)
+        end_direction: direction of the pipe entering the end port (None if free)
+        color: color of the pipe
+        single_path: see Pipe_connection
+        add_to_grid: if True the next pipes avoid this one
+        """
+
+        # initialization
+        start = start.get_center() if isinstance(start, Mobject) else np.asarray(start, dtype=float)
+        end = end.get_center() if isinstance(end, Mobject) else np.asarray(end, dtype=float)
+        r = get_style(Pipe_connection.arguments)["radius"]
+
+        moves = self.route_directions(start, end, start_direction, end_direction)
+        if moves is None:
+            print("\n No route found between the ports! \n")
+            moves = []
+
+        # runs of moves with the same direction
+        runs = []
+        for d in moves:
+            if runs and runs[-1][0] == d:
+                runs[-1][1] += 1
+            else:
+                runs.append([d, 1])
+        if not runs:
+            # aligned (or coincident) ports: single straight pipe
+            delta = (end - start)[:2]
+            runs = [[self.get_direction_index(delta), 0]]
+        directions = np.array([[*self.moves[d], 0] for d, _ in runs], dtype=float)
+
+        # corners of the route (on the grid), the first and last runs pass exactly through the ports
+        start_cell = np.array(self.to_cell(start))
+        cells = np.cumsum([np.array(self.moves[d])*n for d, n in runs], axis=0) + start_cell
+        corners = np.zeros((len(runs) + 1, 3))
+        corners[0] = start
+        corners[1:, :2] = self.origin + cells*self.step
+        corners[-1] = end
+        if len(runs) > 1:
+            # coordinate perpendicular to the run (y for horizontal runs, x for vertical runs)
+            axis = int(np.abs(directions[0, 0]) > 0.5)
+            corners[1, axis] = start[axis]
+            axis = int(np.abs(directions[-1, 0]) > 0.5)
+            corners[-2, axis] = end[axis]
+
+        # lengths of the straight parts: each bend uses a radius on both sides
+        distances = np.sum((corners[1:] - corners[:-1])*directions, axis=1)
+        bends = np.full(len(runs), 2.0)
+        bends[0] -= 1
+        bends[-1] -= 1
+        lengths = distances - r*bends
+        if np.any(lengths < 0):
+            print("\n Route too tight for the pipe radius (reduce the radius or increase grid_step)! \n")
+            lengths = np.maximum(lengths, 0)
+
+        if add_to_grid:
+            path = np.concatenate([[[0, 0]], np.cumsum(np.reshape([self.moves[d] for d in moves], (-1, 2)), axis=0)])
+            path = np.clip(path + start_cell, 0, np.array(self.shape) - 1)
+            self.cost[path[:, 0], path[:, 1]] += self.pipe_penalty
+
+        return Pipe_connection(pos=start, l_len=lengths, directions=directions, color=color, single_path=single_path)
+
+# ======================================================================================================================
@@ -2,6 +2,9 @@ from manim import *
 import numpy as np
 from numpy import pi
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Instrumentation import track_updater
+from Mlib.Tools.Layout import Footprint, get_box, rotate_points
 
 """
 Author: Ivan Archetti   
@@ -15,12 +18,18 @@ Collection of python classes of springs
 # ======================================================================================================================
 
 class Compression_Spring():
-    arguments = {"fill_color": GREY_C,
-                 "geometric_ratio": 1/20,
-                 "scala_lunghezza_libera": 1,
-                 "scala_note_secondarie": 0.5}
+    arguments = Style({"fill_color": GREY_C,
+                       "geometric_ratio": 1/20,
+                       "scala_lunghezza_libera": 1,
+                       "scala_note_secondarie": 0.5})
+
+    # coil outlines shared by all the springs with the same coil geometry (never modified)
+    outlines = {}
+
+    def __init__(self, d_ext=1, height=None, coil_angle=None, n_coils=10, angle=0, color=GREY_B, style=None, **kwargs):
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
 
-    def __init__(self, d_ext=1, height=None, coil_angle=None, n_coils=10, angle=0, color=GREY_B,**kwargs):
         # initialization
         # set the minimum number of coils (3 coils) to be a spring
         self.n_coils = np.clip(int(n_coils), 3, None)
@@ -33,6 +42,9 @@ class Compression_Spring():
         self.d_coil = self.r*2
         self.angle = angle
         self.u = [np.cos(self.angle), np.sin(self.angle)]
+        self.compression = 0 # absolute compression (0 free length, 1 coils in contact: pitch equal to the wire diameter)
+        self.tracker = None
+        self.tracker_updater = None
 
         self.spring = VGroup()
         
@@ -50,48 +62,29 @@ class Compression_Spring():
     def set_spring_by_coil_angle(self, coil_angle=pi/10):
         """
         Create the n coils of the spring with n_coils and coil angle (height will be calculated)
+        The coils are instances of the same outline: back coils and frontal coils are two paths
+        generated from the outline and the poses of the coils (see get_poses)
         """
 
         # initialization
         d_coil = self.d_coil
         d_ext = self.d_ext
         angle = self.angle
-        n_coils = self.n_coils
-        u_coil = self.u_coil = [np.cos(coil_angle), np.sin(coil_angle)]
-        d_ext_correct = d_ext/u_coil[0]
+        self.u_coil = [np.cos(coil_angle), np.sin(coil_angle)]
+
+        # outline of the coil (all the coils are the same before rotation and translation) and free pitch
+        self.spring_lead, width = self.get_lead(coil_angle, d_ext, d_coil)
+        self.template = self.__create_coil_outline(width)
+        self.coil_angle = np.abs(coil_angle)
 
         body = VGroup()
 
-        # calculate vertical translation 
-        spring_lead = (d_ext_correct/2-d_coil)*u_coil[1]
-         
-        position = ORIGIN
-        
-        # create spring body
-        for i in range(n_coils):
-            if i == 0: # create the spring base
-                k = 0
-                p = 1
-            elif i > 0 and i < n_coils-1 or n_coils == 2: # set hight of the first coil from the base
-                k = -1
-                p = 2
-            elif  i == n_coils-1: # create the last coil
-                k = 0
-                position = position - spring_lead*UP
-
-            # create coils
-            body.add(self.__create_coil().rotate(angle=coil_angle*k).shift(position))
-            position = position + p*spring_lead*UP
-            coil_angle = -coil_angle
-        
-            # set color and position for the "frontal" coils 
-            if i%2 == 1:
-                body[i].set_z_index(body[-1].z_index + 1)
-                body[i].set_color(self.color)
-                body[i].set_stroke(BLACK)
-        
-        # rotate the spring respect the base coil
-        body.rotate(about_point=body[0].get_center(), angle=angle)
+        # back coils (even) and "frontal" coils (odd) 
+        body.add(VMobject(fill_color=self.fill_color, fill_opacity=1, stroke_color=self.fill_color, stroke_width=1))
+        body.add(VMobject(fill_color=self.color, fill_opacity=1, stroke_color=BLACK, stroke_width=1).set_z_index(1))
+
+        # spring rotated respect the base coil (in the origin)
+        self.__set_coils(VGroup(body), self.compression, frame=(np.exp(1j*angle), 0, 0, False))
 
         return body
     
@@ -107,14 +100,8 @@ class Compression_Spring():
         d_coil = self.d_coil
         d_ext = self.d_ext
         n_coils = self.n_coils
-        h = height
-        
-        # height of the spring from the center of base coil and center of last coil
-        h_star = h - d_coil
 
-        # calculate the pitch of coil angle and then the coil angle
-        spring_lead = h_star/(n_coils-2)
-        coil_angle = np.arctan(spring_lead/(d_ext-2*d_coil))
+        coil_angle = self.get_coil_angle(height, d_ext, d_coil, n_coils)
 
         body = self.set_spring_by_coil_angle(coil_angle=coil_angle)
         
@@ -125,69 +112,240 @@ class Compression_Spring():
 
     # ----------------------------------------------------------------------------------------------------------------------        
 
-    def __create_coil(self):
+    @classmethod
+    def get_coil_angle(cls, height, d_ext, d_coil, n_coils):
+        """
+        Coil angle of a spring with n_coils and total height (see set_spring_by_height)
+        """
+
+        # height of the spring from the center of base coil and center of last coil
+        h_star = height - d_coil
+
+        # calculate the pitch of coil angle and then the coil angle
+        spring_lead = h_star/(n_coils-2)
+
+        return np.arctan(spring_lead/(d_ext-2*d_coil))
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_lead(cls, coil_angle, d_ext, d_coil):
+        """
+        Free lead of the coils (distance along the axis between two adjacent coils) and width of the coil outline
+        """
+
+        u_coil = [np.cos(coil_angle), np.sin(coil_angle)]
+        d_ext_correct = d_ext/u_coil[0]
+
+        return (d_ext_correct/2-d_coil)*u_coil[1], d_ext_correct-d_coil
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_footprint(cls, d_ext=1, height=None, coil_angle=None, n_coils=10, angle=0, style=None, **kwargs):
+        """
+        Footprint of the spring not compressed (see Mlib.Tools.Layout): ports "base" and "end" (centers of the base coil
+        and of the last coil) and box of the coils
+        """
+
+        # initialization (same geometry of the constructor)
+        n_coils = np.clip(int(n_coils), 3, None)
+        r = d_ext*get_style(cls.arguments, style)["geometric_ratio"]
+        d_coil = 2*r
+        if height != None:
+            coil_angle = cls.get_coil_angle(height, d_ext, d_coil, n_coils)
+        spring_lead, width = cls.get_lead(coil_angle, d_ext, d_coil)
+
+        # coils along the axis before the rotation (see get_poses): base coil in the origin and last coil after
+        # 2*n_coils - 4 leads, the inclined coils are inside the box of the end coils
+        length = (2*n_coils - 4)*spring_lead
+        corners = rotate_points([[-width/2, -r, 0], [width/2, -r, 0], [width/2, length + r, 0], [-width/2, length + r, 0]], angle)
+        ports = rotate_points([[0, 0, 0], [0, length, 0]], angle)
+
+        return Footprint(ports={"base": ports[0], "end": ports[1]}, box=get_box(corners))
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def __create_coil_outline(self, width):
         """
-        Create a single coil
+        Create the outline (points) of a single coil centered in the origin (shared between the springs)
+        width: width of the outline (see get_lead)
         """
 
         d_coil = self.d_coil
         r = self.r
-        d_ext = self.d_ext
-        fill_color = self.fill_color
-        u_coil = self.u_coil
 
-        d_spring = d_ext/u_coil[0]
+        key = (round(r, 12), round(d_coil, 12), round(width, 12))
+        if key not in self.outlines:
+            self.outlines[key] = RoundedRectangle(corner_radius=r, height=d_coil, width=width).points
 
-        coil = RoundedRectangle(corner_radius=r, height=d_coil, width=d_spring-d_coil, 
-                                stroke_width=1, stroke_color=fill_color, 
-                                fill_color=fill_color, fill_opacity=1, color=BLACK)
-        return coil
+        return self.outlines[key]
 
     # ----------------------------------------------------------------------------------------------------------------------        
 
     def set_compression(self, perc_comp=0.5, animated=True, run_time=1):    
         """
-        Set the compression of the spring
-        perc_comp: percentage of the initial length
+        Set the compression of the spring (absolute: the same value gives always the same spring)
+        perc_comp: percentage of compression (0 free length, 1 coils in contact, negative values extend the spring)
         animeted: a flag that define whether is ina animation mode or in static mode
         """
         
         # initialization
-        coil_angle = self.coil_angle
-        d_coil = self.d_coil
-        n_coils = self.n_coils
-        d_ext = self.d_ext
-        u = self.u
+        start = self.compression
+        self.compression = perc_comp
 
         functions = []
 
-        # rescale the new angle
-        comp_angle = np.arcsin(perc_comp*np.sin(coil_angle))
-
-        # calculate the vertical movement
-        translation = (d_ext/2-d_coil)*np.tan(comp_angle) 
-        
-        # calculate the new position
-        position = translation*(u[0]*DOWN + u[1]*RIGHT)
-
-        # define position from 1 to n coils
-        for i, j in enumerate(self.coils[1:]):
-            if i == n_coils - 2: # the last coil has not rotation and different translation
-                 comp_angle = 0
-                 position = position - translation*(u[0]*DOWN + u[1]*RIGHT) 
-                
-            if animated:
-                functions.append(j.animate(run_time=run_time).rotate(angle=-comp_angle).shift(position))
-            else:
-                j.rotate(angle=-comp_angle).shift(position)
-
-            position = position + 2*translation*(u[0]*DOWN + u[1]*RIGHT)
-            comp_angle = -comp_angle
+        if animated:
+            # all the coils are computed from the compression in every frame (single animation)
+            functions.append(UpdateFromAlphaFunc(self.spring, lambda spring, alpha: self.__set_coils(spring, start + alpha*(perc_comp - start)),
+                                                 run_time=run_time))
+        else:
+            self.__set_coils(self.spring, perc_comp)
 
         return functions
     
     # ----------------------------------------------------------------------------------------------------------------------        
 
+    def get_compression(self, perc_comp=0.5):
+        """
+        Return the function that compresses the coils of a spring group (the spring or the target of its animation)
+        perc_comp: percentage of compression of the free length (see set_compression)
+        """
+
+        def edit(spring):
+            self.__set_coils(spring, perc_comp)
+
+        return edit
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def set_tracker(self, tracker):
+        """
+        Drive the compression of the spring with a ValueTracker (the spring follows the tracker in every frame)
+        tracker: ValueTracker with the compression (see set_compression)
+        """
+
+        # only one tracker drives the spring
+        if self.tracker is not None:
+            self.spring.remove_updater(self.tracker_updater)
+
+        self.tracker = tracker
+        self.tracker_updater = track_updater(lambda spring: self.__set_coils(spring, tracker.get_value()),
+                                             name="Compression_Spring.tracker")
+        self.spring.add_updater(self.tracker_updater)
+        self.compression = tracker.get_value()
+        self.__set_coils(self.spring, self.compression)
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def get_poses(self, perc_comp=0):
+        """
+        Return rotation and position along the axis of each coil in the spring frame (base coil in the origin)
+        perc_comp: percentage of compression of the free length (see set_compression)
+        """
+
+        # initialization
+        n_coils = self.n_coils
+        i = np.arange(n_coils)
+
+        # the pitch is proportional to the sine of the coils angle: 4*lead is the pitch of two coils on the same side
+        # (one turn), at compression 1 it is equal to the wire diameter (coils in contact)
+        sin_free = np.sin(self.coil_angle)
+        lead_factor = self.spring_lead/sin_free
+        sin_contact = min(self.d_coil/(4*lead_factor), sin_free)
+        sin_angle = np.clip(sin_free - perc_comp*(sin_free - sin_contact), -1, 1)
+        spring_lead = lead_factor*sin_angle
+
+        # alternate rotation of the coils, base and last coil are not rotated
+        angles = np.where(i%2 == 1, 1, -1)*np.arcsin(sin_angle)
+        angles[[0, -1]] = 0
+        positions = (2*i - 1)*spring_lead
+        positions[0] = 0
+        positions[-1] = (2*n_coils - 4)*spring_lead
+
+        return angles, positions
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def get_stroke(self):
+        """
+        Return the shortening of the distance between the end coils from the free length (compression 0) 
+        to the coils in contact (compression 1), in the spring frame
+        """
+
+        _, free = self.get_poses(0)
+        _, solid = self.get_poses(1)
+
+        return free[-1] - solid[-1]
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def get_frame(self, spring):
+        """
+        Return the transformation (complex scale/rotation, translation, z and reflection) from the spring frame 
+        to the scene, computed with the base coil (first coil of the back coils) of a spring group that never moves 
+        during the compression; reflection is True for a mirrored spring (e.g. after flip)
+        """
+
+        # initialization
+        template = self.template[:, 0] + 1j*self.template[:, 1]
+        base = spring[0][0].points[:len(self.template)]
+        points = base[:, 0] + 1j*base[:, 1]
+        points_c = points - points.mean()
+
+        # least squares similarity between the template (or its mirror image) and the base coil
+        fits = []
+        for reflection in (False, True):
+            source = np.conj(template) if reflection else template
+            source_c = source - source.mean()
+            q = np.sum(points_c*np.conj(source_c))/np.sum(np.abs(source_c)**2)
+            fits.append((np.sum(np.abs(points_c - q*source_c)**2), reflection, q, points.mean() - q*source.mean()))
+        _, reflection, q, b = min(fits, key=lambda fit: fit[0])
+
+        return q, b, base[:, 2].mean(), reflection
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def get_coil_points(self, perc_comp, frame):
+        """
+        Return the points of all the coils (n_coils, n_points, 3) with a single NumPy operation
+        perc_comp: percentage of compression of the free length (see set_compression)
+        frame: transformation from the spring frame to the scene (see get_frame)
+        """
+
+        # initialization
+        q, b, z, reflection = frame
+        template = self.template[:, 0] + 1j*self.template[:, 1]
+        angles, positions = self.get_poses(perc_comp)
+
+        # rotate the template and move it along the axis of the spring (imaginary axis of the spring frame)
+        coils = template[None, :]*np.exp(1j*angles)[:, None] + 1j*positions[:, None]
+        if reflection:
+            coils = np.conj(coils)
+        coils = q*coils + b
+
+        return np.stack([coils.real, coils.imag, np.full(coils.shape, z)], axis=-1)
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    def __set_coils(self, spring, perc_comp, frame=None):
+        """
+        Set the points of the back and frontal coils of a spring group
+        frame: transformation from the spring frame to the scene (default: computed with the base coil)
+        """
+
+        if frame is None:
+            frame = self.get_frame(spring)
+
+        points = self.get_coil_points(perc_comp, frame)
+        spring[0][0].set_points(points[0::2].reshape(-1, 3))
+        spring[0][1].set_points(points[1::2].reshape(-1, 3))
+
+        return spring
+    
+    # ----------------------------------------------------------------------------------------------------------------------        
+
     def get_spring_legth(self):
         """
         Calculate the total height of the spring
@@ -196,10 +354,11 @@ class Compression_Spring():
         # initialization
         d_coil = self.d_coil
         
-        h = self.coils[-1].get_center()[1] - self.coils[0].get_center()[1]
-        b = self.coils[-1].get_center()[0] - self.coils[0].get_center()[0]
+        # distance between base coil and last coil
+        q = self.get_frame(self.spring)[0]
+        _, positions = self.get_poses(self.compression)
 
-        hypot = np.hypot(h, b)
+        hypot = np.abs(q)*positions[-1]
 
         len = d_coil + hypot
 
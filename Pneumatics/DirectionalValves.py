@@ -1,7 +1,13 @@
 from manim import *
 from numpy import pi
-from Mlib.Pneumatics import ValveActuators as vact
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Labels import cached_text
+from Mlib.Graphics.Animations import fused_transform
+from Mlib.Tools.Cache import Prototype_cache
+from Mlib.Graphics.Raster import Raster_layer
+from Mlib.Graphics.Styles import Style, get_style, get_theme
+from Mlib.Tools.Instrumentation import instrumented
+from Mlib.Tools.Layout import Footprint, get_box
 
 
 """
@@ -16,23 +22,42 @@ Collection of python classes about pneumatic valves
 # directional valves
 # ======================================================================================================================
 
+# prototypes of chambers and actuators shared by all the valves (hits and misses are in get_stats())
+chamber_cache = Prototype_cache(name="chambers")
+actuator_cache = Prototype_cache(name="actuators")
+
+# ======================================================================================================================
+
 class Pneumatic_valve_5_2():
     """
     Pneumtic valve with double chamber and 5 input/output for chamber
     """
 
-    arguments = {"output_reduction": 1/10,
-                 "valve_stroke_color": GREY_E,
-                 "valve_fill_color": GREY_A,
-                 "actuator_fill_color": GREY_D}
+    arguments = Style({"output_reduction": 1/10,
+                       "valve_stroke_color": GREY_E,
+                       "valve_fill_color": GREY_A,
+                       "actuator_fill_color": GREY_D,
+                       "prototype_cache": True})
+
+    # postions and angles of each input/output of the pneumatic chamber (ratios of the height)
+    IN_OUT_positions = ((ORIGIN, DOWN/2), (RIGHT/4, UP/2), (RIGHT/4, DOWN/2), (LEFT/4, UP/2), (LEFT/4, DOWN/2))
+    IN_OUT_angles = (0, pi, 0, pi, 0)
+    # internal connections of the left and right chambers, names of the chambers (from left to right) 
+    # and index of the chamber aligned to the ports at rest
+    left_right_connections = (((1,4), (2,3), (5,5)), ((1,2), (4,5), (3,3)))
+    chamber_names = ("left", "right")
+    rest_position = 1
 
     def __init__(self, height=2, left_actuator_choice="Coil", right_actuator_choice="Compression spring",  visible_connections=False, 
-                 actuated=False, **kwargs):
+                 actuated=False, style=None, **kwargs):
         """
         left_actuator, right_actuator: tags that determinate the type of actuator
-                                       
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
         """
         
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization
         self.h = height
         self.w = self.h
@@ -42,36 +67,101 @@ class Pneumatic_valve_5_2():
         self.actuator_fill_color = self.arguments["actuator_fill_color"]
         self.left_actuator_choice = left_actuator_choice
         self.right_actuator_choice = right_actuator_choice
-        # postions and angles of each input/output of the pneumatic chamber
-        self.IN_OUT_positions = ((ORIGIN, DOWN/2), (RIGHT/4, UP/2), (RIGHT/4, DOWN/2), (LEFT/4, UP/2), (LEFT/4, DOWN/2))
-        self.IN_OUT_angles = (0, pi, 0, pi, 0)
         self.actuated = actuated
+        # internal connections of each chamber (from left to right) and index of the chamber aligned to the ports
+        self.chamber_connections = list(self.left_right_connections)
+        self.position = self.rest_position
+        # centers of the chambers (see get_chamber_centers)
+        centers = self.get_chamber_centers(self.h)
          
         self.valve = VGroup()
         
         # initialization left valve chamber
-        self.left_chamber = self.set_chamber(connections=((1,4), (2,3), (5,5)), visible_connections=visible_connections)
-        self.left_chamber.shift(self.w/2*LEFT)
+        self.left_chamber = self.set_chamber(connections=self.chamber_connections[0], visible_connections=visible_connections)
+        self.left_chamber.shift(centers[0])
 
         # initialization right valve chamber
-        self.right_chamber = self.set_chamber(connections=((1,2), (4,5), (3,3)), visible_connections=visible_connections)
-        self.right_chamber.shift(self.w/2*RIGHT)
+        self.right_chamber = self.set_chamber(connections=self.chamber_connections[1], visible_connections=visible_connections)
+        self.right_chamber.shift(centers[-1])
 
         # define dictionary actuator
         self.dict_act = self.dict_actuator()
 
         # initialization left actuator
         position_side = LEFT
-        position = self.w*position_side + self.h/2*DOWN
+        position = self.get_actuator_position(self.h, position_side)
         self.left_actuator = self.select_actuator(position_side=position_side, position=position, actuator_type=left_actuator_choice)
 
         # initialization right actuator
         position_side = RIGHT
-        position = self.w*position_side + self.h/2*DOWN
+        position = self.get_actuator_position(self.h, position_side)
         self.right_actuator = self.select_actuator(position_side=position_side, position=position, actuator_type=right_actuator_choice)
 
         self.valve.add(self.left_actuator.actuator, self.left_chamber, self.right_chamber, self.right_actuator.actuator)
 
+        # raster layers of the chambers (see freeze)
+        self.layers = []
+
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_chamber_centers(cls, height=2):
+        """
+        Centers of the chambers (from left to right) of the valve at rest, the chambers are squares of side height
+        """
+
+        n = len(cls.chamber_names)
+
+        return (np.arange(n) - (n - 1)/2)[:, None]*height*RIGHT
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_actuator_position(cls, height=2, position_side=LEFT):
+        """
+        Position of an actuator: bottom of the outer side of the last chamber on position_side
+        """
+
+        centers = cls.get_chamber_centers(height)
+        center = centers[-1] if position_side[0] > 0 else centers[0]
+
+        return center + height/2*position_side + height/2*DOWN
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_footprint(cls, height=2, left_actuator_choice="Coil", right_actuator_choice="Compression spring", **kwargs):
+        """
+        Footprint of the valve at rest (see Mlib.Tools.Layout): the ports of every chamber ("left.1", "right.2", 
+        etc etc...), the ports of the chamber aligned to the connections ("1", "2", etc etc...), box of chambers
+        and actuators
+        """
+
+        # actuators (and springs) are imported only when a valve needs them
+        from Mlib.Pneumatics import ValveActuators as vact
+
+        # initialization
+        h = height
+        centers = cls.get_chamber_centers(h)
+
+        ports = {}
+        for name, center in zip(cls.chamber_names, centers):
+            for i, (x, y) in enumerate(cls.IN_OUT_positions):
+                ports[f"{name}.{i + 1}"] = center + (x + y)*h
+        for i in range(len(cls.IN_OUT_positions)):
+            ports[f"{i + 1}"] = ports[f"{cls.chamber_names[cls.rest_position]}.{i + 1}"].copy()
+
+        # chambers and actuators
+        boxes = [get_box([centers[0] + h/2*DL, centers[-1] + h/2*UR])]
+        for position_side, actuator_choice in ((LEFT, left_actuator_choice), (RIGHT, right_actuator_choice)):
+            if actuator_choice not in vact.actuator_choices:
+                continue
+            actuator_class, actuator_type = vact.actuator_choices[actuator_choice]
+            envelope = actuator_class.get_envelope(height=h, position_side=position_side, actuator_type=actuator_type)
+            boxes.append(envelope + cls.get_actuator_position(h, position_side))
+
+        return Footprint(ports=ports, box=get_box(np.concatenate(boxes)))
 
     # ----------------------------------------------------------------------------------------------------------------------        
 
@@ -99,6 +189,23 @@ class Pneumatic_valve_5_2():
                     if there is a third number z, is a multiple connection, x and y are the beginning and z the finish
         """
 
+        # the chamber is a copy of the cached prototype with the same geometry and colors
+        if self.arguments["prototype_cache"]:
+            positions = tuple(tuple(np.round(x + y, 9)) for x, y in self.IN_OUT_positions)
+            key = (self.h, self.k, positions, tuple(self.IN_OUT_angles), str(self.valve_stroke_color), 
+                   str(self.valve_fill_color), tuple(tuple(connection) for connection in connections), visible_connections)
+            
+            return chamber_cache.get(key, lambda: self.__build_chamber(connections, visible_connections))
+        
+        return self.__build_chamber(connections, visible_connections)
+
+    # ----------------------------------------------------------------------------------------------------------------------    
+
+    def __build_chamber(self, connections, visible_connections=False):
+        """
+        Drawing the internal structure of the chamber (see set_chamber)
+        """
+
         # initialization
         h = self.h
         stroke_width = 2*h
@@ -126,22 +233,22 @@ class Pneumatic_valve_5_2():
                 cp_connection = self.__set_center_pressure_connection(start, end, point)
                 chamber.add(cp_connection)
 
-             # add tag numbers to the input outpu valve
-            if visible_connections:
-                for i in range(1, 6):
-                    pos = self.get_IN_OUT_positions(i)[0]
-                    if i == 1:
-                        pos = pos + h/10*DR
-                    elif i == 2:
-                        pos = pos + h/10*UR
-                    elif i == 3:
-                        pos = pos + h/10*DR
-                    elif i == 4:
-                        pos = pos + h/10*UL
-                    elif i == 5:
-                        pos = pos + h/10*DL
-                    
-                    chamber.add(Text(f"{i}", color=BLACK).scale(0.3*h).shift(pos))
+        # add tag numbers to the input outpu valve (once for chamber)
+        if visible_connections:
+            for i in range(1, len(self.IN_OUT_positions) + 1):
+                pos = self.get_IN_OUT_positions(i)[0]
+                if i == 1:
+                    pos = pos + h/10*DR
+                elif i == 2:
+                    pos = pos + h/10*UR
+                elif i == 3:
+                    pos = pos + h/10*DR
+                elif i == 4:
+                    pos = pos + h/10*UL
+                elif i == 5:
+                    pos = pos + h/10*DL
+                
+                chamber.add(cached_text(f"{i}", color=BLACK).scale(0.3*h).shift(pos))
 
         return chamber
 
@@ -215,6 +322,24 @@ class Pneumatic_valve_5_2():
         actuator_type: what type of actuator
         """
 
+        # the actuator is a copy of the cached prototype with the same type, size and side
+        if self.arguments["prototype_cache"]:
+            key = (actuator_type, self.h, tuple(position_side), tuple(position), self.actuated, get_theme())
+
+            return actuator_cache.get(key, lambda: self.__build_actuator(position_side, position, actuator_type))
+        
+        return self.__build_actuator(position_side, position, actuator_type)
+    
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __build_actuator(self, position_side=LEFT, position=ORIGIN, actuator_type="Coil"):
+        """
+        Create the actuator (see select_actuator)
+        """
+
+        # actuators (and springs) are imported only when a valve needs them
+        from Mlib.Pneumatics import ValveActuators as vact
+
         h = self.h
         n_type = self.dict_act[actuator_type]
         
@@ -239,6 +364,7 @@ class Pneumatic_valve_5_2():
     
     # ----------------------------------------------------------------------------------------------------------------------        
 
+    @instrumented
     def slide_valve(self, motion_direction=RIGHT, run_time=1):
         """
         Procedure that animate the cylinder movement
@@ -251,21 +377,67 @@ class Pneumatic_valve_5_2():
         right_actuator_choice = self.right_actuator_choice
 
         functions = []
-        
-        # move only the actuators
-        functions.append(*self.__move_actuator(self.left_actuator, left_actuator_choice, motion_direction, run_time=run_time))
-        functions.append(*self.__move_actuator(self.right_actuator, right_actuator_choice, motion_direction, run_time=run_time))
-            
-        # move only the valves except the actuators
-        functions.append(self.valve[1:-1].animate(run_time=run_time).shift(w*motion_direction))
+
+        # movement of the actuators
+        edit_left = self.__move_actuator(self.left_actuator, left_actuator_choice, motion_direction)
+        edit_right = self.__move_actuator(self.right_actuator, right_actuator_choice, motion_direction)
+
+        def edit(target):
+            edit_left(target[0])
+            # move only the valves except the actuators
+            target[1:-1].shift(w*motion_direction)
+            edit_right(target[-1])
+
+        # actuators and chambers in a single animation
+        functions.append(fused_transform(self.valve, edit, run_time=run_time))
+
+        # the chamber on the opposite side of the motion is now aligned to the ports
+        self.position = int(np.clip(self.position - np.sign(motion_direction[0]), 0, len(self.chamber_connections) - 1))
         
         return functions
     
     # ----------------------------------------------------------------------------------------------------------------------
 
-    def __move_actuator(self, actuator, actuator_choice, motion_direction, run_time=1):
+    def get_connections(self):
+        """
+        Return the internal connections (FESTO numbers) of the chamber aligned to the ports (see set_chamber)
         """
-        Procedure that collects the movement of the actuators during the valve shifting
+
+        return self.chamber_connections[self.position]
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def freeze(self):
+        """
+        Draw the chambers as cached images (the actuators stay vector), see Raster_layer
+        The chambers slide with the same images, all the valves with the same chambers share them
+        return: group of the images and of the valve, to add to the scene in place of the valve
+        """
+
+        if not self.layers:
+            self.layers = [Raster_layer(chamber) for chamber in self.valve[1:-1]]
+
+        return Group(*[layer.group for layer in self.layers], self.valve)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def thaw(self):
+        """
+        Restore the vector chambers
+        """
+
+        for layer in self.layers:
+            layer.thaw()
+        self.layers = []
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __move_actuator(self, actuator, actuator_choice, motion_direction):
+        """
+        Procedure that returns the movement of the actuators during the valve shifting 
+        (function that edits the actuator group)
         actuator: actuator class
         actuator_choice: number taht define the actuator type (electric, mechanic, etc etc...)
         motion_direction: direction of movement (left/right)
@@ -275,27 +447,19 @@ class Pneumatic_valve_5_2():
         w = self.w
         dict_act = self.dict_act
 
-        functions = []
-
-        # select the right or left actuator
-        if np.sign(actuator.position[0]) == -1:
-            pos = 0 # left
-        elif np.sign(actuator.position[0]) == 1:
-            pos = -1 # right
-
         # select the actuator in order to show the correct movement (translation compression, etc etc...)
         if dict_act[actuator_choice] == 2: # Push button
-            functions.append(actuator.set_push_button_compression(motion_direction=motion_direction))
+            edit = actuator.get_push_button_compression(motion_direction=motion_direction)
         elif dict_act[actuator_choice] == 4: # Roller lever
-            functions.append(actuator.set_roller_lever_compression(motion_direction=motion_direction, run_time=run_time))
+            edit = actuator.get_roller_lever_compression(motion_direction=motion_direction)
         elif dict_act[actuator_choice] == 5: # Compression spring
-            functions.append(actuator.set_spring_compression(motion_direction=motion_direction, run_time=run_time))
+            edit = actuator.get_spring_compression(motion_direction=motion_direction)
         elif dict_act[actuator_choice] == 6: # Pneumatic signal
-            functions.append(actuator.set_pneumatic_signal_compression(motion_direction=motion_direction, run_time=run_time))
+            edit = actuator.get_pneumatic_signal_compression(motion_direction=motion_direction)
         else: # translation for the other actuators
-            functions.append(self.valve[pos].animate(run_time=run_time).shift(w*motion_direction))
+            edit = lambda target: target.shift(w*motion_direction)
 
-        return functions
+        return edit
     
     # ----------------------------------------------------------------------------------------------------------------------
 
@@ -310,6 +474,17 @@ class Pneumatic_valve_5_2():
     
     # ----------------------------------------------------------------------------------------------------------------------
 
+    def get_output_2(self, chamber):
+        """
+        Get output number 2 of the valve (FESTO numeration)
+        """
+
+        # sum chamber center and position of connection
+        output_2 = chamber[0].get_center() + self.get_IN_OUT_positions(connection=2)[0]
+        return output_2
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
     def get_input_3(self, chamber):
         """
         Get input number 3 of the valve (FESTO numeration)
@@ -321,6 +496,17 @@ class Pneumatic_valve_5_2():
     
     # ----------------------------------------------------------------------------------------------------------------------
 
+    def get_output_4(self, chamber):
+        """
+        Get output number 4 of the valve (FESTO numeration)
+        """
+
+        # sum chamber center and position of connection
+        output_4 = chamber[0].get_center() + self.get_IN_OUT_positions(connection=4)[0]
+        return output_4
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
     def get_input_5(self, chamber):
         """
         Get input number 5 of the valve (FESTO numeration)
@@ -339,32 +525,33 @@ class Pneumatic_valve_5_3(Pneumatic_valve_5_2):
     Pneumatic valve with triple chamber and 5 input/output for chamber
     """
 
+    chamber_names = ("left", "central", "right")
+
     def __init__(self, height=2, center_selection=0, left_actuator_choice="Coil", right_actuator_choice="Compression spring", 
-                 visible_connections=False, actuated=False, **kwargs):
+                 visible_connections=False, actuated=False, style=None, **kwargs):
         
         # initialization
         super().__init__(height=height, left_actuator_choice=left_actuator_choice, right_actuator_choice=right_actuator_choice, 
-                         visible_connections=visible_connections, actuated=actuated)
-        
-        h = self.h
+                         visible_connections=visible_connections, actuated=actuated, style=style)
         
-        # create the space between left and right chamber to draw valve 5/3 from valve 5/2
-        self.valve[0:2].shift(1/2*h*LEFT)
-        self.valve[2:4].shift(1/2*h*RIGHT)
-
-        # initialization central chamber
+        # initialization central chamber (between left and right chamber, see get_chamber_centers)
         if center_selection == 0:
             # center open
-            self.central_chamber = self.set_chamber(connections=((5,4), (1,1), (3,2)), visible_connections=visible_connections)
+            connections = ((5,4), (1,1), (3,2))
         elif center_selection == 1:
             # center closed
-            self.central_chamber = self.set_chamber(connections=((1,1), (2,2), (3,3), (4,4), (5,5)), visible_connections=visible_connections)
+            connections = ((1,1), (2,2), (3,3), (4,4), (5,5))
         else:
             # center pressure
-            self.central_chamber = self.set_chamber(connections=((3,3), (5,5), (4,2,1)), visible_connections=visible_connections)
+            connections = ((3,3), (5,5), (4,2,1))
+        self.central_chamber = self.set_chamber(connections=connections, visible_connections=visible_connections)
+        self.central_chamber.shift(self.get_chamber_centers(self.h)[1])
 
         self.valve.insert(2, self.central_chamber)
 
+        # the central chamber is aligned to the ports
+        self.chamber_connections.insert(1, connections)
+
 
 # ======================================================================================================================
 
@@ -374,27 +561,16 @@ class Pneumatic_valve_3_2(Pneumatic_valve_5_2):
     Pneumatic valve with double chamber and 3 input/output for chamber
     """
 
+    # postions and angles of each input/output of the pneumatic chamber, internal connections of the chambers
+    IN_OUT_positions = ((LEFT/4, DOWN/2), (LEFT/4, UP/2), (RIGHT/4, DOWN/2))
+    IN_OUT_angles = (0, 0, 0)
+    left_right_connections = (((1,2), (3,3)), ((1,1), (2,3)))
+
     def __init__(self, height=2, left_actuator_choice="Coil", right_actuator_choice="Compression spring", 
-                 visible_connections=False, actuated=False, **kwargs):
+                 visible_connections=False, actuated=False, style=None, **kwargs):
         # initialization
         super().__init__(height=height, left_actuator_choice=left_actuator_choice, right_actuator_choice=right_actuator_choice, 
-                         visible_connections=visible_connections, actuated=actuated)
-        
-        # postions and angles of each input/output of the pneumatic chamber
-        self.IN_OUT_positions = ((LEFT/4, DOWN/2), (LEFT/4, UP/2), (RIGHT/4, DOWN/2))
-        self.IN_OUT_angles = (0, 0, 0)
-
-        self.valve = VGroup()
-        
-        # initialization left valve chamber
-        self.left_chamber = self.set_chamber(connections=((1,2), (3,3)), visible_connections=visible_connections)
-        self.left_chamber.shift(self.w/2*LEFT)
-
-        # initialization right valve chamber
-        self.right_chamber = self.set_chamber(connections=((1,1), (2,3)), visible_connections=visible_connections)
-        self.right_chamber.shift(self.w/2*RIGHT)
-
-        self.valve.add(self.left_actuator.actuator, self.left_chamber, self.right_chamber, self.right_actuator.actuator)
+                         visible_connections=visible_connections, actuated=actuated, style=style)
 
 
 # ======================================================================================================================
@@ -3,6 +3,11 @@ import numpy as np
 from numpy import pi
 
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Labels import cached_text
+from Mlib.Graphics.Animations import fused_transform
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Instrumentation import instrumented
+from Mlib.Tools.Layout import Footprint, get_box, rectangle_corners, rotate_points
 
 
 """
@@ -21,17 +26,24 @@ class OneWay_flow_control_valve():
     One-way flow control valve
     """
 
-    arguments = {"valve_stroke_color": GREY_E,
-                 "valve_fill_color": GREY_A}
+    arguments = Style({"valve_stroke_color": GREY_E,
+                       "valve_fill_color": GREY_A})
 
-    def __init__(self, height=2, angle=0, flip=-1, visible_connections=False, **kwargs):
+    # width of the body (ratio of the height)
+    width_ratio = 1
+
+    def __init__(self, height=2, angle=0, flip=-1, visible_connections=False, style=None, **kwargs):
         """
         flip: 1 body is flipped -1 body is not flipped
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
         """
 
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization of valve geometry
         self.h = height
-        self.w = height
+        self.w = height*self.width_ratio
         self.r_nr = self.h/15 # radius of not return sphere
         self.angle = angle
         self.u = (np.cos(angle), np.sin(angle))
@@ -69,9 +81,10 @@ class OneWay_flow_control_valve():
         
         # internal simbol
         #1 input/output line
-        body.add(Line(start=w/4*LEFT + 1/2*h*UP, end=w/4*LEFT + 1/3*h*UP, color=BLACK, stroke_width=line_stroke)) # first vertical left line
+        ports = self.get_IN_OUT_positions(h)
+        body.add(Line(start=ports["2"], end=w/4*LEFT + 1/3*h*UP, color=BLACK, stroke_width=line_stroke)) # first vertical left line
         body.add(Line(start=w/4*LEFT + 1/3*h*UP, end=w/4*LEFT + 1/3*h*DOWN, color=BLACK, stroke_width=line_stroke)) # second vertical left line
-        body.add(Line(start=w/4*LEFT + 1/3*h*DOWN, end=w/4*LEFT + 1/2*h*DOWN, color=BLACK, stroke_width=line_stroke)) # third vertical left line
+        body.add(Line(start=w/4*LEFT + 1/3*h*DOWN, end=ports["1"], color=BLACK, stroke_width=line_stroke)) # third vertical left line
 
         #4 dots connections
         body.add(Dot(radius=h/40, color=BLACK).shift(h/4*LEFT + 1/3*h*UP))
@@ -97,8 +110,8 @@ class OneWay_flow_control_valve():
         
         if visible_connections:
             #15 tag numbers
-            body.add(Text("2", color=BLACK).scale(0.3*h).next_to(body[1].get_top(), direction=DL, buff=0.15).rotate(-angle))
-            body.add(Text("1", color=BLACK).scale(0.3*h).next_to(body[3].get_bottom(), direction=UL, buff=0.15).rotate(-angle))
+            body.add(cached_text("2", color=BLACK).scale(0.3*h).next_to(body[1].get_top(), direction=DL, buff=0.15).rotate(-angle))
+            body.add(cached_text("1", color=BLACK).scale(0.3*h).next_to(body[3].get_bottom(), direction=UL, buff=0.15).rotate(-angle))
 
         # rotate respect to the angle
         body.rotate(angle=angle)
@@ -120,6 +133,39 @@ class OneWay_flow_control_valve():
 
     # ----------------------------------------------------------------------------------------------------------------------        
 
+    @classmethod
+    def get_IN_OUT_positions(cls, height=2):
+        """
+        Positions of the connections 1 and 2 of the body before rotation and flip
+        """
+
+        w = height*cls.width_ratio
+
+        return {"1": w/4*LEFT + height/2*DOWN, "2": w/4*LEFT + height/2*UP}
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_footprint(cls, height=2, angle=0, flip=-1, **kwargs):
+        """
+        Footprint of the valve (see Mlib.Tools.Layout): ports "1" and "2" (get_input_1, get_output_2) and box of the body
+        """
+
+        # initialization
+        ports = cls.get_IN_OUT_positions(height)
+        corners = rotate_points(rectangle_corners(ORIGIN, height*cls.width_ratio, height), angle)
+        points = rotate_points(np.array([ports["1"], ports["2"]]), angle)
+
+        # flip: symmetry respect to the horizontal axis through the center (see __flip)
+        if flip == 1:
+            corners[:, 1] *= -1
+            points[:, 1] *= -1
+
+        return Footprint(ports={"1": points[0], "2": points[1]}, box=get_box(corners))
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @instrumented
     def active_choke(self, active=1, active_color=BLUE_E):
         """
         Actives the valve and shows the choke
@@ -133,14 +179,18 @@ class OneWay_flow_control_valve():
             color = BLACK
             line_stroke = 3
 
+        def edit(target):
+            target[0].set_color(color).set_stroke(width=line_stroke)
+            target[1].set_color(color)
+
         functions = []
-        functions.append(self.body[2].animate().set_color(color).set_stroke(width=line_stroke))
-        functions.append(self.body[13:16].animate().set_color(color))
+        functions.append(fused_transform([self.body[2], self.body[13:16]], edit))
 
         return functions
     
     # ----------------------------------------------------------------------------------------------------------------------        
 
+    @instrumented
     def active_not_return(self, active=1, open_color=BLUE_E, closed_color=BLUE_A):
         """
         Show the movement of the not return sphere
@@ -182,17 +232,17 @@ class OneWay_flow_control_valve():
         scale_factor = (5/7)**k # reduction factor to move the vertical line
         direction = k*(1-(scale_factor)**k)*l*(DOWN*u[0]+RIGHT*u[1])
 
-        # set horizontal and vertical input lines color
-        # move sphere
-        functions.append(self.body[10].animate().set_color(color).set_fill(opacity=opacity).shift(direction))
-        # rescale vertical
-        functions.append(self.body[11].animate().set_color(color).scale(scale_factor).shift(direction/2))
-
-        # color the not return line
-        functions.append(self.body[1].animate().set_color(color))
-        functions.append(self.body[3].animate().set_color(color))
-        functions.append(self.body[limit:10].animate().set_color(color))
-        functions.append(self.body[12].animate().set_color(color))
+        def edit(target):
+            # move sphere
+            target[0].set_color(color).set_fill(opacity=opacity).shift(direction)
+            # rescale vertical
+            target[1].set_color(color).scale(scale_factor).shift(direction/2)
+            # color the not return line
+            target[2:].set_color(color)
+
+        # set horizontal and vertical input lines color (all the parts in a single animation)
+        functions.append(fused_transform([self.body[10], self.body[11], self.body[1], self.body[3], 
+                                          self.body[limit:10], self.body[12]], edit))
         
         # update status
         self.not_return_status = active
@@ -228,17 +278,24 @@ class Piloted_check_valve():
     One-way flow control valve
     """
 
-    arguments = {"valve_stroke_color": GREY_E,
-                 "valve_fill_color": GREY_A}
+    arguments = Style({"valve_stroke_color": GREY_E,
+                       "valve_fill_color": GREY_A})
 
-    def __init__(self, height=2, angle=0, flip=-1, visible_connections=False, **kwargs):
+    # width of the body (ratio of the height)
+    width_ratio = 1/1.8
+
+    def __init__(self, height=2, angle=0, flip=-1, visible_connections=False, style=None, **kwargs):
         """
         flip: 1 body is flipped -1 body is not flipped
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
         """
 
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization of valve geometry
         self.h = height
-        self.w = height/1.8
+        self.w = height*self.width_ratio
         self.u = (np.cos(angle), np.sin(angle))
         self.r_nr = self.h/10 # radius of not return sphere
         self.angle = angle
@@ -284,14 +341,14 @@ class Piloted_check_valve():
         #5
         body.add(Line(start=body[-1].get_bottom(), end=h/2*DOWN, color=BLACK, stroke_width=line_stroke))
         #6 line of command
-        body.add(Line(start=ORIGIN, end=h/8*RIGHT, color=BLACK, stroke_width=line_stroke).shift(body[0].get_left()+0.25*h*UP))
+        body.add(Line(start=ORIGIN, end=h/8*RIGHT, color=BLACK, stroke_width=line_stroke).shift(self.get_pilot_position(h)))
         body.add(Line(start=body[-1].get_right(), end=body[2].get_center(), color=BLACK, stroke_width=line_stroke))
         
         if visible_connections:
             #8 tag numbers
-            body.add(Text("1", color=BLACK).scale(0.3*h).next_to(body[1].get_top(), direction=UL, buff=0.05*h).rotate(-angle))
-            body.add(Text("2", color=BLACK).scale(0.3*h).next_to(body[5].get_bottom(), direction=DL, buff=0.05*h).rotate(-angle))
-            body.add(Text("3", color=BLACK).scale(0.3*h).next_to(body[6].get_left(), direction=UL, buff=0.05*h).rotate(-angle))
+            body.add(cached_text("1", color=BLACK).scale(0.3*h).next_to(body[1].get_top(), direction=UL, buff=0.05*h).rotate(-angle))
+            body.add(cached_text("2", color=BLACK).scale(0.3*h).next_to(body[5].get_bottom(), direction=DL, buff=0.05*h).rotate(-angle))
+            body.add(cached_text("3", color=BLACK).scale(0.3*h).next_to(body[6].get_left(), direction=UL, buff=0.05*h).rotate(-angle))
 
         # rotate respect to the angle
         body.rotate(angle=angle)
@@ -313,6 +370,40 @@ class Piloted_check_valve():
 
     # ----------------------------------------------------------------------------------------------------------------------        
 
+    @classmethod
+    def get_pilot_position(cls, height=2):
+        """
+        Position of the pilot connection 3 of the body before rotation and flip
+        """
+
+        return height*cls.width_ratio/2*LEFT + height/4*UP
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @classmethod
+    def get_footprint(cls, height=2, angle=0, flip=-1, **kwargs):
+        """
+        Footprint of the valve (see Mlib.Tools.Layout): ports "1" (top of the body, get_input_1) and "3" (pilot, 
+        get_input_3) and box of the body
+        """
+
+        # initialization
+        corners = rotate_points(rectangle_corners(ORIGIN, height*cls.width_ratio, height), angle)
+        pilot = rotate_points(cls.get_pilot_position(height), angle)
+
+        # flip: symmetry respect to the vertical axis through the center (see __flip)
+        if flip == 1:
+            corners[:, 0] *= -1
+            pilot[0] *= -1
+
+        box = get_box(corners)
+        ports = {"1": np.array([box.mean(axis=0)[0], box[1, 1], 0]), "3": pilot}
+
+        return Footprint(ports=ports, box=box)
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @instrumented
     def active_not_return(self, active=1, open_color=BLUE_E, closed_color=BLUE_A):
         """
         Show the movement of the not return sphere
@@ -352,13 +443,16 @@ class Piloted_check_valve():
         scale_factor = (5/7)**k # reduction factor to move the vertical line
         direction = k*(1-(scale_factor)**k)*l*(DOWN*u[0]+RIGHT*u[1])
 
-        # set horizontal and vertical input lines color
-        # move sphere
-        functions.append(self.body[4].animate().set_color(color).set_fill(opacity=opacity).shift(2*direction))
-        # rescale vertical
-        functions.append(self.body[5].animate().set_color(color).scale(scale_factor).shift(direction))
-        # color vertical line
-        functions.append(self.body[1].animate().set_color(color))
+        def edit(target):
+            # move sphere
+            target[0].set_color(color).set_fill(opacity=opacity).shift(2*direction)
+            # rescale vertical
+            target[1].set_color(color).scale(scale_factor).shift(direction)
+            # color vertical line
+            target[2].set_color(color)
+
+        # set horizontal and vertical input lines color (all the parts in a single animation)
+        functions.append(fused_transform([self.body[4], self.body[5], self.body[1]], edit))
        
         # update status
         self.not_return_status = active
@@ -388,20 +482,44 @@ class Piloted_check_valve():
     
 # =====================================================================================================================
 
+def get_logic_valve_footprint(height=2, connection_length=1/6):
+    """
+    Footprint of AND_valve and OR_valve (see Mlib.Tools.Layout): ports "1" (left), "2" (top), "3" (right) at the end 
+    of the connections and box of body and connections
+    connection_length: length of the connections (ratio of the width of the body)
+    """
+
+    # initialization
+    h = height
+    w = 2*height
+    c = connection_length*w
+    ports = {"1": (w/2 + c)*LEFT, "2": (h/2 + c)*UP, "3": (w/2 + c)*RIGHT}
+
+    return Footprint(ports=ports, box=get_box([*ports.values(), w/2*LEFT + h/2*DOWN]))
+
+# =====================================================================================================================
+
 class AND_valve():
     """
     Logic valve OR function
     """
 
-    arguments = {"valve_stroke_color": GREY_E,
-                 "valve_fill_color": GREY_A}
+    arguments = Style({"valve_stroke_color": GREY_E,
+                       "valve_fill_color": GREY_A})
+
+    # length of the connections (ratio of the width of the body)
+    connection_length = 1/6
 
-    def __init__(self, height=2, visible_connections=False, actuated=False, position=0, **kwargs):
+    def __init__(self, height=2, visible_connections=False, actuated=False, position=0, style=None, **kwargs):
         """
         visible_connections: show or not tags of connections
         stroke: is the percentage of the total stroke (positive right, negative left)
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
         """
 
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization of valve geometry
         self.h = height
         self.w = height
@@ -450,21 +568,33 @@ class AND_valve():
         body.add(Line(start=2/5*h*DOWN, end=2/5*h*UP, stroke_width=stroke_width, color=BLACK).shift(body[-2].get_right()))
 
         #8 connections
-        body.add(Line(start=ORIGIN, end=w/6*LEFT, stroke_width=stroke_width, color=BLACK).shift(body[0].get_left()))
-        body.add(Line(start=ORIGIN, end=w/6*UP, stroke_width=stroke_width, color=BLACK).shift(body[0].get_top()))
-        body.add(Line(start=ORIGIN, end=w/6*RIGHT, stroke_width=stroke_width, color=BLACK).shift(body[0].get_right()))
+        c = self.connection_length*w
+        body.add(Line(start=ORIGIN, end=c*LEFT, stroke_width=stroke_width, color=BLACK).shift(body[0].get_left()))
+        body.add(Line(start=ORIGIN, end=c*UP, stroke_width=stroke_width, color=BLACK).shift(body[0].get_top()))
+        body.add(Line(start=ORIGIN, end=c*RIGHT, stroke_width=stroke_width, color=BLACK).shift(body[0].get_right()))
         
         if visible_connections:
             #11 tag numbers
-            body.add(Text("1", color=BLACK).scale(0.3*h).next_to(body[8].get_top(), direction=UP, buff=h/20))
-            body.add(Text("2", color=BLACK).scale(0.3*h).next_to(body[9].get_right(), direction=RIGHT, buff=h/20))
-            body.add(Text("3", color=BLACK).scale(0.3*h).next_to(body[10].get_top(), direction=UP, buff=h/20))
+            body.add(cached_text("1", color=BLACK).scale(0.3*h).next_to(body[8].get_top(), direction=UP, buff=h/20))
+            body.add(cached_text("2", color=BLACK).scale(0.3*h).next_to(body[9].get_right(), direction=RIGHT, buff=h/20))
+            body.add(cached_text("3", color=BLACK).scale(0.3*h).next_to(body[10].get_top(), direction=UP, buff=h/20))
             
 
         return body
     
     # ----------------------------------------------------------------------------------------------------------------------        
 
+    @classmethod
+    def get_footprint(cls, height=2, **kwargs):
+        """
+        Footprint of the valve (see get_logic_valve_footprint)
+        """
+
+        return get_logic_valve_footprint(height, cls.connection_length)
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @instrumented
     def switch_valve(self, position=0, animated=True, run_time=1):
         """
         Switch internal piston
@@ -490,16 +620,23 @@ class OR_valve():
     Logic valve OR function
     """
 
-    arguments = {"valve_stroke_color": GREY_E,
-                 "valve_fill_color": GREY_A}
+    arguments = Style({"valve_stroke_color": GREY_E,
+                       "valve_fill_color": GREY_A})
+
+    # length of the connections (ratio of the width of the body)
+    connection_length = 1/6
 
-    def __init__(self, height=2, visible_connections=False, actuated=False, position=0, **kwargs):
+    def __init__(self, height=2, visible_connections=False, actuated=False, position=0, style=None, **kwargs):
         """
         visible_connections: show or not tags of connections
         animated: a flag that defines whether is in animation mode or in static mode
         actuated: a flag that defines whether the position of sphere must change
+        style: dictionary or Style with the parameters of arguments to change (see Mlib.Graphics.Styles)
         """
 
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization of valve geometry
         self.h = height
         self.w = height
@@ -553,20 +690,32 @@ class OR_valve():
         body.add(Line(start=body[9].get_right(), end=body[6].get_left(), stroke_width=stroke_width, color=BLACK))
         
         #12 connections
-        body.add(Line(start=ORIGIN, end=w/6*LEFT, stroke_width=stroke_width, color=BLACK).shift(body[0].get_left()))
-        body.add(Line(start=ORIGIN, end=w/6*UP, stroke_width=stroke_width, color=BLACK).shift(body[0].get_top()))
-        body.add(Line(start=ORIGIN, end=w/6*RIGHT, stroke_width=stroke_width, color=BLACK).shift(body[0].get_right()))
+        c = self.connection_length*w
+        body.add(Line(start=ORIGIN, end=c*LEFT, stroke_width=stroke_width, color=BLACK).shift(body[0].get_left()))
+        body.add(Line(start=ORIGIN, end=c*UP, stroke_width=stroke_width, color=BLACK).shift(body[0].get_top()))
+        body.add(Line(start=ORIGIN, end=c*RIGHT, stroke_width=stroke_width, color=BLACK).shift(body[0].get_right()))
         
         if visible_connections:
             #14 tag numbers
-            body.add(Text("1", color=BLACK).scale(0.3*h).next_to(body[12].get_top(), direction=UP, buff=h/20))
-            body.add(Text("2", color=BLACK).scale(0.3*h).next_to(body[13].get_right(), direction=RIGHT, buff=h/20))
-            body.add(Text("3", color=BLACK).scale(0.3*h).next_to(body[14].get_top(), direction=UP, buff=h/20))
+            body.add(cached_text("1", color=BLACK).scale(0.3*h).next_to(body[12].get_top(), direction=UP, buff=h/20))
+            body.add(cached_text("2", color=BLACK).scale(0.3*h).next_to(body[13].get_right(), direction=RIGHT, buff=h/20))
+            body.add(cached_text("3", color=BLACK).scale(0.3*h).next_to(body[14].get_top(), direction=UP, buff=h/20))
 
         return body
     
     # ----------------------------------------------------------------------------------------------------------------------        
 
+    @classmethod
+    def get_footprint(cls, height=2, **kwargs):
+        """
+        Footprint of the valve (see get_logic_valve_footprint)
+        """
+
+        return get_logic_valve_footprint(height, cls.connection_length)
+
+    # ----------------------------------------------------------------------------------------------------------------------        
+
+    @instrumented
     def switch_valve(self, position=0, animated=True, run_time=1):
         """
         Switch internal sphere
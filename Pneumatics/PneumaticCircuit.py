@@ -0,0 +1,319 @@
+from manim import *
+import numpy as np
+from numpy import pi
+from collections import defaultdict, deque
+from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Animations import fused_transform
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Instrumentation import instrumented
+
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Graph model of a pneumatic circuit: the state (pressure/exhaust) of pipes and components is computed
+from the position of the directional valves and shown with a single recolor animation
+
+Example:
+    circuit = Pneumatic_circuit()
+    circuit.add_valve(valve, "V1")
+    circuit.add_supply("V1.1")
+    circuit.add_exhaust("V1.3", "V1.5")
+    circuit.add_pipe(pipe_A, "V1.4", "C1.A")
+    circuit.add_pipe(pipe_B, "V1.2", "C1.B")
+    circuit.add_marker(input_air3, "V1.3")
+    self.play(circuit.solve())
+    self.play(*circuit.slide_valve(valve, motion_direction=RIGHT))
+"""
+
+# ======================================================================================================================
+
+class Pneumatic_circuit():
+    """
+    Circuit of pneumatic components: nodes are ports/fittings (any hashable name), edges are pipes,
+    static connections (flow control valves, fittings, etc etc...) and the internal connections of the
+    directional valves
+    """
+
+    arguments = Style({"pressure_color": BLUE_A,
+                       "exhaust_color": BLUE_E,
+                       "idle_color": BLUE_A})
+
+    def __init__(self, style=None, **kwargs):
+
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
+        # initialization
+        self.colors = {"pressure": self.arguments["pressure_color"],
+                       "exhaust": self.arguments["exhaust_color"],
+                       "idle": self.arguments["idle_color"]}
+        self.edges = defaultdict(lambda: defaultdict(int))  # node: {neighbor: number of edges}
+        self.supplies = set()
+        self.exhausts = set()
+        self.states = {}
+        self.valves = {}                                     # valve: (ports nodes, active connections)
+        self.elements = defaultdict(list)                    # node: elements to recolor
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_node(self, *nodes):
+        """
+        Add nodes to the circuit (nodes are added automatically by the other methods)
+        """
+
+        for node in nodes:
+            self.edges[node]
+            self.states.setdefault(node, "idle")
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def connect(self, *nodes):
+        """
+        Static connection between all the nodes (fittings, flow control valves, cylinder chambers, etc etc...)
+        """
+
+        self.add_node(*nodes)
+        for node_a, node_b in zip(nodes[:-1], nodes[1:]):
+            self.edges[node_a][node_b] += 1
+            self.edges[node_b][node_a] += 1
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def disconnect(self, *nodes):
+        """
+        Remove a connection created by connect
+        """
+
+        for node_a, node_b in zip(nodes[:-1], nodes[1:]):
+            for x, y in ((node_a, node_b), (node_b, node_a)):
+                self.edges[x][y] -= 1
+                if self.edges[x][y] <= 0:
+                    del self.edges[x][y]
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_supply(self, *nodes):
+        """
+        Nodes connected to the compressed air supply
+        """
+
+        self.add_node(*nodes)
+        self.supplies.update(nodes)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_exhaust(self, *nodes):
+        """
+        Nodes connected to the exhaust
+        """
+
+        self.add_node(*nodes)
+        self.exhausts.update(nodes)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_pipe(self, pipe, *nodes, **kwargs):
+        """
+        Pipe between nodes, colored with the state of the nodes
+
+        pipe: Pipe_connection or mobject
+        nodes: nodes connected by the pipe
+        """
+
+        mobject = getattr(pipe, "pipe_connection", pipe)
+        self.connect(*nodes)
+        self.add_element(mobject, nodes[0])
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_element(self, mobject, node, rotate=False):
+        """
+        Mobject colored with the state of a node
+
+        mobject: mobject to recolor
+        node: node of the mobject
+        rotate: if True the mobject is rotated of 180° when the exhaust starts or stops (supply/exhaust triangles)
+        """
+
+        self.add_node(node)
+        self.elements[node].append({"mobject": mobject, "rotate": rotate, "state": None})
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_marker(self, mobject, node):
+        """
+        Supply/exhaust triangle of a port (the triangle points outside while the port is exhausting)
+        """
+
+        self.add_element(mobject, node, rotate=True)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add_valve(self, valve, name):
+        """
+        Directional valve: the ports are the nodes "name.1", "name.2", etc etc... (FESTO numbers)
+        and the internal connections follow the position of the valve
+
+        valve: directional valve (Pneumatic_valve_5_2, Pneumatic_valve_5_3, Pneumatic_valve_3_2)
+        name: name of the valve
+        """
+
+        ports = {i: f"{name}.{i}" for i in range(1, len(valve.IN_OUT_positions) + 1)}
+        self.add_node(*ports.values())
+        self.valves[valve] = (ports, ())
+        self.set_valve_connections(valve)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def set_valve_connections(self, valve):
+        """
+        Replace the internal connections of a valve with the ones of its current position
+        """
+
+        ports, connections = self.valves[valve]
+        for connection in connections:
+            self.disconnect(*[ports[i] for i in connection])
+
+        # blocked ports ((x, x) connections) are not edges
+        connections = tuple(connection for connection in valve.get_connections() if len(set(connection)) > 1)
+        for connection in connections:
+            self.connect(*[ports[i] for i in connection])
+        self.valves[valve] = (ports, connections)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_group(self, node):
+        """
+        Return the nodes connected to a node (breadth first search)
+        """
+
+        group = {node}
+        queue = deque([node])
+        while queue:
+            for neighbor in self.edges[queue.popleft()]:
+                if neighbor not in group:
+                    group.add(neighbor)
+                    queue.append(neighbor)
+
+        return group
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def propagate(self, nodes):
+        """
+        Update the state of the groups of nodes connected to the given nodes
+        return: nodes whose state changed
+
+        nodes: starting nodes of the update
+        """
+
+        changed = []
+        visited = set()
+        for node in nodes:
+            if node in visited:
+                continue
+            group = self.get_group(node)
+            visited |= group
+
+            # supply wins, the exhaust needs something to discharge (an exhaust port alone is blocked)
+            if group & self.supplies:
+                state = "pressure"
+            elif group & self.exhausts and group - self.exhausts:
+                state = "exhaust"
+            else:
+                state = "idle"
+
+            for member in group:
+                if self.states.get(member) != state:
+                    self.states[member] = state
+                    changed.append(member)
+
+        return changed
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def recolor(self, nodes, run_time=1):
+        """
+        Single animation that recolors (and rotates the markers) of the elements of the nodes
+
+        nodes: nodes to check
+        """
+
+        # initialization
+        mobjects = []
+        edits = {} # id of the mobject: (color, rotate), one entry for a mobject under many nodes
+        for node in nodes:
+            state = self.states[node]
+            for element in self.elements[node]:
+                if element["state"] == state:
+                    continue
+                # markers turn when the port starts or stops exhausting
+                rotate = element["rotate"] and element["state"] is not None and \
+                         (element["state"] == "exhaust") != (state == "exhaust")
+                element["state"] = state
+                mobject = element["mobject"]
+                if id(mobject) not in edits:
+                    mobjects.append(mobject)
+                    edits[id(mobject)] = (self.colors[state], rotate)
+                else:
+                    # same result of the edits applied in order: last color, two rotations of pi cancel out
+                    edits[id(mobject)] = (self.colors[state], edits[id(mobject)][1] != rotate)
+
+        if len(mobjects) == 0:
+            return Wait(run_time=run_time)
+
+        def edit(target):
+            for part, (color, rotate) in zip(target, [edits[id(mobject)] for mobject in mobjects]):
+                part.set_color(color)
+                if rotate:
+                    part.rotate(pi)
+
+        # one target for all the elements
+        return fused_transform(mobjects, edit, run_time=run_time)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def solve(self, run_time=1):
+        """
+        Compute the state of the whole circuit and return the recolor animation
+        """
+
+        self.propagate(list(self.edges))
+
+        return self.recolor(list(self.edges), run_time=run_time)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def update_valve(self, valve, run_time=1):
+        """
+        Update the circuit after the position change of a valve (only the groups of the valve ports are solved)
+        and return the recolor animation
+        """
+
+        ports, _ = self.valves[valve]
+        self.set_valve_connections(valve)
+        changed = self.propagate(ports.values())
+
+        return self.recolor(changed, run_time=run_time)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @instrumented
+    def slide_valve(self, valve, motion_direction=RIGHT, run_time=1):
+        """
+        Slide the valve (see Pneumatic_valve_5_2.slide_valve) and recolor the circuit
+        """
+
+        functions = []
+        functions.extend(valve.slide_valve(motion_direction=motion_direction, run_time=run_time))
+        functions.append(self.update_valve(valve, run_time=run_time))
+
+        return functions
+
+# ======================================================================================================================
@@ -1,6 +1,9 @@
 from manim import *
 import numpy as np
 from Mlib.Graphics.Colors import *
+from Mlib.Tools.Instrumentation import track_updater, instrumented
+from Mlib.Graphics.Styles import Style, get_style
+from Mlib.Tools.Layout import Footprint, get_box, rectangle_corners, rotate_points
 
 """
 Author: Ivan Archetti   
@@ -17,19 +20,25 @@ class Pneumatic_cylinder_double_acting():
     Pneumatic cylinder double acting
     """
     
-    arguments = {}
+    arguments = Style({"analytic_air_area": True})
     
-    def __init__(self, height=2, width=4, angle=0, **kwargs):
+    def __init__(self, height=2, width=4, angle=0, style=None, **kwargs):
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization of cylinder dimensions
         self.h = height
         self.w = width
         self.angle = angle
-        self.r = self.h/20
-        self.stroke = self.w-2*self.r # "usefull" stroke
-        self.h_offset = self.h/50
-        self.w_offset = self.w/12
-        self.w_fitting = self.w/40
-        self.h_fitting = self.h/10
+        dimensions = self.get_dimensions(height=height, width=width)
+        self.r = dimensions["r"]
+        self.stroke = dimensions["stroke"] # "usefull" stroke
+        self.h_offset = dimensions["h_offset"]
+        self.w_offset = dimensions["w_offset"]
+        self.w_fitting = dimensions["w_fitting"]
+        self.h_fitting = dimensions["h_fitting"]
+        # centers of the parts before the rotation (see get_parts)
+        self.parts = self.get_parts(height=height, width=width)
         self.u = np.array([np.cos(self.angle), np.sin(self.angle), 0.0]) # unit vector of cylinder axis 
         
         self.opened_state = -1 # if self.opened_state is -1 the cylinder is closed
@@ -54,6 +63,80 @@ class Pneumatic_cylinder_double_acting():
         
         self.cylinder.add(self.air_area)
 
+# ----------------------------------------------------------------------------------------------------------------------    
+
+    @classmethod
+    def get_dimensions(cls, height=2, width=4):
+        """
+        Dimensions of the cylinder: radius of the corners, stroke, offsets and size of the fittings
+        """
+
+        r = height/20
+
+        return {"r": r, "stroke": width - 2*r, "h_offset": height/50, "w_offset": width/12, 
+                "w_fitting": width/40, "h_fitting": height/10}
+
+# ----------------------------------------------------------------------------------------------------------------------    
+
+    @classmethod
+    def get_parts(cls, height=2, width=4):
+        """
+        Center, width and height of barrel, head, stem and fittings before the rotation (cylinder closed)
+        """
+
+        # initialization
+        h = height
+        w = width
+        d = cls.get_dimensions(height=height, width=width)
+
+        # head and stem next to it
+        head = (d["stroke"]/2 - w/8)*LEFT
+        stem = head + (w/16 + 0.85*w/2)*RIGHT
+        # the fittings are next to the upper corners of the barrel, moved of w_offset inside and of h_offset on every axis
+        x = w/2 + d["w_fitting"]/2 - d["w_offset"]
+        y = h/2 + d["h_fitting"]/2
+
+        return {"barrel": (ORIGIN, w, h),
+                "head": (head, w/8, 0.99*h),
+                "stem": (stem, 0.85*w, h/5),
+                "fitting_1": (x*LEFT + y*UP + d["h_offset"], d["w_fitting"], d["h_fitting"]),
+                "fitting_2": (x*RIGHT + y*UP + d["h_offset"], d["w_fitting"], d["h_fitting"])}
+
+# ----------------------------------------------------------------------------------------------------------------------    
+
+    @classmethod
+    def get_footprint(cls, height=2, width=4, angle=0, extended=False, fittings_down=False, **kwargs):
+        """
+        Footprint of the cylinder (see Mlib.Tools.Layout): ports "fitting_1" and "fitting_2" (fittings[i].get_right())
+        and box of barrel, stem and fittings
+
+        extended: stem out of the barrel (after the first actuation)
+        fittings_down: fittings moved with switch_updown_fitting_position
+        """
+
+        # initialization
+        d = cls.get_dimensions(height=height, width=width)
+        u = np.array([np.cos(angle), np.sin(angle), 0])
+        parts = {name: rectangle_corners(center, w, h) for name, (center, w, h) in cls.get_parts(height, width).items()}
+
+        # rotation respect to the center of the cylinder (see __init__)
+        center = get_box(np.concatenate(list(parts.values()))).mean(axis=0)
+        parts = {name: rotate_points(points, angle, about_point=center) for name, points in parts.items()}
+
+        if extended:
+            for name in ("head", "stem"):
+                parts[name] = parts[name] + d["stroke"]*u
+        if fittings_down:
+            for name in ("fitting_1", "fitting_2"):
+                parts[name] = parts[name] + np.array([u[1], -u[0], 0])*(height + d["h_fitting"] + 2*d["h_offset"])
+
+        ports = {}
+        for name in ("fitting_1", "fitting_2"):
+            box = get_box(parts[name])
+            ports[name] = np.array([box[1, 0], box.mean(axis=0)[1], box.mean(axis=0)[2]])
+
+        return Footprint(ports=ports, box=get_box(np.concatenate(list(parts.values()))))
+
 # ----------------------------------------------------------------------------------------------------------------------    
 
     def set_barrel(self):
@@ -85,10 +168,12 @@ class Pneumatic_cylinder_double_acting():
 
         rod_stem = VGroup()
         # head cylinder stem
-        rod_stem.add(RoundedRectangle(height=0.99*h, width=w/8, fill_opacity=1, corner_radius=r/2, 
-                                      stroke_width=0, color=GREY_C).shift((stroke/2 - w/8)*LEFT))
+        center, width, height = self.parts["head"]
+        rod_stem.add(RoundedRectangle(height=height, width=width, fill_opacity=1, corner_radius=r/2, 
+                                      stroke_width=0, color=GREY_C).shift(center))
         # cylinder stem
-        rod_stem.add(RoundedRectangle(height=h/5, width=w*0.85, corner_radius=r/2, fill_opacity=1, color=GREY).next_to(rod_stem[-1], direction=RIGHT, buff=0))
+        center, width, height = self.parts["stem"]
+        rod_stem.add(RoundedRectangle(height=height, width=width, corner_radius=r/2, fill_opacity=1, color=GREY).shift(center))
         
         return rod_stem
 
@@ -99,19 +184,12 @@ class Pneumatic_cylinder_double_acting():
         Create fittings of the cylinder (where the air flows in and out)
         """
 
-        #initialization
-        h = self.h_fitting
-        w = self.w_fitting
-        h_offset = self.h_offset
-        w_offset = self.w_offset
-
         fittings = VGroup()
-        # fitting 1
-        fittings.add(Rectangle(height=h, width=w, fill_opacity=1, stroke_width=0, color=GREY_B).next_to(self.barrel[0], 
-                               direction=UL, buff=0).shift(w_offset*RIGHT + h_offset))
-        # fitting 2
-        fittings.add(Rectangle(height=h, width=w, fill_opacity=1,  stroke_width=0, color=GREY_B).next_to(self.barrel[0], 
-                               direction=UR,buff=0).shift(w_offset*LEFT +h_offset))
+        # fitting 1 and fitting 2 (see get_parts)
+        for name in ("fitting_1", "fitting_2"):
+            center, w, h = self.parts[name]
+            fittings.add(Rectangle(height=h, width=w, fill_opacity=1, stroke_width=0, color=GREY_B).shift(center))
+
         return fittings
 
 # ----------------------------------------------------------------------------------------------------------------------    
@@ -121,11 +199,17 @@ class Pneumatic_cylinder_double_acting():
         Set the blue areas that simulate air flow in the cylinder
         """
 
+        # select how the areas are computed (analytic polygon or boolean intersection)
+        if self.arguments["analytic_air_area"]:
+            make_area = self.__make_analytic_area
+        else:
+            make_area = self.__make_area
+
         air_area = VGroup()
         # left volume
-        air_area.add(self.__make_area(LEFT).set_z_index(self.rod_stem.get_z() - 1))
+        air_area.add(make_area(LEFT).set_z_index(self.rod_stem.get_z() - 1))
         # right volume
-        air_area.add(self.__make_area(RIGHT).set_z_index(self.rod_stem.get_z() - 1))
+        air_area.add(make_area(RIGHT).set_z_index(self.rod_stem.get_z() - 1))
 
         return air_area
 
@@ -180,10 +264,75 @@ class Pneumatic_cylinder_double_acting():
 
             return area
 
-        return always_redraw(updater)
+        return always_redraw(track_updater(updater, name="Pneumatic_cylinder_double_acting.air_area"))
+
+# ----------------------------------------------------------------------------------------------------------------------    
+    
+    def __make_analytic_area(self, side):
+        """
+        Procedure to create the dynamic blue area that simulate air flow in the cylinder
+        The area is a single persistent polygon, its points are computed from the piston position 
+        along the cylinder axis and updated in place at every frame (no boolean operations)
+        side: where the area must be create (right or left side)
+        """
+
+        # initialization
+        w = float(self.w)
+        h = float(self.h)
+        r = float(self.r)
+        piston_thick = float(self.w/8)
+        n_fillet = 8 # number of samples for each fillet of the barrel
+
+        # abscissas of the barrel fillets along the axis (straight parts need only their ends)
+        x_fillets = np.concatenate([np.linspace(-w/2, -w/2 + r, n_fillet), np.linspace(w/2 - r, w/2, n_fillet)])
+
+        area = VMobject(stroke_opacity=0)
+
+        def updater(area):
+            body_cyl_center = self.barrel[0].get_center()
+
+            # rotated axis cylinder and its normal
+            u_rot = rotate_vector(RIGHT, self.angle)
+            v_rot = rotate_vector(UP, self.angle)
+
+            # cylinder axis rotated
+            piston_center = self.rod_stem[0].get_center()
+            s = float(np.dot(piston_center - body_cyl_center, u_rot))  # coord. lungo asse
+
+            # determination of contact point
+            sgn = side[0] 
+            s_face = sgn * s + piston_thick / 2
+            width_axis = max(float(np.clip(w/2 - s_face, 0.0, w)), 1e-6)
+
+            # limits of the area along the axis
+            x_start, x_end = sorted((sgn*(w/2 - width_axis), sgn*w/2))
+            x = x_fillets[(x_fillets > x_start) & (x_fillets < x_end)]
+            x = np.concatenate([[x_start], x, [x_end]])
+
+            # upper profile of the barrel (the lower profile is symmetric)
+            dx = np.clip(np.abs(x) - (w/2 - r), 0.0, r)
+            y = h/2 - r + np.sqrt(r**2 - dx**2)
+
+            # closed outline: upper profile forward and lower profile backward
+            x_outline = np.concatenate([x, x[::-1], x[:1]])
+            y_outline = np.concatenate([y, -y[::-1], y[:1]])
+            points = body_cyl_center + np.outer(x_outline, u_rot) + np.outer(y_outline, v_rot)
+            area.set_points_as_corners(points)
+
+            # color interpolation
+            alpha = float(np.clip(width_axis / w, 0.0, 1.0))
+            color = interpolate_color(BLUE_E, BLUE_A, alpha)
+            area.set_fill(color, opacity=0.6).set_stroke(opacity=0)
+
+        # initial shape and then update at every frame
+        updater(area)
+        area.add_updater(track_updater(updater, name="Pneumatic_cylinder_double_acting.air_area"))
+
+        return area
 
 # ----------------------------------------------------------------------------------------------------------------------    
     
+    @instrumented
     def open_close_cylinder(self, perc_stroke=0.75, run_time=2):
         """
         Actuation of linear movement of the cylinder
@@ -233,7 +382,19 @@ class Pneumatic_cylinder_single_acting():
     Pneumatic cylinder single acting
     """
     
-    arguments = {}
+    arguments = Style()
     
     def __init__(self, **kwargs):
-        pass
\ No newline at end of file
+
+        # not drawn yet: empty group
+        self.cylinder = VGroup()
+
+# ----------------------------------------------------------------------------------------------------------------------    
+
+    @classmethod
+    def get_footprint(cls, **kwargs):
+        """
+        Footprint of the cylinder (see Mlib.Tools.Layout): the cylinder is not drawn yet, no ports and empty box
+        """
+
+        return Footprint(ports={}, box=np.zeros((2, 3)))
@@ -1,8 +1,9 @@
 from manim import *
 import numpy as np
 from numpy import pi
-from Mlib.Mechanics.Spring import Compression_Spring as spr
 from Mlib.Graphics.Colors import *
+from Mlib.Graphics.Animations import fused_transform
+from Mlib.Graphics.Styles import Style, get_style
 
 
 """
@@ -15,15 +16,34 @@ Collection of python classes about valve actuators
 
 # ======================================================================================================================
 
+def get_side_box(x_range, y_range, position_side=LEFT):
+    """
+    Bounding box (bottom left, top right) of an actuator respect to its position
+    x_range: extent outward from the valve
+    y_range: extent upward from the bottom of the chambers
+    """
+
+    x = np.asarray(x_range, dtype=float)*position_side[0]
+
+    return np.array([[x.min(), y_range[0], 0], [x.max(), y_range[1], 0]])
+
+# ======================================================================================================================
+
 class electric_actuator():
     """
     Coil actuator for directional valves
     """
 
-    arguments = {"actuator_stroke_color": GREY_E,
-                 "actuator_fill_color": GREY_A}
-    
-    def __init__(self, position=ORIGIN, height=2, position_side=LEFT, actuator_type=0, actuated=False, **kwargs):
+    arguments = Style({"actuator_stroke_color": GREY_E,
+                       "actuator_fill_color": GREY_A})
+
+    # height of the coil (ratio of the height)
+    coil_height = 1/2
+
+    def __init__(self, position=ORIGIN, height=2, position_side=LEFT, actuator_type=0, actuated=False, style=None, **kwargs):
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization
         self.h = height
         self.w = height
@@ -53,14 +73,24 @@ class electric_actuator():
         stroke_width = 2*h
 
         coil = VGroup()
-        coil.add(Rectangle(width=w, height=h/2, color=self.actuator_stroke_color, stroke_width=stroke_width,
-                               fill_color=self.actuator_fill_color, fill_opacity=0.3).shift(w/2*position_side + h/4*UP))
+        coil.add(Rectangle(width=w, height=self.coil_height*h, color=self.actuator_stroke_color, stroke_width=stroke_width,
+                               fill_color=self.actuator_fill_color, fill_opacity=0.3).shift(w/2*position_side + self.coil_height*h/2*UP))
 
-        coil.add(Line(start=coil.get_top()+1/8*w*(-position_side), end=coil.get_bottom()+1/8*w*position_side, 
+        coil.add(Line(start=coil.get_top()+1/8*w*(-position_side), end=coil.get_bottom()+1/8*w*position_side,
                           stroke_width=stroke_width, color=BLACK))
-        
+
         return coil
 
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def get_envelope(cls, height=2, position_side=LEFT, actuator_type=0):
+        """
+        Bounding box of the actuator respect to its position (see Mlib.Tools.Layout)
+        """
+
+        return get_side_box((0, height), (0, cls.coil_height*height), position_side)
+
     # ----------------------------------------------------------------------------------------------------------------------        
 
     def set_coil_actuator(self, position_side=LEFT, actuator_type=0, animated=True):
@@ -103,10 +133,19 @@ class manual_actuator():
     Manual actuator for directional valves
     """
 
-    arguments = {"actuator_stroke_color": GREY_E,
-                 "actuator_fill_color": GREY_A}
-    
-    def __init__(self, position=ORIGIN, height=2, position_side=LEFT, actuator_type=0, actuated=False, **kwargs):
+    arguments = Style({"actuator_stroke_color": GREY_E,
+                       "actuator_fill_color": GREY_A})
+
+    # manual lever: position, length and height of the lever, radius of the knob (ratios of the height) and angle
+    lever_geometry = {"a": 4/7, "b": 4/5, "c": 1/10, "r": 1/8, "angle": pi/12}
+    # push button: center and half height of the button (ratios of the height)
+    button_center = 1/4
+    button_height = 1/4
+
+    def __init__(self, position=ORIGIN, height=2, position_side=LEFT, actuator_type=0, actuated=False, style=None, **kwargs):
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization
         self.h = height
         self.w = height
@@ -135,11 +174,11 @@ class manual_actuator():
         w = self.w
         stroke_width = 2*h
 
-        a = 4/7
-        b = 4/5
-        c = 1/10
-        r = h/8
-        angle = pi/12
+        a = self.lever_geometry["a"]
+        b = self.lever_geometry["b"]
+        c = self.lever_geometry["c"]
+        r = self.lever_geometry["r"]*h
+        angle = self.lever_geometry["angle"]
         tg = np.tan(angle)
         sin = np.sin(angle)
         cos = np.cos(angle)
@@ -185,9 +224,9 @@ class manual_actuator():
 
         # main part
         push_button.add(Rectangle(width=w, height=h/4, color=self.actuator_stroke_color, stroke_width=stroke_width, 
-                                fill_color=self.actuator_fill_color, fill_opacity=0.3).shift(w/2*position_side + h/4*UP))
+                                fill_color=self.actuator_fill_color, fill_opacity=0.3).shift(w/2*position_side + self.button_center*h*UP))
         # lines
-        push_button.add(Line(start=1/4*h*UP, end=1/4*h*DOWN, color=self.actuator_stroke_color, stroke_width=stroke_width).shift(w/2*position_side + push_button[0].get_center()))
+        push_button.add(Line(start=self.button_height*h*UP, end=self.button_height*h*DOWN, color=self.actuator_stroke_color, stroke_width=stroke_width).shift(w/2*position_side + push_button[0].get_center()))
         push_button.add(Line(start=ORIGIN, end=-w/4*position_side, color=self.actuator_stroke_color, stroke_width=stroke_width).shift(push_button[-1].get_top()))
         push_button.add(Line(start=ORIGIN, end=-w/4*position_side, color=self.actuator_stroke_color, stroke_width=stroke_width).shift(push_button[-2].get_bottom()))
 
@@ -195,6 +234,28 @@ class manual_actuator():
 
     # ----------------------------------------------------------------------------------------------------------------------
 
+    @classmethod
+    def get_envelope(cls, height=2, position_side=LEFT, actuator_type=0):
+        """
+        Bounding box of the actuator respect to its position (see Mlib.Tools.Layout)
+        """
+
+        # initialization
+        h = height
+
+        if actuator_type == 0: # lever hand: body, lever and knob
+            a, b, c, r, angle = (cls.lever_geometry[key] for key in ("a", "b", "c", "r", "angle"))
+            x_out = max(a + (1/4 + c)*np.tan(angle), a + np.sin(angle)*(b + r) + r)
+            y_high = max(c + 1/4, np.cos(angle)*(b + r) + r)
+
+            return get_side_box((0, x_out*h), (0, y_high*h), position_side)
+
+        # push button
+        return get_side_box((0, h), ((cls.button_center - cls.button_height)*h, (cls.button_center + cls.button_height)*h),
+                            position_side)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
     def set_manual_actuation(self, position_side=LEFT, actuator_type=0):
         """
         Drawing the manual actuation for the valve
@@ -244,6 +305,31 @@ class manual_actuator():
         animated: a flag that define whether is in animation mode or in static mode
         """
 
+        # initialization
+        w = self.w
+        pos = np.sign(self.position[0])
+        stretch_factor = 2
+
+        functions = []
+
+        if animated:
+            edit = self.get_push_button_compression(motion_direction=motion_direction)
+            functions.append(fused_transform([self.actuator], lambda target: edit(target[0]), run_time=run_time))
+        else:
+            functions.append(self.actuator[0][0].shift(-1/4*w*motion_direction*pos).set_fill(RED_AUT).stretch(1/stretch_factor, dim=0))
+            functions.append(self.actuator[0][1:].shift(-2/4*w*motion_direction*pos))
+
+        return functions
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_push_button_compression(self, motion_direction=RIGHT):
+        """
+        Return the function that moves and compresses the push button of an actuator group 
+        (the actuator or the target of its animation)
+        motion_direction: direction of the actuator motion
+        """
+
         # initialization
         w = self.w
         actuator_fill_color = self.actuator_fill_color
@@ -252,8 +338,6 @@ class manual_actuator():
         dir = np.sign(motion_direction[0])
         stretch_factor = 2
 
-        functions = []
-
         # if valve closes the pneumatic circuit
         if np.sign(pos*dir) < 0:
             fill_color = RED_AUT
@@ -262,14 +346,11 @@ class manual_actuator():
         elif np.sign(pos*dir) > 0:
             fill_color = actuator_fill_color
 
-        if animated:
-            functions.append(self.actuator[0][0].animate(run_time=run_time).shift(5/4*w*motion_direction).set_fill(fill_color).stretch(stretch_factor**(pos*dir), dim=0))
-            functions.append(self.actuator[0][1:].animate(run_time=run_time).shift(6/4*w*motion_direction).set_fill(fill_color))
-        else:
-            functions.append(self.actuator[0][0].shift(-1/4*w*motion_direction*pos).set_fill(RED_AUT).stretch(1/stretch_factor, dim=0))
-            functions.append(self.actuator[0][1:].shift(-2/4*w*motion_direction*pos))
+        def edit(actuator):
+            actuator[0][0].shift(5/4*w*motion_direction).set_fill(fill_color).stretch(stretch_factor**(pos*dir), dim=0)
+            actuator[0][1:].shift(6/4*w*motion_direction).set_fill(fill_color)
 
-        return functions
+        return edit
 
 # ======================================================================================================================
 
@@ -278,11 +359,22 @@ class mechanic_actuator():
     Meccanic actuator for directional valves
     """
 
-    arguments = {"actuator_stroke_color": GREY_E,
-                 "actuator_fill_color": GREY_A}
-    
-    def __init__(self, position=ORIGIN, height=2, position_side=LEFT, actuator_type=0, actuated=False, **kwargs):
+    arguments = Style({"actuator_stroke_color": GREY_E,
+                       "actuator_fill_color": GREY_A})
+
+    # levers: distance from the bottom and height of the lever (ratios of the height), radius of the roller (ratio of b)
+    lever_geometry = {"a": 1/10, "b": 1/4, "roller": 2/3}
+    # spring: free length and external diameter (ratios of the height), coils and thin wire of the spring
+    len_spring_factor = 1.2
+    spring_diameter = 1/3
+    spring_coils = 10
+    spring_style = {"geometric_ratio": 1/80}
+
+    def __init__(self, position=ORIGIN, height=2, position_side=LEFT, actuator_type=0, actuated=False, style=None, **kwargs):
         
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization
         self.h = height
         self.w = height
@@ -314,8 +406,8 @@ class mechanic_actuator():
 
         lever = VGroup()
 
-        a = 1/10
-        b = 1/4
+        a = self.lever_geometry["a"]
+        b = self.lever_geometry["b"]
         # show the lever
         lever.add(Line(start=a*h*UP + w*position_side, end=a*h*UP, color=self.actuator_stroke_color, stroke_width=stroke_width))
         lever.add(Line(start=a*h*UP, end=(a+b)*h*UP, color=self.actuator_stroke_color, stroke_width=stroke_width))
@@ -348,9 +440,9 @@ class mechanic_actuator():
 
         roller_lever = VGroup()
 
-        a = 1/10
-        b = 1/4
-        r = b*h*2/3
+        a = self.lever_geometry["a"]
+        b = self.lever_geometry["b"]
+        r = self.lever_geometry["roller"]*b*h
         # show the lever
         roller_lever.add(Line(start=a*h*UP + w*position_side, end=a*h*UP, color=self.actuator_stroke_color, stroke_width=stroke_width))
         roller_lever.add(Line(start=a*h*UP, end=(a+b)*h*UP, color=self.actuator_stroke_color, stroke_width=stroke_width))
@@ -379,23 +471,54 @@ class mechanic_actuator():
         position_side: indicates in which side is the translation
         """
 
+        # springs are imported only when an actuator needs them
+        from Mlib.Mechanics.Spring import Compression_Spring as spr
+
         w = self.w
-        self.len_spring_factor = 1.2
-        
-        # initialization of the spring
-        spr.arguments["geometric_ratio"] = 1/80
-        d_ext = w/3
-        n_coils = 10
+
+        # initialization of the spring (thin coils only for this spring, the defaults of the class are not changed)
+        d_ext = self.spring_diameter*w
+        n_coils = self.spring_coils
         height = self.height = self.len_spring_factor*w
-        
-        spring = spr(color=BLACK, d_ext=d_ext, height=height, n_coils=n_coils, angle=pi/2*position_side[0])
+
+        spring = spr(color=BLACK, d_ext=d_ext, height=height, n_coils=n_coils, angle=pi/2*position_side[0],
+                     style=self.spring_style)
 
         # set the postion respect to the valve
         pos = spring.get_spring_legth()*position_side + d_ext/2*UP
         spring.spring.shift(pos)
         
         return spring
-    
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def get_envelope(cls, height=2, position_side=LEFT, actuator_type=0):
+        """
+        Bounding box of the actuator respect to its position (see Mlib.Tools.Layout)
+        """
+
+        # initialization
+        h = height
+        a = cls.lever_geometry["a"]
+        b = cls.lever_geometry["b"]
+
+        if actuator_type == 0: # lever: body and arc
+            return get_side_box((0, (1 + b/2)*h), (a*h, (a + b)*h), position_side)
+
+        if actuator_type == 1: # roller lever: body and roller
+            r = cls.lever_geometry["roller"]*b
+            return get_side_box((0, (1 + r*5/3)*h), (min(a, a + b/2 - r)*h, max(a + b, a + b/2 + r)*h), position_side)
+
+        # spring: footprint of the spring moved like in create_spring (the length of the spring is horizontal)
+        from Mlib.Mechanics.Spring import Compression_Spring as spr
+
+        d_ext = cls.spring_diameter*h
+        footprint = spr.get_footprint(d_ext=d_ext, height=cls.len_spring_factor*h, n_coils=cls.spring_coils,
+                                      angle=pi/2*position_side[0], style=cls.spring_style)
+
+        return footprint.shift(footprint.width*position_side + d_ext/2*UP).box
+
     # ----------------------------------------------------------------------------------------------------------------------
 
     def set_mechanic_actuation(self, position_side=LEFT, actuator_type=0):
@@ -456,29 +579,15 @@ class mechanic_actuator():
 
         # initialization
         w = self.w
-        actuator_fill_color = self.actuator_fill_color
-
         pos = np.sign(self.position[0])
-        dir = np.sign(motion_direction[0])
         stretch_factor = 2
 
         functions = []
 
-        # if valve closes the pneumatic circuit
-        if np.sign(pos*dir) < 0:
-            fill_color = RED_AUT
-            
-        # if valve opens the pneumatic circuit
-        elif np.sign(pos*dir) > 0:
-            fill_color = actuator_fill_color
-
         if animated:
-            # animated compression
-            functions.append(self.actuator[0][0:3].animate(run_time=run_time).shift(5/4*w*motion_direction).stretch(stretch_factor**(np.sign(pos*dir)), dim=0))
-            functions.append(self.actuator[0][3].animate(run_time=run_time).shift((5/4 + 1/(2*stretch_factor))*w*motion_direction))
-            functions.append(self.actuator[0][4].animate(run_time=run_time).shift(5/4*w*motion_direction).stretch(stretch_factor**(pos*dir), dim=0))
-            functions.append(self.actuator[0][5].animate(run_time=run_time).shift((5/4 + 1/(2*stretch_factor))*w*motion_direction).set_fill(fill_color))
-            functions.append(self.actuator[0][6].animate(run_time=run_time).shift((5/4+ 1/(2*stretch_factor))*w*motion_direction))
+            # animated compression (all the parts in a single animation)
+            edit = self.get_roller_lever_compression(motion_direction=motion_direction)
+            functions.append(fused_transform([self.actuator], lambda target: edit(target[0]), run_time=run_time))
         else:
             # not animated compression
             self.actuator[0][0:3].shift(pos*1/4*w*LEFT).stretch(1/stretch_factor, dim=0)
@@ -491,16 +600,49 @@ class mechanic_actuator():
 
     # ----------------------------------------------------------------------------------------------------------------------
 
+    def get_roller_lever_compression(self, motion_direction=RIGHT):
+        """
+        Return the function that moves and compresses the roller lever of an actuator group
+        (the actuator or the target of its animation)
+        motion_direction: direction of the actuator motion
+        """
+
+        # initialization
+        w = self.w
+        actuator_fill_color = self.actuator_fill_color
+
+        pos = np.sign(self.position[0])
+        dir = np.sign(motion_direction[0])
+        stretch_factor = 2
+
+        # if valve closes the pneumatic circuit
+        if np.sign(pos*dir) < 0:
+            fill_color = RED_AUT
+            
+        # if valve opens the pneumatic circuit
+        elif np.sign(pos*dir) > 0:
+            fill_color = actuator_fill_color
+
+        def edit(actuator):
+            actuator[0][0:3].shift(5/4*w*motion_direction).stretch(stretch_factor**(np.sign(pos*dir)), dim=0)
+            actuator[0][3].shift((5/4 + 1/(2*stretch_factor))*w*motion_direction)
+            actuator[0][4].shift(5/4*w*motion_direction).stretch(stretch_factor**(pos*dir), dim=0)
+            actuator[0][5].shift((5/4 + 1/(2*stretch_factor))*w*motion_direction).set_fill(fill_color)
+            actuator[0][6].shift((5/4+ 1/(2*stretch_factor))*w*motion_direction)
+
+        return edit
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
     def set_spring_compression(self, motion_direction=RIGHT, animated=True, run_time=1):
         """
         Set the compression of the actuator spring
-        perc_comp: percentage of compression
+        motion_direction: direction of the actuator motion
         animated: a flag that define whether is in animation mode or in static mode
         """
 
         # initialization
         w = self.height
-        d_coil = self.spring.d_coil
         
         # k indicate the way of motion and compression respect to the position
         if animated:
@@ -508,11 +650,41 @@ class mechanic_actuator():
         else:
             k = 1
             self.spring.spring.shift(-w/self.len_spring_factor*self.position_side)
-        
-        # calculate the compression factor with the original length (height) of the spring
-        compression = k*(w/self.len_spring_factor + 4*d_coil)/w
 
-        return self.spring.set_compression(perc_comp=compression, animated=animated, run_time=run_time)
+        return self.spring.set_compression(perc_comp=self.get_spring_target(k), animated=animated, run_time=run_time)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_spring_compression(self, motion_direction=RIGHT):
+        """
+        Return the function that compresses the spring of an actuator group (the actuator or the target of its animation)
+        and update the compression of the spring
+        motion_direction: direction of the actuator motion
+        """
+
+        # initialization
+        k = np.sign(motion_direction[0]*self.position[0])
+        compression = self.get_spring_target(k)
+        edit_spring = self.spring.get_compression(perc_comp=compression)
+        self.spring.compression = compression
+
+        def edit(actuator):
+            edit_spring(actuator[0])
+
+        return edit
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_spring_target(self, k):
+        """
+        Return the absolute compression of the spring after a stroke of the valve
+        k: 1 the spring is compressed, -1 the spring is released
+        """
+
+        # the stroke of the valve is the width of a chamber, compression 1 shortens the spring of its stroke
+        spring = self.spring
+
+        return spring.compression + k*(self.height/self.len_spring_factor)/spring.get_stroke()
 
 # ======================================================================================================================
 
@@ -521,11 +693,17 @@ class pneumatic_actuator():
     Pneumatic actuator for directional valves
     """
 
-    arguments = {"actuator_stroke_color": GREY_E,
-                 "actuator_fill_color": GREY_A}
-    
-    def __init__(self, position=ORIGIN, height=2, position_side=LEFT, actuator_type=0, actuated=False, **kwargs):
+    arguments = Style({"actuator_stroke_color": GREY_E,
+                       "actuator_fill_color": GREY_A})
+
+    # signal: inner line, radius of the triangle, outer line and height of the signal (ratios of the height)
+    signal_geometry = {"line_in": 1/3, "triangle": 1/5, "line_out": 1/6, "height": 1/3}
+
+    def __init__(self, position=ORIGIN, height=2, position_side=LEFT, actuator_type=0, actuated=False, style=None, **kwargs):
         
+        # style of the instance (defaults of the class, theme of the library and style)
+        self.arguments = get_style(self.arguments, style)
+
         # initialization
         self.h = height
         self.w = height
@@ -554,7 +732,7 @@ class pneumatic_actuator():
         # initialization
         h = self.h
         stroke_width = 2*h
-        scale_factor = h/5
+        scale_factor = self.signal_geometry["triangle"]*h
         actuator_fill_color = self.actuator_fill_color
         actuator_stroke_color = self.actuator_stroke_color
 
@@ -566,15 +744,34 @@ class pneumatic_actuator():
         else:
             rotation = pi/6 
 
-        signal.add(Line(start=ORIGIN, end=h/3*position_side, color=actuator_stroke_color, stroke_width=stroke_width))
+        signal.add(Line(start=ORIGIN, end=self.signal_geometry["line_in"]*h*position_side, color=actuator_stroke_color, stroke_width=stroke_width))
         signal.add(Triangle(color=BLACK, stroke_width=stroke_width, fill_color=actuator_fill_color,
                                 fill_opacity=0.3).scale(scale_factor).rotate(rotation).next_to(signal[-1], direction=position_side, buff=0))
-        signal.add(Line(start=ORIGIN, end=h/6*position_side, color=BLACK, stroke_width=stroke_width).next_to(signal[-1], direction=position_side, buff=0))
+        signal.add(Line(start=ORIGIN, end=self.signal_geometry["line_out"]*h*position_side, color=BLACK, stroke_width=stroke_width).next_to(signal[-1], direction=position_side, buff=0))
 
         return signal
 
     # ----------------------------------------------------------------------------------------------------------------------
 
+    @classmethod
+    def get_envelope(cls, height=2, position_side=LEFT, actuator_type=0):
+        """
+        Bounding box of the actuator respect to its position (see Mlib.Tools.Layout)
+        """
+
+        # initialization
+        h = height
+        geometry = cls.signal_geometry
+        r = geometry["triangle"]
+
+        # a vertex of the triangle (circumradius r) is on the axis: width 3/2*r, height 3**(1/2)*r
+        x_out = geometry["line_in"] + 3/2*r + geometry["line_out"]
+        y_range = (geometry["height"] - 3**(1/2)/2*r, geometry["height"] + 3**(1/2)/2*r)
+
+        return get_side_box((0, x_out*h), (y_range[0]*h, y_range[1]*h), position_side)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
     def set_pneumatic_actuation(self, position_side=LEFT, actuator_type=0, animated=True):
         """
         Drawing the pneumatic actuation for the valve
@@ -592,7 +789,7 @@ class pneumatic_actuator():
         if actuator_type==0: # signal
             actuator = self.create_pneumatic_signal(position_side=position_side)
 
-        actuator.shift(position + h/3*UP)
+        actuator.shift(position + self.signal_geometry["height"]*h*UP)
 
         return actuator
     
@@ -618,24 +815,53 @@ class pneumatic_actuator():
         """
 
         #initialization
-        w = self.w
         functions = []
 
+        if animated:
+            # the status is updated by get_pneumatic_signal_compression
+            edit = self.get_pneumatic_signal_compression(motion_direction=motion_direction)
+            functions.append(fused_transform([self.actuator], lambda target: edit(target[0]), run_time=run_time))
+        else:
+            functions.append(self.actuator[0][1].set_color(RED_AUT))
+            self.status = -self.status
+
+        return functions
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_pneumatic_signal_compression(self, motion_direction=RIGHT):
+        """
+        Return the function that moves the pneumatic signal of an actuator group (the actuator or the target 
+        of its animation) and update the status of the actuator
+        motion_direction: direction of the actuator motion
+        """
+
+        #initialization
+        w = self.w
+
         if self.status==-1:
             color = RED_AUT
         elif self.status==1:
             color = self.actuator_fill_color
 
-
-        if animated:
-            functions.append(self.actuator[0][0].animate(run_time=run_time).shift(w*motion_direction))
-            functions.append(self.actuator[0][1].animate(run_time=run_time).shift(w*motion_direction).set_color(color))
-            functions.append(self.actuator[0][2].animate(run_time=run_time).shift(w*motion_direction))
-        else:
-            functions.append(self.actuator[0][1].set_color(RED_AUT))
+        def edit(actuator):
+            actuator[0][0].shift(w*motion_direction)
+            actuator[0][1].shift(w*motion_direction).set_color(color)
+            actuator[0][2].shift(w*motion_direction)
 
         self.status = -self.status
 
-        return functions
+        return edit
+
+# ======================================================================================================================
 
-# ======================================================================================================================
\ No newline at end of file
+# actuators of the directional valves: choice: (class, actuator_type)
+actuator_choices = {"Coil": (electric_actuator, 0),
+                    "Manual lever": (manual_actuator, 0),
+                    "Push button": (manual_actuator, 1),
+                    "Simple lever": (mechanic_actuator, 0),
+                    "Roller lever": (mechanic_actuator, 1),
+                    "Compression spring": (mechanic_actuator, 2),
+                    "Pneumatic signal": (pneumatic_actuator, 0)}
+
+# ======================================================================================================================
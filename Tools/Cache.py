@@ -0,0 +1,412 @@
+import copy
+import enum
+import hashlib
+import importlib
+import json
+import os
+import sys
+import warnings
+from collections.abc import Mapping
+import numpy as np
+
+from Mlib import MLIB_PACKAGE
+
+"""
+Author: Ivan Archetti   
+Creation date: 18/10/2026
+
+
+Collection of python classes about caches of the components 
+
+Example (disk cache, opt-in):
+    from Mlib.Tools.Cache import disk_cache
+    gauge = disk_cache.build(Gauge, radius=1, um="bar")
+    print(disk_cache.get_stats())
+"""
+
+
+# ======================================================================================================================
+
+class Prototype_cache():
+    """
+    Keyed cache of prototypes: the first request of a key builds the template, 
+    the following requests receive a copy of the cached template
+    """
+
+    def __init__(self, name=""):
+        # initialization
+        self.name = name
+        self.prototypes = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get(self, key, builder):
+        """
+        Return a copy of the prototype identified by key
+        key: hashable tuple that identifies the prototype
+        builder: function without arguments that creates the prototype when it is not cached
+        """
+
+        if key in self.prototypes:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.prototypes[key] = builder()
+
+        # the template is never returned, otherwise it could be modified from outside
+        return copy.deepcopy(self.prototypes[key])
+    
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def clear(self):
+        """
+        Remove all the prototypes and reset the counters
+        """
+
+        self.prototypes.clear()
+        self.hits = 0
+        self.misses = 0
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_stats(self):
+        """
+        Return hits, misses and number of prototypes of the cache
+        """
+
+        stats = {"name": self.name,
+                 "hits": self.hits,
+                 "misses": self.misses,
+                 "size": len(self.prototypes)}
+        
+        return stats
+
+# ======================================================================================================================
+
+# packages of the classes that a file of the disk cache can create: nothing else is imported or called on load
+TRUSTED_PACKAGES = ("manim", MLIB_PACKAGE)
+
+# ======================================================================================================================
+
+def get_class_path(cls):
+    """
+    Module and qualified name of a class, it must belong to a trusted package
+    """
+
+    if cls.__module__.split(".")[0] not in TRUSTED_PACKAGES:
+        raise TypeError(f"{cls.__module__}.{cls.__qualname__} is not a class of {' or '.join(TRUSTED_PACKAGES)}")
+
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def load_class(path):
+    """
+    Class of a path written by get_class_path (only from the trusted packages)
+    """
+
+    module_name, qualname = path.split(":")
+    if module_name.split(".")[0] not in TRUSTED_PACKAGES:
+        raise ValueError(f"{path} is not a class of {' or '.join(TRUSTED_PACKAGES)}")
+
+    cls = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        cls = getattr(cls, name)
+    if not isinstance(cls, type):
+        raise ValueError(f"{path} is not a class")
+
+    return cls
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def encode_state(root):
+    """
+    Structure (JSON-compatible) and numpy arrays of an object and of the objects it refers to:
+    components and mobjects are stored with their attributes, arrays (points, colors, etc etc...) by value.
+    Functions (e.g. lambda updaters) and objects of other packages cannot be stored: TypeError
+    """
+
+    nodes = []          # components and mobjects: {"class", "state"} or mappings: {"class", "items"}
+    arrays = {}
+    indices = {}        # id of an object: index of its node
+    alive = []          # objects already encoded (their ids stay unique)
+
+    def encode(value):
+        if isinstance(value, enum.Enum):
+            return {"enum": get_class_path(type(value)), "name": value.name}
+        if value is None or type(value) in (bool, int, float, str):
+            return value
+        if type(value) is complex:
+            return {"complex": [value.real, value.imag]}
+        if isinstance(value, np.ndarray):
+            if value.dtype == object:
+                raise TypeError("arrays of objects")
+            name = f"a{len(arrays)}"
+            arrays[name] = value.copy()
+            return {"array": name}
+        if isinstance(value, np.generic):
+            return {"generic": value.dtype.str, "value": encode(value.item())}
+        if type(value) in (list, tuple, set, frozenset):
+            return {type(value).__name__: [encode(item) for item in value]}
+        if type(value) is dict:
+            return {"dict": [[encode(key), encode(item)] for key, item in value.items()]}
+        if isinstance(value, type):
+            return {"type": get_class_path(value)}
+        if callable(getattr(value, "to_rgba", None)):
+            # colors (ManimColor) by value
+            get_class_path(type(value))
+            return {"color": [float(c) for c in value.to_rgba()]}
+        if id(value) in indices:
+            return {"ref": indices[id(value)]}
+
+        path = get_class_path(type(value))
+        if not isinstance(value, Mapping) and not hasattr(value, "__dict__"):
+            raise TypeError(f"{type(value).__qualname__} has no attributes to store")
+        index = len(nodes)
+        indices[id(value)] = index
+        alive.append(value)
+        nodes.append(None)
+        if isinstance(value, Mapping):
+            nodes[index] = {"class": path, "items": [[encode(key), encode(item)] for key, item in value.items()]}
+        else:
+            nodes[index] = {"class": path, "state": {name: encode(item) for name, item in vars(value).items()}}
+
+        return {"ref": index}
+
+    structure = {"root": encode(root), "nodes": nodes}
+
+    return structure, arrays
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def decode_state(structure, arrays):
+    """
+    New object from the structure and the arrays written by encode_state: the objects are created with the
+    __new__ of their classes (no constructor is called) and receive their attributes, the arrays are copied
+    """
+
+    from manim import ManimColor
+
+    nodes = structure["nodes"]
+    objects = [None]*len(nodes)
+
+    def decode(value):
+        if not isinstance(value, dict):
+            return value
+        kind, item = next(iter(value.items()))
+        if kind == "ref":
+            if objects[item] is None:
+                # mappings (styles) are created with their items
+                node = nodes[item]
+                items = {decode(key): decode(entry) for key, entry in node["items"]}
+                objects[item] = load_class(node["class"])(items)
+            return objects[item]
+        if kind == "array":
+            return arrays[item].copy()
+        if kind == "enum":
+            return load_class(item)[value["name"]]
+        if kind == "generic":
+            return np.dtype(item).type(decode(value["value"]))
+        if kind == "complex":
+            return complex(*item)
+        if kind in ("list", "tuple", "set", "frozenset"):
+            return {"list": list, "tuple": tuple, "set": set, "frozenset": frozenset}[kind](decode(entry) for entry in item)
+        if kind == "dict":
+            return {decode(key): decode(entry) for key, entry in item}
+        if kind == "type":
+            return load_class(item)
+        if kind == "color":
+            return ManimColor(np.array(item))
+        raise ValueError(f"unknown value {kind}")
+
+    # objects first (they can refer to each other), then their attributes
+    for index, node in enumerate(nodes):
+        if "state" in node:
+            cls = load_class(node["class"])
+            objects[index] = cls.__new__(cls)
+    for index, node in enumerate(nodes):
+        if "state" in node:
+            vars(objects[index]).update({name: decode(item) for name, item in node["state"].items()})
+
+    return decode(structure["root"])
+
+# ======================================================================================================================
+
+class Disk_cache():
+    """
+    Cache of built components on disk: every component is stored in a .npz file, the arrays of its mobjects
+    (points, colors, stroke widths, etc etc...) as numpy arrays and the other attributes as JSON, and the next
+    renders rebuild it from them without computing the geometry again. Only classes of manim and Mlib are
+    created on load (no pickle: a file of a shared folder cannot run code)
+    The key contains class, parameters, styles of all the classes (with the theme) and version of the library
+    (digest of the sources), so a change of the code or of the theme invalidates the cache automatically
+    """
+
+    def __init__(self, path=None, name="disk"):
+        """
+        path: folder of the cache (default environment variable MLIB_CACHE or ~/.cache/Mlib)
+        """
+
+        # initialization
+        self.name = name
+        self.path = path or os.environ.get("MLIB_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "Mlib")
+        self.version = None
+        self.entries = {}       # key: (structure, arrays) already read from disk
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0       # components that cannot be stored (e.g. updaters with lambda functions)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_version(self):
+        """
+        Version of the library: digest of the sources of the package and of the manim version
+        """
+
+        if self.version is None:
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(str(getattr(sys.modules.get("manim"), "__version__", "")).encode())
+            for folder, folders, files in sorted(os.walk(root)):
+                folders.sort()
+                for file in sorted(files):
+                    if file.endswith(".py"):
+                        digest.update(os.path.relpath(os.path.join(folder, file), root).encode())
+                        with open(os.path.join(folder, file), "rb") as source:
+                            digest.update(source.read())
+            self.version = digest.hexdigest()
+
+        return self.version
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_key(self, constructor, params):
+        """
+        Name of the file of a component: class, parameters, styles of the classes with the theme and version of the
+        library (a component builds others, e.g. the springs and the actuators of a valve, with their own styles)
+        """
+
+        # digests of numpy arrays, colors, etc etc... are independent from the memory addresses
+        from Mlib.Tools.Hashing import get_digest
+        from Mlib.Tools.Instrumentation import component_classes
+        from Mlib.Graphics.Styles import get_style
+
+        styles = {f"{cls.__module__}.{cls.__qualname__}": get_style(vars(cls)["arguments"])
+                  for cls in component_classes() if isinstance(vars(cls).get("arguments"), Mapping)}
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{constructor.__module__}.{constructor.__qualname__}".encode())
+        digest.update(get_digest(params).encode())
+        digest.update(get_digest(styles).encode())
+        digest.update(self.get_version().encode())
+
+        return digest.hexdigest()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get(self, key, builder):
+        """
+        Return a new copy of the object identified by key (rebuilt from disk when it is already stored)
+        key: name of the file
+        builder: function without arguments that creates the object when it is not stored
+        """
+
+        entry = self.entries.get(key)
+        file_name = os.path.join(self.path, f"{key}.npz")
+        if entry is None and os.path.exists(file_name):
+            try:
+                with np.load(file_name, allow_pickle=False) as data:
+                    entry = (json.loads(str(data["structure"])),
+                             {name: data[name] for name in data.files if name != "structure"})
+            except Exception:
+                # file written by an incompatible version: it is replaced
+                entry = None
+
+        if entry is not None:
+            try:
+                obj = decode_state(*entry)
+                self.entries[key] = entry
+                self.hits += 1
+                return obj
+            except Exception:
+                pass
+
+        self.misses += 1
+        obj = builder()
+        try:
+            entry = encode_state(obj)
+        except TypeError as error:
+            self.failures += 1
+            warnings.warn(f"{type(obj).__qualname__} is not stored in the disk cache {self.path}: {error}", stacklevel=3)
+            return obj
+
+        # the file is written with another name and renamed (parallel renders never read half files)
+        os.makedirs(self.path, exist_ok=True)
+        temp_name = f"{file_name}.{os.getpid()}.tmp"
+        structure, arrays = entry
+        with open(temp_name, "wb") as file:
+            np.savez(file, structure=np.array(json.dumps(structure)), **arrays)
+        os.replace(temp_name, file_name)
+        self.entries[key] = entry
+
+        return obj
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def build(self, constructor, **params):
+        """
+        Return the component constructor(**params) from the cache (the component is built only if not stored,
+        a warning reports the components that cannot be stored)
+        """
+
+        component = self.get(self.get_key(constructor, params), lambda: constructor(**params))
+
+        # the components rebuilt from disk are registered like the built ones (see Mlib.Tools.Hashing)
+        from Mlib.Tools.Hashing import original_inits, register_component
+        if constructor in original_inits:
+            register_component(component, params)
+
+        return component
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def clear(self, files=True):
+        """
+        Remove the components read from disk, the files (if files is True) and reset the counters
+        """
+
+        self.entries.clear()
+        if files and os.path.isdir(self.path):
+            for file in os.listdir(self.path):
+                if file.endswith(".npz"):
+                    os.remove(os.path.join(self.path, file))
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_stats(self):
+        """
+        Return hits, misses, hit rate, components not stored and number of files of the cache
+        """
+
+        size = len([file for file in os.listdir(self.path) if file.endswith(".npz")]) if os.path.isdir(self.path) else 0
+        requests = self.hits + self.misses
+
+        stats = {"name": self.name,
+                 "hits": self.hits,
+                 "misses": self.misses,
+                 "hit_rate": self.hits/requests if requests else 0.0,
+                 "failures": self.failures,
+                 "size": size,
+                 "path": self.path}
+
+        return stats
+
+# ======================================================================================================================
+
+# process-wide disk cache (nothing is written until build/get is used)
+disk_cache = Disk_cache()
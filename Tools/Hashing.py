@@ -0,0 +1,340 @@
+from manim import *
+import numpy as np
+import functools
+import hashlib
+import inspect
+import types
+import weakref
+from collections.abc import Mapping
+
+from Mlib import MLIB_PACKAGE
+from Mlib.Tools.Instrumentation import component_classes
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Compact and stable hashing of mobjects and components for the partial movie cache of manim
+
+Manim serializes (JSON) every mobject of the scene and the closures of the updaters to decide if a partial movie
+can be reused: the digests of this module describe the components built after enable_fast_hashing() with their
+constructor parameters and state (valve position, cylinder opened_state, display digits, etc etc...) instead of the
+points of their mobjects, the other mobjects with their point arrays read as raw bytes
+
+Example:
+    from Mlib.Tools.Hashing import enable_fast_hashing
+    enable_fast_hashing()       # before the components are built
+"""
+
+
+# largest nesting of functions, closures and objects (deeper values are hashed by manim, see enable_fast_hashing)
+MAX_DEPTH = 32
+
+owners = weakref.WeakKeyDictionary()        # mobject: weak reference to the component that built it
+parameters = weakref.WeakKeyDictionary()    # component: parameters of its constructor
+original_inits = {}                         # class: original __init__
+
+
+# ======================================================================================================================
+
+def is_component(obj):
+    """
+    True if the object is an instance of a Mlib class that is not a mobject (valves, cylinders, sensors, etc etc...)
+    """
+
+    return type(obj).__module__.split(".")[0] == MLIB_PACKAGE and not isinstance(obj, Mobject)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def is_context(obj):
+    """
+    True if the object is part of the rendering context and not of the content (scene, camera, renderer, module)
+    """
+
+    return (isinstance(obj, (types.ModuleType, Scene, Camera)) or 
+            type(obj).__module__.startswith(("manim.renderer", "manim.camera", "manim.scene")))
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def update_digest(digest, value, seen, depth=0):
+    """
+    Add a value to the digest (recursive on containers, functions, mobjects and components)
+
+    digest: hashlib object
+    value: value to add
+    seen: ids of the objects already added (closures and updaters refer to each other)
+    depth: recursion level of functions and components
+    """
+
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        digest.update(repr(value).encode())
+        return
+
+    if isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype}{value.shape}".encode())
+        if value.dtype == object:
+            for item in value.ravel():
+                update_digest(digest, item, seen, depth)
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+        return
+
+    # the objects below can refer to each other
+    if id(value) in seen:
+        digest.update(type(value).__name__.encode())
+        return
+    if depth > MAX_DEPTH:
+        raise ValueError(f"{type(value).__qualname__} is nested deeper than {MAX_DEPTH} levels")
+    seen.add(id(value))
+
+    if isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            update_digest(digest, item, seen, depth)
+    elif isinstance(value, (set, frozenset)):
+        # the order of sets and dictionaries keys does not depend on their memory addresses
+        for item in sorted(value, key=get_digest):
+            update_digest(digest, item, seen, depth)
+    elif isinstance(value, Mapping):
+        for key in sorted(value, key=get_digest):
+            update_digest(digest, key, seen, depth)
+            update_digest(digest, value[key], seen, depth)
+    elif isinstance(value, Mobject):
+        update_mobject_digest(digest, value, seen, depth)
+    elif isinstance(value, types.MethodType):
+        update_digest(digest, value.__func__, seen, depth)
+        update_digest(digest, value.__self__, seen, depth + 1)
+    elif isinstance(value, types.FunctionType):
+        update_function_digest(digest, value, seen, depth)
+    elif isinstance(value, types.CodeType):
+        digest.update(value.co_code)
+        digest.update(repr(value.co_names).encode())
+        update_digest(digest, value.co_consts, seen, depth)
+    elif is_component(value):
+        update_component_digest(digest, value, seen, depth)
+    elif callable(getattr(value, "to_rgba", None)):
+        # colors (ManimColor) by value
+        digest.update(b"color")
+        digest.update(np.asarray(value.to_rgba(), dtype=float).tobytes())
+    elif isinstance(value, type):
+        digest.update(f"{value.__module__}.{value.__qualname__}".encode())
+    elif is_context(value):
+        # scene, camera, renderer and modules: only the type (their state changes at every frame)
+        digest.update(type(value).__qualname__.encode())
+    else:
+        # other objects by value: attributes (like the encoder of manim) or slots
+        digest.update(f"{type(value).__module__}.{type(value).__qualname__}".encode())
+        if hasattr(value, "__dict__"):
+            update_digest(digest, vars(value), seen, depth + 1)
+        else:
+            slots = [name for cls in type(value).__mro__ for name in getattr(cls, "__slots__", ())]
+            update_digest(digest, [getattr(value, name, None) for name in slots], seen, depth + 1)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def update_function_digest(digest, function, seen, depth=0):
+    """
+    Add a function to the digest: code, default values and values of the closure
+    (always_redraw and updaters are hashed by what they do, not by their identity)
+    """
+
+    digest.update(function.__qualname__.encode())
+    update_digest(digest, function.__code__, seen, depth)
+    update_digest(digest, function.__defaults__, seen, depth)
+    for cell in function.__closure__ or ():
+        try:
+            update_digest(digest, cell.cell_contents, seen, depth + 1)
+        except ValueError:
+            # empty cell
+            digest.update(b"empty")
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_owner(mobject):
+    """
+    Component that built the mobject (None if it was not built by a registered component)
+    """
+
+    owner = owners.get(mobject)
+
+    return owner() if owner is not None else None
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def update_mobject_digest(digest, mobject, seen, depth=0):
+    """
+    Add a mobject to the digest: for every member of the family points, style, z index and updaters
+    (the members built by a component have its parameters and state and only the first point for the placement)
+    """
+
+    for mob in mobject.get_family():
+        seen.add(id(mob))
+        digest.update(f"{type(mob).__name__}{len(mob.submobjects)}{mob.z_index}".encode())
+        owner = get_owner(mob)
+        if owner is not None:
+            update_digest(digest, owner, seen, depth + 1)
+            digest.update(np.ascontiguousarray(mob.points[:1]).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(mob.points).tobytes())
+        if isinstance(mob, VMobject):
+            for array in (mob.get_fill_rgbas(), mob.get_stroke_rgbas(), mob.get_stroke_rgbas(background=True),
+                          [mob.get_stroke_width(), mob.get_stroke_width(background=True)]):
+                digest.update(np.asarray(array, dtype=float).tobytes())
+        elif hasattr(mob, "pixel_array"):
+            # images of the raster layers already have the key of their pixels
+            key = getattr(mob, "key", None)
+            digest.update(repr(key).encode() if key is not None else np.ascontiguousarray(mob.pixel_array).tobytes())
+        for updater in mob.updaters:
+            update_digest(digest, updater, seen, depth + 1)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def update_component_digest(digest, component, seen, depth=0):
+    """
+    Add a component to the digest: class, constructor parameters and attributes (state),
+    the mobjects of the component are skipped (they are hashed as members of the scene)
+    """
+
+    digest.update(type(component).__qualname__.encode())
+    update_digest(digest, parameters.get(component), seen, depth + 1)
+    for name, value in sorted(vars(component).items()):
+        if isinstance(value, (Mobject, types.FunctionType, types.MethodType)):
+            continue
+        digest.update(name.encode())
+        update_digest(digest, value, seen, depth + 1)
+
+# ======================================================================================================================
+
+def get_digest(value):
+    """
+    Stable digest (hexadecimal string) of a value, mobject or component
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    update_digest(digest, value, set())
+
+    return digest.hexdigest()
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_fingerprint(component):
+    """
+    Fingerprint of a component: parameters and current state, without the geometry of its mobjects
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    update_component_digest(digest, component, set())
+
+    return digest.hexdigest()
+
+# ======================================================================================================================
+
+def register_component(component, params):
+    """
+    Record the constructor parameters of a component and make it the owner of its mobjects
+    (a component built inside another one, e.g. the actuators of a valve, is registered first: the outer one wins)
+    """
+
+    parameters[component] = params
+    for value in vars(component).values():
+        if isinstance(value, Mobject):
+            for mob in value.get_family():
+                owners[mob] = weakref.ref(component)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def registering_init(init):
+    """
+    Constructor of a component that registers it after the original one
+    """
+
+    signature = inspect.signature(init)
+
+    @functools.wraps(init)
+    def wrapper(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        register_component(self, dict(list(bound.arguments.items())[1:]))
+
+    return wrapper
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def enable_registration():
+    """
+    Register the components built from now on (modules imported later are registered calling it again)
+    """
+
+    for cls in component_classes():
+        if issubclass(cls, Mobject) or "__init__" not in vars(cls) or cls in original_inits:
+            continue
+        original_inits[cls] = cls.__init__
+        cls.__init__ = registering_init(cls.__init__)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def disable_registration():
+    """
+    Restore the constructors of the components (the components already registered stay registered)
+    """
+
+    for cls, init in original_inits.items():
+        cls.__init__ = init
+    original_inits.clear()
+
+# ======================================================================================================================
+
+def enable_fast_hashing():
+    """
+    Replace the serialization of mobjects, functions and components in the hashes of manim's partial movie cache
+    with their digests (the other objects keep the serialization of manim) and register the components built from
+    now on (modules imported later are registered calling enable_fast_hashing() again)
+    """
+
+    from manim.utils import hashing
+
+    enable_registration()
+
+    encoder = getattr(hashing, "_CustomEncoder", None)
+    if encoder is None:
+        print("\n Fast hashing is not available for this version of manim! \n")
+        return
+    if hasattr(encoder, "manim_default"):
+        return
+
+    encoder.manim_default = encoder.default
+
+    def default(self, obj):
+        try:
+            if isinstance(obj, Mobject):
+                return {"mobject": type(obj).__name__, "digest": get_digest(obj)}
+            if isinstance(obj, (types.FunctionType, types.MethodType)):
+                return {"function": obj.__qualname__, "digest": get_digest(obj)}
+            if is_component(obj):
+                return {"component": type(obj).__qualname__, "digest": get_digest(obj)}
+        except ValueError:
+            # too deep for the digests: serialization of manim (by value)
+            pass
+        return encoder.manim_default(self, obj)
+
+    encoder.default = default
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def disable_fast_hashing():
+    """
+    Restore the hashing of manim and the constructors of the components
+    """
+
+    from manim.utils import hashing
+
+    disable_registration()
+
+    encoder = getattr(hashing, "_CustomEncoder", None)
+    if encoder is not None and hasattr(encoder, "manim_default"):
+        encoder.default = encoder.manim_default
+        del encoder.manim_default
+
+# ======================================================================================================================
@@ -0,0 +1,191 @@
+from manim import *
+import functools
+import inspect
+import sys
+import time
+
+from Mlib import MLIB_PACKAGE
+
+"""
+Author: Ivan Archetti   
+Creation date: 18/10/2026
+
+
+Opt-in instrumentation of the components: builders (set_*), animation factories (@instrumented) and updaters
+
+When disabled the methods of the components are the original ones (no cost), the updaters 
+registered by Mlib only check a flag. When enabled calls, cumulative time and allocated mobjects 
+are aggregated for each method:
+
+    import Mlib.Tools.Instrumentation as ins
+    ins.enable()
+    ... build and render ...
+    ins.print_stats()
+"""
+
+
+# ======================================================================================================================
+
+# global status of the instrumentation
+status = {"enabled": False,
+          "mobjects": 0} # number of mobjects created since enable()
+
+stats = {}
+original_methods = {} # (class, name): original function
+original_mobject_init = Mobject.__init__
+
+# ======================================================================================================================
+
+def record(name, elapsed, mobjects=0):
+    """
+    Aggregate a call in the statistics
+    """
+
+    entry = stats.setdefault(name, {"calls": 0, "time_s": 0.0, "mobjects": 0})
+    entry["calls"] += 1
+    entry["time_s"] += elapsed
+    entry["mobjects"] += mobjects
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def counting_init(self, *args, **kwargs):
+    """
+    Mobject.__init__ that counts the created mobjects
+    """
+
+    status["mobjects"] += 1
+    original_mobject_init(self, *args, **kwargs)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def timed_method(name, method):
+    """
+    Wrapper of a builder/factory that measures time and created mobjects
+    """
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        mobjects = status["mobjects"]
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record(name, time.perf_counter() - start, status["mobjects"] - mobjects)
+
+    return wrapper
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def instrumented(method):
+    """
+    Mark an animation factory of a component: enable() instruments it together with the set_* builders
+    (an updater registered by Mlib is wrapped with track_updater)
+    """
+
+    method.__instrumented__ = True
+
+    return method
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def track_updater(updater, name=None):
+    """
+    Wrap an updater registered by Mlib: the time is aggregated only when the instrumentation is enabled
+    (the signature is preserved because manim checks the "dt" parameter)
+    """
+
+    name = name or f"updater:{updater.__qualname__}"
+
+    @functools.wraps(updater)
+    def wrapper(*args, **kwargs):
+        if not status["enabled"]:
+            return updater(*args, **kwargs)
+        
+        start = time.perf_counter()
+        try:
+            return updater(*args, **kwargs)
+        finally:
+            record(name, time.perf_counter() - start)
+
+    return wrapper
+
+# ======================================================================================================================
+
+def component_classes():
+    """
+    Classes defined in the Mlib modules already imported
+    """
+
+    for module_name, module in list(sys.modules.items()):
+        if module is None or module_name.split(".")[0] != MLIB_PACKAGE or module_name == __name__:
+            continue
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module_name:
+                yield cls
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def enable():
+    """
+    Switch on the instrumentation of builders and factories of all the imported Mlib modules
+    (modules imported later are instrumented calling enable() again)
+    """
+
+    for cls in component_classes():
+        for name, method in list(vars(cls).items()):
+            if not inspect.isfunction(method) or (cls, name) in original_methods:
+                continue
+            if name.startswith("set_") or getattr(method, "__instrumented__", False):
+                original_methods[(cls, name)] = method
+                setattr(cls, name, timed_method(f"{cls.__name__}.{name}", method))
+
+    Mobject.__init__ = counting_init
+    status["enabled"] = True
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def disable():
+    """
+    Switch off the instrumentation and restore the original methods (statistics are kept)
+    """
+
+    for (cls, name), method in original_methods.items():
+        setattr(cls, name, method)
+    original_methods.clear()
+
+    Mobject.__init__ = original_mobject_init
+    status["enabled"] = False
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def reset():
+    """
+    Clear the statistics
+    """
+
+    stats.clear()
+    status["mobjects"] = 0
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_stats():
+    """
+    Copy of the statistics: {name: {"calls", "time_s", "mobjects"}}
+    (times and mobjects are inclusive of the nested calls)
+    """
+
+    return {name: dict(entry) for name, entry in stats.items()}
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def print_stats(sort_by="time_s", file=sys.stdout):
+    """
+    Table of the statistics sorted by time (or calls/mobjects)
+    """
+
+    print(f"{'name':<60} {'calls':>8} {'time s':>10} {'ms/call':>9} {'mobjects':>9}", file=file)
+    for name, entry in sorted(stats.items(), key=lambda item: item[1][sort_by], reverse=True):
+        ms_call = 1000*entry["time_s"]/entry["calls"] if entry["calls"] else 0.0
+        print(f"{name:<60} {entry['calls']:>8} {entry['time_s']:>10.4f} {ms_call:>9.3f} {entry['mobjects']:>9}", file=file)
+
+# ======================================================================================================================
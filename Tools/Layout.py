@@ -0,0 +1,324 @@
+import numpy as np
+import importlib
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Geometry of the components without mobjects: ports and bounding boxes for layout scripts that try many placements
+
+Every component computes its footprint with the classmethod get_footprint, from the same constants and formulas used
+by its constructor (no mobject is created). This module imports only NumPy: the module of a component is imported
+when its footprint is required by get_footprint
+
+The footprints describe the components at rest (valves in the aligned position, cylinders closed),
+the tags of the connections (visible_connections) and the texts are not part of the bounding boxes
+
+Example:
+    from Mlib.Tools.Layout import Layout, get_footprint
+
+    layout = Layout()
+    valve = layout.add("V1", get_footprint("Pneumatic_valve_5_2", height=1))
+    cylinder = layout.add("C1", get_footprint("Pneumatic_cylinder_double_acting", height=1, width=4)).next_to(valve, UP, buff=1)
+    start = layout.get_port("V1", "4")          # connection 4 of the chamber aligned to the ports
+    router = Pipe_router(obstacles=layout.get_boxes())
+"""
+
+
+# ======================================================================================================================
+# directions (same values of manim)
+# ======================================================================================================================
+
+ORIGIN = np.array([0.0, 0.0, 0.0])
+UP = np.array([0.0, 1.0, 0.0])
+DOWN = np.array([0.0, -1.0, 0.0])
+RIGHT = np.array([1.0, 0.0, 0.0])
+LEFT = np.array([-1.0, 0.0, 0.0])
+UL = UP + LEFT
+UR = UP + RIGHT
+DL = DOWN + LEFT
+DR = DOWN + RIGHT
+
+# ======================================================================================================================
+
+def get_box(points):
+    """
+    Bounding box (bottom left, top right) of an array of points (n, 3)
+    """
+
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+
+    return np.array([points.min(axis=0), points.max(axis=0)])
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def rectangle_corners(center, width, height):
+    """
+    Corners (4, 3) of a rectangle aligned to the axes
+    """
+
+    return np.asarray(center, dtype=float) + np.array([[-width/2, -height/2, 0], [width/2, -height/2, 0],
+                                                       [width/2, height/2, 0], [-width/2, height/2, 0]])
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def rotate_points(points, angle, about_point=ORIGIN):
+    """
+    Rotate points (..., 3) around the OUT axis (like Mobject.rotate)
+    """
+
+    points = np.asarray(points, dtype=float)
+    c, s = np.cos(angle), np.sin(angle)
+    matrix = np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+    return about_point + (points - about_point) @ matrix.T
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def boxes_overlap(boxes_a, boxes_b, margin=0):
+    """
+    Overlap matrix (n, m) of two arrays of boxes (n, 2, 3) and (m, 2, 3) in the plane
+    margin: clearance between the boxes
+    """
+
+    a = np.asarray(boxes_a, dtype=float).reshape(-1, 2, 3)[:, None, :, :2]
+    b = np.asarray(boxes_b, dtype=float).reshape(-1, 2, 3)[None, :, :, :2]
+
+    return np.all((a[:, :, 0] < b[:, :, 1] + margin) & (b[:, :, 0] < a[:, :, 1] + margin), axis=-1)
+
+# ======================================================================================================================
+
+class Footprint():
+    """
+    Ports and bounding box of a component, placed with the same methods of the mobjects
+    (shift, move_to, next_to, get_corner, etc etc...)
+    """
+
+    def __init__(self, ports={}, box=None, **kwargs):
+        """
+        ports: dictionary name: point of the connections
+        box: bounding box (bottom left, top right), default the box of the ports
+        """
+
+        # initialization
+        self.ports = {name: np.asarray(point, dtype=float).copy() for name, point in ports.items()}
+        if box is None:
+            box = get_box(list(self.ports.values()) or [ORIGIN])
+        self.box = np.asarray(box, dtype=float).reshape(2, 3).copy()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def copy(self):
+        return Footprint(ports=self.ports, box=self.box)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_port(self, name):
+        """
+        Return the position of a port
+        """
+
+        if name not in self.ports:
+            print(f"\n Port {name} not found! \n")
+            return None
+
+        return self.ports[name].copy()
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_critical_point(self, direction):
+        """
+        Point of the bounding box in a direction (like Mobject.get_critical_point)
+        """
+
+        direction = np.asarray(direction, dtype=float)
+
+        return np.where(direction > 0, self.box[1], np.where(direction < 0, self.box[0], self.box.mean(axis=0)))
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_corner(self, direction):
+        return self.get_critical_point(direction)
+
+    def get_center(self):
+        return self.get_critical_point(ORIGIN)
+
+    def get_top(self):
+        return self.get_critical_point(UP)
+
+    def get_bottom(self):
+        return self.get_critical_point(DOWN)
+
+    def get_left(self):
+        return self.get_critical_point(LEFT)
+
+    def get_right(self):
+        return self.get_critical_point(RIGHT)
+
+    @property
+    def width(self):
+        return self.box[1, 0] - self.box[0, 0]
+
+    @property
+    def height(self):
+        return self.box[1, 1] - self.box[0, 1]
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def shift(self, vector):
+        """
+        Move ports and box
+        """
+
+        vector = np.asarray(vector, dtype=float)
+        self.box += vector
+        for point in self.ports.values():
+            point += vector
+
+        return self
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def move_to(self, point_or_footprint, aligned_edge=ORIGIN):
+        """
+        Move the footprint to a point (or to another footprint) like Mobject.move_to
+        """
+
+        if isinstance(point_or_footprint, Footprint):
+            target = point_or_footprint.get_critical_point(aligned_edge)
+        else:
+            target = np.asarray(point_or_footprint, dtype=float)
+
+        return self.shift(target - self.get_critical_point(aligned_edge))
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def next_to(self, point_or_footprint, direction=RIGHT, buff=0.25, aligned_edge=ORIGIN):
+        """
+        Put the footprint next to a point (or to another footprint) like Mobject.next_to
+        """
+
+        direction = np.asarray(direction, dtype=float)
+        if isinstance(point_or_footprint, Footprint):
+            target = point_or_footprint.get_critical_point(aligned_edge + direction)
+        else:
+            target = np.asarray(point_or_footprint, dtype=float)
+        point_to_align = self.get_critical_point(aligned_edge - direction)
+
+        return self.shift(target - point_to_align + buff*direction)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def place(self, positions, aligned_edge=ORIGIN):
+        """
+        Boxes and ports of many placements at the same time (the footprint is not moved)
+        return: boxes (n, 2, 3) and dictionary name: ports (n, 3)
+
+        positions: array (n, 3) of the points where the aligned edge is moved
+        """
+
+        shifts = np.asarray(positions, dtype=float).reshape(-1, 3) - self.get_critical_point(aligned_edge)
+        boxes = self.box[None] + shifts[:, None]
+        ports = {name: point + shifts for name, point in self.ports.items()}
+
+        return boxes, ports
+
+# ======================================================================================================================
+
+class Layout():
+    """
+    Named footprints of a schematic: ports, obstacles for Pipe_router and overlaps
+    """
+
+    def __init__(self, **kwargs):
+
+        # initialization
+        self.footprints = {}
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def add(self, name, footprint):
+        """
+        Add a footprint (return it, so it can be placed in the same line)
+        """
+
+        if name in self.footprints:
+            print(f"\n Footprint {name} already in the layout, it is replaced! \n")
+        self.footprints[name] = footprint
+
+        return footprint
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_port(self, name, port):
+        """
+        Return the position of a port of a footprint
+        """
+
+        return self.footprints[name].get_port(port)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_boxes(self, names=None):
+        """
+        Bounding boxes (n, 2, 3) of the footprints (all or only the ones in names),
+        they can be the obstacles of Pipe_router
+        """
+
+        names = list(self.footprints) if names is None else names
+
+        return np.array([self.footprints[name].box for name in names]).reshape(-1, 2, 3)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_overlaps(self, margin=0):
+        """
+        Pairs of names of the footprints whose boxes overlap
+        margin: clearance between the boxes
+        """
+
+        names = list(self.footprints)
+        overlap = np.triu(boxes_overlap(self.get_boxes(), self.get_boxes(), margin=margin), k=1)
+
+        return [(names[i], names[j]) for i, j in zip(*np.nonzero(overlap))]
+
+# ======================================================================================================================
+
+# component: module of its class (the modules import manim, they are imported only when a footprint is required)
+COMPONENTS = {"Pneumatic_valve_5_2": "Mlib.Pneumatics.DirectionalValves",
+              "Pneumatic_valve_5_3": "Mlib.Pneumatics.DirectionalValves",
+              "Pneumatic_valve_3_2": "Mlib.Pneumatics.DirectionalValves",
+              "OneWay_flow_control_valve": "Mlib.Pneumatics.FunctionalValves",
+              "Piloted_check_valve": "Mlib.Pneumatics.FunctionalValves",
+              "AND_valve": "Mlib.Pneumatics.FunctionalValves",
+              "OR_valve": "Mlib.Pneumatics.FunctionalValves",
+              "Pneumatic_cylinder_double_acting": "Mlib.Pneumatics.PneumaticCylinders",
+              "Pneumatic_cylinder_single_acting": "Mlib.Pneumatics.PneumaticCylinders",
+              "Gauge": "Mlib.Instruments.MeasuringInstruments",
+              "FlowSensor": "Mlib.Instruments.MeasuringInstruments",
+              "Pipe_connection": "Mlib.Mechanics.GeneralConnections",
+              "Converyor_belt": "Mlib.Mechanics.ConveyorBelt",
+              "Compression_Spring": "Mlib.Mechanics.Spring",
+              "Button_ON_OFF": "Mlib.Electronics.Buttons",
+              "Button_start": "Mlib.Electronics.Buttons",
+              "Button_stop": "Mlib.Electronics.Buttons",
+              "Display_7_segments": "Mlib.Electronics.Displays"}
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_footprint(component, **kwargs):
+    """
+    Footprint of a component from its class name and the parameters of its constructor
+    (e.g. get_footprint("Pneumatic_valve_5_2", height=1), same of Pneumatic_valve_5_2.get_footprint(height=1))
+    """
+
+    if component not in COMPONENTS:
+        print(f"\n Footprint of {component} not available! \n")
+        return None
+
+    component_class = getattr(importlib.import_module(COMPONENTS[component]), component)
+
+    return component_class.get_footprint(**kwargs)
+
+# ======================================================================================================================
@@ -0,0 +1,426 @@
+from manim import *
+import numpy as np
+import argparse
+import copy
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Mlib.Tools.Profiling import load_scene
+from Mlib.Tools.Hashing import enable_registration, disable_registration, get_owner, is_component, original_inits
+
+"""
+Author: Ivan Archetti
+Creation date: 18/10/2026
+
+
+Parallel rendering of the sections of a scene with Mlib components
+
+Run it with:
+python -m Mlib.Tools.ParallelRender Examples/RegolazioneFlusso-Shorts.py ScenaShort1 --workers 32 --output short.mp4
+
+1. a dry run of the scene (no frames) records the number and the run time of the play/wait calls and the
+   boundaries declared with self.next_section()
+2. the plays are split in sections (the declared ones, or sections with the same duration if there are none)
+3. a second dry run advances the plays frame by frame (the time-based updaters, e.g. the speed ramp and the pool
+   of the conveyor belt, reach the state of the rendered frames) and records a snapshot of the scene at the start
+   of every section: plain attributes (points, colors, etc etc...) of the mobjects and state of the components
+   (valve position, cylinder opened_state, phase of the belt, etc etc...)
+4. every worker renders one section (manim -n start,end): the plays before the section are skipped by manim
+   in a single step and the snapshot is restored at the start of the section
+5. the movies of the sections are concatenated (ffmpeg, no re-encoding)
+
+The snapshot does not contain the variables of the closures of the updaters and of the scene, and the animations
+of the first play of a section are created before the snapshot is restored: if the scene at the start of a
+section is not the recorded one (e.g. a different number of mobjects), the worker advances the plays before the
+section frame by frame instead (the whole scene up to the section is computed again in that worker)
+"""
+
+
+# ======================================================================================================================
+
+class Snapshot_mismatch(Exception):
+    """
+    The scene of a worker at the start of the section is not the one of the snapshot
+    """
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def is_plain(value):
+    """
+    True if the value is stored in a snapshot: numbers, strings, arrays, colors and containers of them
+    (mobjects, components and functions are not)
+    """
+
+    if isinstance(value, np.ndarray):
+        return value.dtype != object
+    if value is None or isinstance(value, (bool, int, float, complex, str, np.generic)):
+        return True
+    if callable(getattr(value, "to_rgba", None)):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(is_plain(key) and is_plain(item) for key, item in value.items())
+
+    return False
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_components(scene):
+    """
+    Components that own the mobjects of the scene and the components inside them (e.g. the actuators of a valve),
+    in the order of the mobjects of the scene
+    """
+
+    components, ids = [], set()
+
+    def visit(component):
+        if id(component) in ids:
+            return
+        ids.add(id(component))
+        components.append(component)
+        for name, value in sorted(vars(component).items()):
+            for item in (value if isinstance(value, (list, tuple)) else [value]):
+                if is_component(item):
+                    visit(item)
+
+    for mob in scene.get_mobject_family_members():
+        owner = get_owner(mob)
+        if owner is not None:
+            visit(owner)
+
+    return components
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def take_snapshot(scene):
+    """
+    Copy of the plain attributes of the mobjects of the scene and of the components
+    """
+
+    def get_state(obj):
+        return (type(obj).__qualname__, {name: copy.deepcopy(value) for name, value in vars(obj).items()
+                                         if is_plain(value)})
+
+    snapshot = {"time": getattr(scene.renderer, "time", None),
+                "mobjects": [get_state(mob) for mob in scene.get_mobject_family_members()],
+                "components": [get_state(component) for component in get_components(scene)]}
+
+    return snapshot
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def restore_snapshot(scene, snapshot):
+    """
+    Set the attributes of the snapshot on the mobjects and the components of the scene
+    """
+
+    for key, objects in (("mobjects", scene.get_mobject_family_members()), ("components", get_components(scene))):
+        if [type(obj).__qualname__ for obj in objects] != [name for name, _ in snapshot[key]]:
+            raise Snapshot_mismatch(f"the {key} of the scene are not the ones of the snapshot")
+        for obj, (_, state) in zip(objects, snapshot[key]):
+            for name, value in state.items():
+                setattr(obj, name, copy.deepcopy(value))
+
+    if snapshot["time"] is not None:
+        scene.renderer.time = snapshot["time"]
+
+# ======================================================================================================================
+
+class Section_recorder_mixin():
+    """
+    Mixin for a Scene that records the run time of each play/wait and the declared section boundaries,
+    and the snapshots at the start of the plays in snapshot_plays (the plays are then advanced frame by frame)
+    (use it as first base class: class Recorded(Section_recorder_mixin, MyScene))
+    """
+
+    snapshot_plays = ()
+
+    def setup(self):
+        super().setup()
+
+        # initialization
+        self.play_times = []
+        self.section_starts = []
+        self.snapshots = {}
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def play(self, *args, **kwargs):
+        if len(self.play_times) in self.snapshot_plays:
+            self.snapshots[len(self.play_times)] = take_snapshot(self)
+
+        # a wait is a play of the Wait animation (counted once, like manim does)
+        result = super().play(*args, **kwargs)
+        self.play_times.append(float(getattr(self, "duration", 0)))
+        return result
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def next_section(self, *args, **kwargs):
+        self.section_starts.append(len(self.play_times))
+        return super().next_section(*args, **kwargs)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_time_progression(self, run_time, description, n_iterations=None, override_skip_animations=False):
+        return super().get_time_progression(run_time, description, n_iterations=n_iterations,
+                                            override_skip_animations=override_skip_animations or
+                                                                     bool(self.snapshot_plays))
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+class Section_worker_mixin():
+    """
+    Mixin for a Scene rendered by a worker: the snapshot is restored at the start of the section (first_play),
+    without a snapshot the skipped plays are advanced frame by frame like the rendered ones
+    (use it as first base class: class Worker(Section_worker_mixin, MyScene))
+    """
+
+    first_play = 0
+    snapshot = None
+
+    def setup(self):
+        super().setup()
+
+        # initialization
+        self.plays = 0
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def play(self, *args, **kwargs):
+        if self.plays == self.first_play and self.snapshot is not None:
+            restore_snapshot(self, self.snapshot)
+        self.plays += 1
+        return super().play(*args, **kwargs)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def get_time_progression(self, run_time, description, n_iterations=None, override_skip_animations=False):
+        return super().get_time_progression(run_time, description, n_iterations=n_iterations,
+                                            override_skip_animations=override_skip_animations or self.snapshot is None)
+
+# ======================================================================================================================
+
+def record_scene(scene_class, snapshot_plays=(), settings=None):
+    """
+    Dry run of the scene (no frames, no files)
+    return: run times of the plays, declared section starts (play indices) and snapshots {play index: snapshot}
+
+    snapshot_plays: plays with a snapshot at their start (the dry run advances the plays frame by frame)
+    settings: manim configuration of the workers (the frame rate changes the steps of the updaters)
+    """
+
+    recorded_class = type(scene_class.__name__, (Section_recorder_mixin, scene_class),
+                          {"snapshot_plays": frozenset(snapshot_plays)})
+
+    # the constructors stay registered if they already were (e.g. enable_fast_hashing)
+    registered = bool(original_inits)
+    enable_registration()
+    try:
+        with tempconfig({**(settings or {}), "dry_run": True, "disable_caching": True, "preview": False}):
+            scene = recorded_class()
+            scene.render()
+    finally:
+        if not registered:
+            disable_registration()
+
+    return scene.play_times, scene.section_starts, scene.snapshots
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def split_sections(play_times, section_starts=(), workers=1):
+    """
+    Split the plays in contiguous sections
+    return: list of (first play, last play) of each section (last play included, like manim -n)
+
+    play_times: run time of each play
+    section_starts: declared boundaries (indices of the first play of each section)
+    workers: number of sections when no boundary is declared (the longest section is as short as possible)
+    """
+
+    n = len(play_times)
+    if n == 0:
+        return []
+
+    starts = sorted({start for start in section_starts if 0 < start < n})
+    if not starts and workers > 1:
+        # minimum capacity that splits the plays in "workers" sections (binary search with a greedy check)
+        def split(capacity):
+            starts, total = [], 0.0
+            for i, time in enumerate(play_times):
+                if total + time > capacity and total > 0:
+                    starts.append(i)
+                    total = 0.0
+                total += time
+            return starts
+
+        low, high = max(play_times), sum(play_times)
+        for _ in range(50):
+            capacity = (low + high)/2
+            if len(split(capacity)) + 1 > workers:
+                low = capacity
+            else:
+                high = capacity
+        starts = split(high)
+
+    bounds = [0, *starts, n]
+
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(len(bounds) - 1)]
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def render_section(scene_file, scene_name, index, first, last, settings, snapshot=None):
+    """
+    Render the plays first..last of the scene in this process
+    return: path of the movie of the section, render time and mode ("snapshot" or "replay")
+    """
+
+    scene_class = load_scene(scene_file, scene_name)
+    section_settings = {**settings,
+                        "from_animation_number": first,
+                        "upto_animation_number": last,
+                        "output_file": f"{scene_name}_section_{index:03d}",
+                        "media_dir": os.path.join(settings.get("media_dir", config.media_dir), f"section_{index:03d}"),
+                        "preview": False}
+
+    start = time.perf_counter()
+    enable_registration()
+    try:
+        for mode in (["snapshot"] if snapshot is not None else []) + ["replay"]:
+            worker_class = type(scene_class.__name__, (Section_worker_mixin, scene_class),
+                                {"first_play": first, "snapshot": snapshot if mode == "snapshot" else None})
+            try:
+                with tempconfig(section_settings):
+                    scene = worker_class()
+                    scene.render()
+                    path = scene.renderer.file_writer.movie_file_path
+                break
+            except Snapshot_mismatch as error:
+                print(f"\n Section {index}: {error}, the plays before the section are advanced frame by frame \n")
+    finally:
+        disable_registration()
+
+    return str(path), time.perf_counter() - start, mode
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def render_serial(scene_file, scene_name, settings):
+    """
+    Render the whole scene in this process (reference of the parallel render)
+    return: render time
+    """
+
+    scene_class = load_scene(scene_file, scene_name)
+    serial_settings = {**settings,
+                       "output_file": f"{scene_name}_serial",
+                       "media_dir": os.path.join(settings.get("media_dir", config.media_dir), "serial"),
+                       "preview": False}
+
+    start = time.perf_counter()
+    with tempconfig(serial_settings):
+        scene_class().render()
+
+    return time.perf_counter() - start
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def concatenate(paths, output):
+    """
+    Join the movies of the sections without re-encoding
+    """
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        print("\n ffmpeg not found: the sections are not concatenated! \n")
+        return None
+
+    list_file = f"{output}.txt"
+    with open(list_file, "w") as file:
+        for path in paths:
+            file.write(f"file '{os.path.abspath(path)}'\n")
+    subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_file,
+                    "-c", "copy", output], check=True)
+    os.remove(list_file)
+
+    return output
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def render_parallel(scene_file, scene_name, workers=None, output=None, settings=None, compare=False):
+    """
+    Render the scene with a process for each section and return the report
+    workers: number of processes (default number of cores)
+    output: final movie (default <scene name>.mp4 in the current folder)
+    settings: manim configuration of the workers (e.g. {"quality": "high_quality"})
+    compare: render also the whole scene in a single process and report the speed-up
+    """
+
+    # initialization
+    workers = workers or os.cpu_count() or 1
+    output = output or f"{scene_name}.mp4"
+    settings = settings or {}
+    start = time.perf_counter()
+
+    scene_class = load_scene(scene_file, scene_name)
+    play_times, section_starts, _ = record_scene(scene_class, settings=settings)
+    sections = split_sections(play_times, section_starts, workers=workers)
+    _, _, snapshots = record_scene(scene_class, snapshot_plays=[first for first, _ in sections if first > 0],
+                                   settings=settings)
+    record_time = time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(sections), 1))) as executor:
+        futures = [executor.submit(render_section, scene_file, scene_name, i, first, last, settings,
+                                   snapshots.get(first))
+                   for i, (first, last) in enumerate(sections)]
+        results = [future.result() for future in futures]
+
+    movie = concatenate([path for path, _, _ in results], output) if results else None
+    parallel_time = time.perf_counter() - start
+    serial_time = render_serial(scene_file, scene_name, settings) if compare else None
+
+    report = {"scene": scene_name,
+              "plays": len(play_times),
+              "duration_s": sum(play_times),
+              "record_s": record_time,
+              "parallel_s": parallel_time,
+              "serial_s": serial_time,
+              "speedup": serial_time/parallel_time if serial_time else None,
+              "sections": [{"first_play": first,
+                            "last_play": last,
+                            "duration_s": sum(play_times[first:last + 1]),
+                            "render_s": render_time,
+                            "mode": mode,
+                            "movie": path} for (first, last), (path, render_time, mode) in zip(sections, results)],
+              "output": movie}
+
+    return report
+
+# ======================================================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel rendering of the sections of a scene with Mlib components")
+    parser.add_argument("scene_file", help="python file of the scene")
+    parser.add_argument("scene_name", help="name of the Scene class")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default number of cores)")
+    parser.add_argument("--output", default=None, help="final movie")
+    parser.add_argument("--quality", default=None, help="manim quality (e.g. low_quality, high_quality)")
+    parser.add_argument("--plan", action="store_true", help="print the sections without rendering")
+    parser.add_argument("--compare", action="store_true", help="render also in a single process (speed-up)")
+    args = parser.parse_args()
+
+    settings = {"quality": args.quality} if args.quality else {}
+    if args.plan:
+        play_times, section_starts, _ = record_scene(load_scene(args.scene_file, args.scene_name), settings=settings)
+        sections = split_sections(play_times, section_starts, workers=args.workers or os.cpu_count() or 1)
+        json.dump([{"first_play": first, "last_play": last, "duration_s": sum(play_times[first:last + 1])}
+                   for first, last in sections], sys.stdout, indent=2)
+    else:
+        report = render_parallel(args.scene_file, args.scene_name, workers=args.workers, output=args.output,
+                                 settings=settings, compare=args.compare)
+        json.dump(report, sys.stdout, indent=2)
@@ -0,0 +1,311 @@
+from manim import *
+import argparse
+import functools
+import importlib.util
+import inspect
+import json
+import linecache
+import sys
+import time
+
+from Mlib import MLIB_PACKAGE
+
+"""
+Author: Ivan Archetti   
+Creation date: 18/10/2026
+
+
+Frame-time profiling harness for scenes built with Mlib components
+
+Run it with:
+python -m Mlib.Tools.Profiling Examples/RegolazioneFlusso-Shorts.py ScenaShort1 --output profile.json
+
+For every play/wait of the scene it records the wall time, the number of frames and the time spent in
+interpolation of the animations, in the updaters (Mlib updaters and scene updaters) and in the Cairo 
+rasterization of the frames; the report ranks the lines of the scene by time
+"""
+
+
+# ======================================================================================================================
+
+def updater_origin(updater):
+    """
+    Define whether an updater is registered by Mlib or by the scene
+    (always_redraw wraps the function of the component in a closure)
+    """
+
+    functions = [updater]
+    for cell in getattr(updater, "__closure__", None) or ():
+        try:
+            if callable(cell.cell_contents):
+                functions.append(cell.cell_contents)
+        except ValueError: # empty cell
+            pass
+
+    for function in functions:
+        if getattr(function, "__module__", "").split(".")[0] == MLIB_PACKAGE:
+            return "mlib"
+        
+    return "scene"
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+class Timed_updater():
+    """
+    Timer around an updater: it is equal to the updater it wraps, so remove_updater(original) still finds it
+    (inspect.signature follows __wrapped__: manim still sees the "dt" parameter)
+    """
+
+    def __init__(self, updater, scene):
+        functools.update_wrapper(self, updater)
+
+        # initialization
+        self.scene = scene
+        self.origin = updater_origin(updater)
+        self.name = f"{self.origin}:{getattr(updater, '__qualname__', repr(updater))}"
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = self.__wrapped__(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        record = self.scene.current_record
+        if record is not None:
+            record[f"{self.origin}_updaters_s"] += elapsed
+            record["updaters"][self.name] = record["updaters"].get(self.name, 0.0) + elapsed
+        return result
+
+    def __eq__(self, other):
+        return other is self or other == self.__wrapped__
+
+    def __hash__(self):
+        return hash(self.__wrapped__)
+
+# ======================================================================================================================
+
+class Profiling_mixin():
+    """
+    Mixin for a Scene that collects the times of each play/wait
+    (use it as first base class: class Profiled(Profiling_mixin, MyScene))
+    """
+
+    def setup(self):
+        super().setup()
+
+        # initialization
+        self.profile_records = []
+        self.current_record = None
+
+        # rasterization time of each frame
+        render = self.renderer.render
+
+        def timed_render(*args, **kwargs):
+            start = time.perf_counter()
+            result = render(*args, **kwargs)
+            if self.current_record is not None:
+                self.current_record["raster_s"] += time.perf_counter() - start
+            return result
+        
+        self.renderer.render = timed_render
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __new_record(self, kind):
+        """
+        Create the record of a play/wait with the line of the scene that calls it
+        """
+
+        # first frame outside this mixin
+        frame = inspect.currentframe().f_back.f_back
+        filename, line = frame.f_code.co_filename, frame.f_lineno
+
+        record = {"kind": kind,
+                  "file": filename,
+                  "line": line,
+                  "code": linecache.getline(filename, line).strip(),
+                  "wall_s": 0.0,
+                  "frames": 0,
+                  "interpolation_s": 0.0,
+                  "mlib_updaters_s": 0.0,
+                  "scene_updaters_s": 0.0,
+                  "raster_s": 0.0,
+                  "updaters": {}}
+        
+        return record
+    
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __wrap_updaters(self):
+        """
+        Wrap the updaters of all the mobjects of the scene with a timer for the duration of a play/wait
+        return: mobjects with wrapped updaters
+        """
+
+        wrapped = []
+        for mobject in self.get_mobject_family_members():
+            if mobject.updaters:
+                mobject.updaters = [Timed_updater(updater, self) for updater in mobject.updaters]
+                wrapped.append(mobject)
+
+        return wrapped
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __unwrap_updaters(self, wrapped):
+        """
+        Restore the original updaters (the scene finds its own functions between the plays)
+        """
+
+        for mobject in wrapped:
+            mobject.updaters = [updater.__wrapped__ if isinstance(updater, Timed_updater) else updater
+                                for updater in mobject.updaters]
+    
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def play(self, *args, **kwargs):
+        # a wait is a play of the Wait animation: the record is already open
+        if self.current_record is not None:
+            return super().play(*args, **kwargs)
+        
+        self.current_record = self.__new_record("play")
+        return self.__timed_call(super().play, *args, **kwargs)
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def wait(self, *args, **kwargs):
+        self.current_record = self.__new_record("wait")
+        return self.__timed_call(super().wait, *args, **kwargs)
+    
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def __timed_call(self, function, *args, **kwargs):
+        """
+        Execute play/wait and close the record
+        """
+
+        wrapped = self.__wrap_updaters()
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.__unwrap_updaters(wrapped)
+            record = self.current_record
+            record["wall_s"] = time.perf_counter() - start
+            self.profile_records.append(record)
+            self.current_record = None
+
+    # ----------------------------------------------------------------------------------------------------------------------
+
+    def update_to_time(self, t):
+        start = time.perf_counter()
+        super().update_to_time(t)
+        record = self.current_record
+        if record is not None:
+            # the updaters are called inside update_to_time: they are removed in the report
+            record["interpolation_s"] += time.perf_counter() - start
+            record["frames"] += 1
+
+# ======================================================================================================================
+
+def load_scene(scene_file, scene_name):
+    """
+    Import the scene file and return the scene class
+    """
+
+    spec = importlib.util.spec_from_file_location("profiled_scene", scene_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return getattr(module, scene_name)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def profile_scene(scene_class, scale=0.25, frame_rate=15):
+    """
+    Render the scene at low quality and return the records of every play/wait
+    scale: reduction of the resolution of the scene (the aspect ratio is preserved)
+    """
+
+    profiled_class = type(scene_class.__name__, (Profiling_mixin, scene_class), {})
+
+    settings = {"pixel_width": max(int(config.pixel_width*scale), 2),
+                "pixel_height": max(int(config.pixel_height*scale), 2),
+                "frame_rate": frame_rate,
+                "write_to_movie": False,
+                "save_last_frame": False,
+                "disable_caching": True,
+                "preview": False}
+    
+    with tempconfig(settings):
+        scene = profiled_class()
+        scene.render()
+
+    # interpolation time without the updaters
+    for record in scene.profile_records:
+        record["interpolation_s"] = max(record["interpolation_s"] - record["mlib_updaters_s"] - record["scene_updaters_s"], 0.0)
+
+    return scene.profile_records
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def rank_hot_spots(records):
+    """
+    Aggregate the records by line of the scene and sort them by wall time
+    """
+
+    hot_spots = {}
+    for record in records:
+        key = (record["file"], record["line"])
+        spot = hot_spots.setdefault(key, {"file": record["file"], "line": record["line"], "code": record["code"], 
+                                          "kind": record["kind"], "calls": 0, "wall_s": 0.0, "frames": 0, 
+                                          "interpolation_s": 0.0, "mlib_updaters_s": 0.0, 
+                                          "scene_updaters_s": 0.0, "raster_s": 0.0, "updaters": {}})
+        spot["calls"] += 1
+        for field in ("wall_s", "frames", "interpolation_s", "mlib_updaters_s", "scene_updaters_s", "raster_s"):
+            spot[field] += record[field]
+        for name, elapsed in record["updaters"].items():
+            spot["updaters"][name] = spot["updaters"].get(name, 0.0) + elapsed
+
+    for spot in hot_spots.values():
+        spot["ms_per_frame"] = 1000*spot["wall_s"]/spot["frames"] if spot["frames"] else 0.0
+
+    return sorted(hot_spots.values(), key=lambda spot: spot["wall_s"], reverse=True)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def print_report(hot_spots, top=20, file=sys.stdout):
+    """
+    Table of the hot spots of the scene
+    """
+
+    total = sum(spot["wall_s"] for spot in hot_spots) or 1.0
+    
+    print(f"{'line':>5} {'kind':<5} {'calls':>5} {'wall s':>8} {'%':>6} {'frames':>6} {'ms/frame':>9} "
+          f"{'interp s':>9} {'mlib upd s':>10} {'scene upd s':>11} {'raster s':>9}  code", file=file)
+    for spot in hot_spots[:top]:
+        print(f"{spot['line']:>5} {spot['kind']:<5} {spot['calls']:>5} {spot['wall_s']:>8.3f} "
+              f"{100*spot['wall_s']/total:>6.1f} {spot['frames']:>6} {spot['ms_per_frame']:>9.2f} "
+              f"{spot['interpolation_s']:>9.3f} {spot['mlib_updaters_s']:>10.3f} {spot['scene_updaters_s']:>11.3f} "
+              f"{spot['raster_s']:>9.3f}  {spot['code'][:60]}", file=file)
+
+# ======================================================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Frame-time profiling of a scene with Mlib components")
+    parser.add_argument("scene_file", help="python file of the scene")
+    parser.add_argument("scene_name", help="name of the Scene class")
+    parser.add_argument("--scale", type=float, default=0.25, help="reduction of the resolution")
+    parser.add_argument("--frame_rate", type=int, default=15, help="frame rate of the rendering")
+    parser.add_argument("--top", type=int, default=20, help="number of lines in the table")
+    parser.add_argument("--output", default=None, help="JSON file with all the records")
+    args = parser.parse_args()
+
+    records = profile_scene(load_scene(args.scene_file, args.scene_name), scale=args.scale, frame_rate=args.frame_rate)
+    hot_spots = rank_hot_spots(records)
+    print_report(hot_spots, top=args.top)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"records": records, "hot_spots": hot_spots}, file, indent=2)
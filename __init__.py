@@ -0,0 +1,79 @@
+import importlib
+
+"""
+Author: Ivan Archetti   
+Creation date: 18/10/2026
+
+
+Mlib: collection of modules for Manim
+
+Subpackages, modules and components are loaded only when they are used, so a scene
+pays the import time only for the components it needs:
+
+    import Mlib
+    valve = Mlib.Pneumatic_valve_5_2(height=1)   # imports only Mlib.Pneumatics.DirectionalValves
+"""
+
+
+# ======================================================================================================================
+
+# name of the package: the tools recognize the Mlib modules with it (also when they are run with python -m)
+MLIB_PACKAGE = __name__
+
+SUBPACKAGES = ("Benchmarks", "Electronics", "Graphics", "Instruments", "Mechanics", "Pneumatics", "Tools")
+
+# component: module (relative to the package) where it is defined
+COMPONENTS = {"Button_ON_OFF": "Electronics.Buttons",
+              "Button_start": "Electronics.Buttons",
+              "Button_stop": "Electronics.Buttons",
+              "Display_7_segments": "Electronics.Displays",
+              "Gauge": "Instruments.MeasuringInstruments",
+              "FlowSensor": "Instruments.MeasuringInstruments",
+              "Converyor_belt": "Mechanics.ConveyorBelt",
+              "Pipe_connection": "Mechanics.GeneralConnections",
+              "Pipe_router": "Mechanics.PipeRouting",
+              "Compression_Spring": "Mechanics.Spring",
+              "Pneumatic_valve_5_2": "Pneumatics.DirectionalValves",
+              "Pneumatic_valve_5_3": "Pneumatics.DirectionalValves",
+              "Pneumatic_valve_3_2": "Pneumatics.DirectionalValves",
+              "OneWay_flow_control_valve": "Pneumatics.FunctionalValves",
+              "Piloted_check_valve": "Pneumatics.FunctionalValves",
+              "AND_valve": "Pneumatics.FunctionalValves",
+              "OR_valve": "Pneumatics.FunctionalValves",
+              "Pneumatic_circuit": "Pneumatics.PneumaticCircuit",
+              "Pneumatic_cylinder_double_acting": "Pneumatics.PneumaticCylinders",
+              "Pneumatic_cylinder_single_acting": "Pneumatics.PneumaticCylinders",
+              "electric_actuator": "Pneumatics.ValveActuators",
+              "manual_actuator": "Pneumatics.ValveActuators",
+              "mechanic_actuator": "Pneumatics.ValveActuators",
+              "pneumatic_actuator": "Pneumatics.ValveActuators"}
+
+# only the components: "from Mlib import *" does not import the subpackages
+__all__ = [*COMPONENTS]
+
+# ======================================================================================================================
+
+def __getattr__(name):
+    """
+    Load subpackages and components on first access
+    """
+
+    if name in COMPONENTS:
+        module = importlib.import_module(f"{__name__}.{COMPONENTS[name]}")
+        value = getattr(module, name)
+    elif name in SUBPACKAGES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # the next accesses do not pass through __getattr__
+    globals()[name] = value
+
+    return value
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(SUBPACKAGES))
+
+# ======================================================================================================================